@@ -12,11 +12,13 @@ OpenAI GPT-4o를 활용하여 시나리오를 판단하고, 관련 정보를 추
 """
 
 import re
-from openai import OpenAI
 from typing import Dict, List, Optional, Tuple
 from ..config import Config
-from ..models import ParsedInput
+from ..llm_gateway import llm_gateway
+from ..models import ParsedInput, NormalizedTerm
 from ..logic.normalizer import normalizer
+from ..logic.term_resolver import format_alias_rules
+from ..logic.itemno_index import itemno_index, itemno_similarity
 import json
 
 class InputParser:
@@ -43,11 +45,11 @@ class InputParser:
         입력 파서 초기화
         
         설정:
-        - OpenAI 클라이언트 초기화
+        - 비동기 LLM 게이트웨이 연결
         - 모델 설정
         - 세션 기반 누적 정보 저장소
         """
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.llm = llm_gateway
         
         # 세션별 누적 정보 저장소
         self.session_accumulated_info = {}
@@ -67,7 +69,7 @@ class InputParser:
             "일반작업": ["일반", "일반작업", "normal", "regular"]
         }
     
-    def parse_input(self, user_input: str, conversation_history: list = None, session_id: str = None) -> ParsedInput:
+    async def parse_input(self, user_input: str, conversation_history: list = None, session_id: str = None) -> ParsedInput:
         """
         사용자 입력을 파싱하여 구조화된 데이터로 변환
         
@@ -100,7 +102,7 @@ class InputParser:
         # 세션 기반 파싱 시도 (session_id가 있는 경우)
         if session_id:
             try:
-                return self.parse_input_with_context(user_input, conversation_history, session_id)
+                return await self.parse_input_with_context(user_input, conversation_history, session_id)
             except Exception as e:
                 print(f"세션 기반 파싱 실패, 기본 파싱으로 전환: {e}")
                 # 기본 파싱으로 fallback
@@ -111,7 +113,7 @@ class InputParser:
             
             if scenario == "S1":
                 # 시나리오 1: 자연어로 작업 요청
-                return self._parse_scenario_1(user_input, conversation_history, session_id)
+                return await self._parse_scenario_1(user_input, conversation_history, session_id)
             elif scenario == "S2":
                 # 시나리오 2: ITEMNO로 작업 상세 요청
                 return self._parse_scenario_2(user_input)
@@ -132,7 +134,7 @@ class InputParser:
                 confidence=0.0
             )
     
-    def parse_input_with_context(self, user_input: str, conversation_history: list = None, session_id: str = None) -> ParsedInput:
+    async def parse_input_with_context(self, user_input: str, conversation_history: list = None, session_id: str = None) -> ParsedInput:
         """
         세션 컨텍스트를 포함한 입력 파싱 (PMark2.5 고급 기능)
         
@@ -151,17 +153,17 @@ class InputParser:
             
             if session_state:
                 # 기존 누적 단서와 함께 파싱
-                return self._parse_scenario_1_with_context(user_input, conversation_history, session_state.accumulated_clues)
+                return await self._parse_scenario_1_with_context(user_input, conversation_history, session_state.accumulated_clues)
             else:
                 # 일반 파싱
-                return self.parse_input(user_input, conversation_history)
+                return await self.parse_input(user_input, conversation_history)
                 
         except Exception as e:
             print(f"컨텍스트 파싱 오류: {e}")
             # 기본 파싱으로 fallback
-            return self.parse_input(user_input, conversation_history)
+            return await self.parse_input(user_input, conversation_history)
 
-    def _parse_scenario_1_with_context(self, user_input: str, conversation_history: list, accumulated_clues) -> ParsedInput:
+    async def _parse_scenario_1_with_context(self, user_input: str, conversation_history: list, accumulated_clues) -> ParsedInput:
         """
         누적된 단서와 함께 시나리오 1 파싱
         
@@ -181,24 +183,22 @@ class InputParser:
             prompt = self._create_scenario_1_context_prompt(user_input, conversation_history, accumulated_clues)
             
             # LLM 호출
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
+            result_text = await self.llm.complete(
                 messages=[
                     {"role": "system", "content": "당신은 설비관리 시스템의 멀티턴 대화 분석 전문가입니다. 이전 대화 컨텍스트를 고려하여 입력을 분석합니다."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
-                max_tokens=500
+                max_tokens=500,
+                model="gpt-4o"
             )
-            
-            result_text = response.choices[0].message.content.strip()
             print(f"LLM 응답: {result_text}")
             
             # 응답 파싱
             parsed_data = self._parse_llm_response(result_text)
             
             # 추출된 용어 정규화
-            normalized_data = self._normalize_extracted_terms(parsed_data)
+            normalized_data = await self._normalize_extracted_terms(parsed_data)
             
             # 누락된 필드 확인
             missing_fields = []
@@ -219,7 +219,8 @@ class InputParser:
                 itemno=normalized_data.get("itemno"),
                 confidence=normalized_data.get("confidence", 0.8),
                 missing_items=missing_fields,
-                needs_additional_input=len(missing_fields) > 0
+                needs_additional_input=len(missing_fields) > 0,
+                normalized_terms=self._collect_normalized_terms(normalized_data)
             )
             
             print(f"컨텍스트 파싱 완료: {parsed_input}")
@@ -230,7 +231,7 @@ class InputParser:
             import traceback
             traceback.print_exc()
             # 기본 파싱으로 fallback
-            return self._parse_scenario_1(user_input, conversation_history)
+            return await self._parse_scenario_1(user_input, conversation_history)
 
     def _create_scenario_1_context_prompt(self, user_input: str, conversation_history: list, accumulated_clues) -> str:
         """
@@ -272,17 +273,7 @@ class InputParser:
 - confidence: 분석 신뢰도 (0.0~1.0)
 
 ## 설비유형 키워드 매핑:
-- "압력베젤", "베젤", "베셀", "vessel", "pressure vessel" → "Pressure Vessel"
-- "펌프", "pump" → "Pump"
-- "열교환", "열교환기", "heat exchanger" → "Heat Exchanger"
-- "탱크", "tank", "저장탱크" → "Storage Tank"
-- "밸브", "valve", "모터밸브" → "Motor Operated Valve"
-- "컨베이어", "conveyor" → "Conveyor"
-- "필터", "filter" → "Filter"
-- "반응기", "reactor" → "Reactor"
-- "압축기", "compressor" → "Compressor"
-- "팬", "fan" → "Fan"
-- "블로워", "blower" → "Blower"
+{format_alias_rules("equipment")}
 
 ## 응답 형식:
 ```json
@@ -375,32 +366,26 @@ class InputParser:
             
         Returns:
             bool: 작업대상 컬럼에 존재하면 True, 없으면 False
+            
+        연계 파일:
+        - logic/itemno_index.py: 메모리 ITEMNO 인덱스 (DB 조회 없음)
         """
         try:
-            from ..database import DatabaseManager
-            db = DatabaseManager()
-            
             # 입력에서 잠재적인 ITEMNO 패턴들 추출
             potential_items = self._extract_potential_itemno_patterns(user_input)
             
             if not potential_items:
                 return False
             
-            # DB에서 작업대상 컬럼 조회
-            query = "SELECT DISTINCT itemno FROM notification_history WHERE itemno IS NOT NULL AND itemno != ''"
-            cursor = db.conn.execute(query)
-            db_items = [row[0] for row in cursor.fetchall()]
-            
             # 정확한 매칭 확인
             for item in potential_items:
-                if item in db_items:
+                if itemno_index.contains(item):
                     return True
             
-            # 유사도 기반 매칭 (높은 유사도만)
+            # 유사도 기반 매칭 (높은 유사도만, trigram 후보만 비교)
             for item in potential_items:
-                for db_item in db_items:
-                    if self._calculate_itemno_similarity(item, db_item) > 0.8:
-                        return True
+                if itemno_index.has_similar(item, threshold=0.8):
+                    return True
             
             return False
             
@@ -447,22 +432,9 @@ class InputParser:
         Returns:
             float: 유사도 점수 (0.0 ~ 1.0)
         """
-        from difflib import SequenceMatcher
-        
-        # 기본 문자열 유사도
-        similarity = SequenceMatcher(None, item1.lower(), item2.lower()).ratio()
-        
-        # 정확한 매칭 보너스
-        if item1.lower() == item2.lower():
-            return 1.0
-        
-        # 부분 매칭 보너스
-        if item1.lower() in item2.lower() or item2.lower() in item1.lower():
-            similarity += 0.2
-        
-        return min(1.0, similarity)
+        return itemno_similarity(item1, item2)
     
-    def _parse_scenario_1(self, user_input: str, conversation_history: list = None, session_id: str = None) -> ParsedInput:
+    async def _parse_scenario_1(self, user_input: str, conversation_history: list = None, session_id: str = None) -> ParsedInput:
         """
         시나리오 1 파싱: 자연어로 작업 요청
         
@@ -492,21 +464,19 @@ class InputParser:
             # LLM 프롬프트 생성
             prompt = self._create_scenario_1_prompt(user_input, conversation_history, accumulated_info)
             
-            # OpenAI API 호출
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
+            # LLM 호출
+            result_text = await self.llm.complete(
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1,
-                max_tokens=1000
+                max_tokens=1000,
+                model="gpt-4o"
             )
             
-            result_text = response.choices[0].message.content
-            
             # 응답 파싱
             parsed_data = self._parse_llm_response(result_text)
             
             # 추출된 용어 정규화
-            normalized_data = self._normalize_extracted_terms(parsed_data)
+            normalized_data = await self._normalize_extracted_terms(parsed_data)
             
             # S1_2-1: 단서 항목 포함 여부 파악
             # S1_2-2: 조건 충족 여부 (주요 3개 단서 항목: location, equipment_type, status_code)
@@ -550,7 +520,8 @@ class InputParser:
                 itemno=None,
                 confidence=confidence,
                 missing_items=missing_clues_final,  # 누락된 주요 단서 항목 목록
-                needs_additional_input=needs_additional_input  # 추가 입력 필요 여부
+                needs_additional_input=needs_additional_input,  # 추가 입력 필요 여부
+                normalized_terms=self._collect_normalized_terms(combined_data)
             )
             
         except Exception as e:
@@ -659,15 +630,27 @@ class InputParser:
             
         Returns:
             추출된 ITEMNO 또는 None
+            
+        연계 파일:
+        - logic/itemno_index.py: search()로 오타가 있는 ITEMNO를 실제 ITEMNO로 보정
         """
         # 기존 패턴 매칭 활용
         potential_items = self._extract_potential_itemno_patterns(user_input)
         
-        if potential_items:
-            # 첫 번째 매칭된 항목 반환
-            return potential_items[0]
+        if not potential_items:
+            return None
         
-        return None
+        # 인덱스에서 가장 유사한 실제 ITEMNO 선택 (정확 일치는 1.0)
+        best_match = None
+        for item in potential_items:
+            matches = itemno_index.search(item, top_k=1)
+            if matches and (best_match is None or matches[0][1] > best_match[1]):
+                best_match = matches[0]
+        if best_match:
+            return best_match[0]
+        
+        # 인덱스에 유사 항목이 없으면 첫 번째 매칭된 항목 반환
+        return potential_items[0]
     
     def _extract_status_from_input(self, user_input: str) -> str:
         """
@@ -887,7 +870,7 @@ class InputParser:
                 'reasoning': '파싱 실패로 기본값 사용'
             }
     
-    def _normalize_extracted_terms(self, parsed_data: Dict) -> Dict:
+    async def _normalize_extracted_terms(self, parsed_data: Dict) -> Dict:
         """
         추출된 용어를 LLM 정규화 엔진으로 정규화
         
@@ -910,37 +893,31 @@ class InputParser:
         """
         normalized_data = parsed_data.copy()
         
-        # 설비유형 정규화
-        if parsed_data.get('equipment_type'):
-            normalized_term, confidence = normalizer.normalize_term(
-                parsed_data['equipment_type'], 'equipment'
-            )
-            if confidence > 0.3:  # 신뢰도 임계값
-                normalized_data['equipment_type'] = normalized_term
-        
-        # 위치 정규화
-        if parsed_data.get('location'):
-            normalized_term, confidence = normalizer.normalize_term(
-                parsed_data['location'], 'location'
-            )
-            if confidence > 0.3:
-                normalized_data['location'] = normalized_term
+        # 설비유형, 위치, 현상코드, 우선순위를 한 번의 일괄 요청으로 정규화
+        field_categories = [
+            ('equipment_type', 'equipment'),
+            ('location', 'location'),
+            ('status_code', 'status'),
+            ('priority', 'priority'),
+        ]
+        fields = [(field, category) for field, category in field_categories if parsed_data.get(field)]
+        if not fields:
+            return normalized_data
         
-        # 현상코드 정규화
-        if parsed_data.get('status_code'):
-            normalized_term, confidence = normalizer.normalize_term(
-                parsed_data['status_code'], 'status'
-            )
-            if confidence > 0.3:
-                normalized_data['status_code'] = normalized_term
+        results = await normalizer.batch_normalize([(parsed_data[field], category) for field, category in fields])
         
-        # 우선순위 정규화
-        if parsed_data.get('priority'):
-            normalized_term, confidence = normalizer.normalize_term(
-                parsed_data['priority'], 'priority'
-            )
-            if confidence > 0.3:
-                normalized_data['priority'] = normalized_term
+        # 정규화 완료된 필드는 NormalizedTerm으로 기록 (DB 검색 시 재정규화 생략)
+        normalized_terms = dict(parsed_data.get('normalized_terms') or {})
+        for (field, category), (normalized_term, confidence) in zip(fields, results):
+            if confidence > 0.3:  # 신뢰도 임계값
+                normalized_data[field] = normalized_term
+                normalized_terms[field] = NormalizedTerm(
+                    value=normalized_term,
+                    category=category,
+                    confidence=confidence,
+                    original=parsed_data[field]
+                )
+        normalized_data['normalized_terms'] = normalized_terms
         
         return normalized_data
     
@@ -983,7 +960,28 @@ class InputParser:
             if current_data.get(key):
                 combined_data[key] = current_data[key]
         
+        # 정규화 정보도 함께 결합 (현재 정보 우선)
+        combined_data['normalized_terms'] = {
+            **(combined_data.get('normalized_terms') or {}),
+            **(current_data.get('normalized_terms') or {})
+        }
+        
         return combined_data
+    
+    def _collect_normalized_terms(self, data: Dict) -> Dict[str, NormalizedTerm]:
+        """
+        최종 필드 값과 일치하는 정규화 정보만 추출
+        
+        Args:
+            data: 필드 값과 normalized_terms를 포함한 데이터
+            
+        Returns:
+            필드명 → NormalizedTerm (값이 바뀐 필드는 제외)
+        """
+        return {
+            field: term for field, term in (data.get('normalized_terms') or {}).items()
+            if data.get(field) == term.value
+        }
 
 # 전역 입력 파서 인스턴스
 # 다른 모듈에서 import하여 사용
@@ -17,7 +17,9 @@ from ..models import ChatRequest, ChatResponse, ParsedInput, Recommendation
 from ..agents.parser import InputParser
 from ..logic.recommender import RecommendationEngine
 from ..session_manager import session_manager
+from ..logic.normalizer import normalizer
 from ..config import Config
+import asyncio
 import logging
 
 # API 라우터 설정
@@ -48,24 +50,27 @@ async def chat(request: ChatRequest):
         logger.info(f"채팅 요청 수신: {request.message[:50]}... (세션: {request.session_id})")
         
         # 1단계: 세션 관리 (세션 ID가 있는 경우)
+        # 세션 저장소(SQLite/Redis) 호출은 동기이므로 작업 스레드에서 실행 (이벤트 루프 차단 방지)
         session_id = request.session_id
         session_state = None
         
         if session_id:
-            session_state = session_manager.get_session(session_id)
+            session_state = await asyncio.to_thread(session_manager.get_session, session_id)
             if not session_state:
                 # 세션이 없으면 새로 생성
-                session_id = session_manager.create_session()
-                session_state = session_manager.get_session(session_id)
+                session_id = await asyncio.to_thread(session_manager.create_session)
+                session_state = await asyncio.to_thread(session_manager.get_session, session_id)
                 logger.info(f"새 세션 생성: {session_id}")
         
         # 2단계: 사용자 입력 파싱 (세션 컨텍스트 포함)
-        parsed_input = parser.parse_input(request.message, request.conversation_history, session_id)
+        parsed_input = await parser.parse_input(request.message, request.conversation_history, session_id)
         logger.info(f"입력 파싱 완료: 시나리오={parsed_input.scenario}, 신뢰도={parsed_input.confidence}")
         
         # 3단계: 세션 상태 업데이트 (세션이 있는 경우)
         if session_id and session_state:
-            session_state = session_manager.update_session(session_id, parsed_input, request.conversation_history)
+            session_state = await asyncio.to_thread(
+                session_manager.update_session, session_id, parsed_input, request.conversation_history
+            )
             logger.info(f"세션 상태 업데이트: {session_state.session_status}, 턴: {session_state.turn_count}")
             
             # 누적된 컨텍스트로 최종 파싱 결과 생성
@@ -77,7 +82,9 @@ async def chat(request: ChatRequest):
             
             # 추천 생성 (충분한 정보가 있는 경우에만)
             if session_state.accumulated_clues.has_sufficient_info():
-                recommendations = recommender.get_recommendations(accumulated_parsed_input)
+                recommendations = await recommender.get_recommendations(
+                    accumulated_parsed_input, generate_work_details=not request.lazy_work_details
+                )
                 logger.info(f"추천 생성 완료: {len(recommendations)}개")
             else:
                 recommendations = []
@@ -100,7 +107,9 @@ async def chat(request: ChatRequest):
             
             # 추천 생성 (충분한 정보가 있는 경우에만)
             if not needs_additional_input:
-                recommendations = recommender.get_recommendations(parsed_input)
+                recommendations = await recommender.get_recommendations(
+                    parsed_input, generate_work_details=not request.lazy_work_details
+                )
                 logger.info(f"추천 생성 완료: {len(recommendations)}개")
             else:
                 recommendations = []
@@ -192,7 +201,7 @@ async def _handle_scenario_1(parsed_input: ParsedInput, user_message: str, conve
     missing_fields = _check_missing_fields(parsed_input)
     
     # 추천 엔진 호출
-    recommendations = recommender.get_recommendations(parsed_input)
+    recommendations = await recommender.get_recommendations(parsed_input)
     
     # 응답 메시지 생성
     message = _create_response_message(parsed_input, recommendations, missing_fields)
@@ -242,7 +251,7 @@ async def _handle_scenario_2(parsed_input: ParsedInput, user_message: str, conve
     
     if specific_recommendation:
         # 관련 추천 항목도 함께 제공
-        related_recommendations = recommender.get_recommendations(parsed_input, limit=3)
+        related_recommendations = await recommender.get_recommendations(parsed_input, limit=3)
         
         message = f"ITEMNO {parsed_input.itemno}에 대한 작업 정보입니다:\n\n"
         message += f"• 공정: {specific_recommendation.cost_center if specific_recommendation.cost_center else specific_recommendation.process}\n"
@@ -481,11 +490,11 @@ async def session_reset(session_id: str = None):
     try:
         # 기존 세션 삭제 (있는 경우)
         if session_id:
-            session_manager.clear_session(session_id)
+            await asyncio.to_thread(session_manager.clear_session, session_id)
             logger.info(f"기존 세션 삭제: {session_id}")
         
         # 새 세션 생성
-        new_session_id = session_manager.create_session()
+        new_session_id = await asyncio.to_thread(session_manager.create_session)
         logger.info(f"새 세션 생성: {new_session_id}")
         
         return {
@@ -506,9 +515,24 @@ async def get_session_stats():
         세션 통계 정보
     """
     try:
-        stats = session_manager.get_session_stats()
+        stats = await asyncio.to_thread(session_manager.get_session_stats)
         return stats
         
     except Exception as e:
         logger.error(f"세션 통계 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="세션 통계 조회 중 오류가 발생했습니다.") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="세션 통계 조회 중 오류가 발생했습니다.")
+
+@router.get("/normalization-cache-stats")
+async def get_normalization_cache_stats():
+    """
+    정규화 캐시 통계 조회 엔드포인트
+    
+    Returns:
+        캐시 적중/미스 카운터와 적중률
+    """
+    try:
+        return normalizer.get_cache_stats()
+        
+    except Exception as e:
+        logger.error(f"정규화 캐시 통계 조회 오류: {e}")
+        raise HTTPException(status_code=500, detail="정규화 캐시 통계 조회 중 오류가 발생했습니다.")
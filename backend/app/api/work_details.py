@@ -12,14 +12,18 @@ LLM을 활용하여 작업명과 상세를 생성하고, 최종 작업요청을
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from ..models import (
-    WorkDetailsRequest, WorkDetailsResponse, 
+    WorkDetailsRequest, WorkDetailsResponse, WorkDetailsBatchRequest,
     FinalizeRequest, FinalizeResponse, WorkOrder
 )
 from ..logic.recommender import recommendation_engine
+from ..logic.work_details_cache import work_details_cache
 from ..database import db_manager
-from openai import OpenAI
+from ..llm_gateway import llm_gateway
 from ..config import Config
+import asyncio
+import json
 import logging
 from datetime import datetime
 import uuid
@@ -30,7 +34,7 @@ router = APIRouter(tags=["work-details"])
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# OpenAI 설정 (제거됨 - 각 함수에서 개별적으로 설정)
+# LLM 호출은 전역 비동기 게이트웨이(llm_gateway.py) 사용
 
 @router.post("/generate-work-details", response_model=WorkDetailsResponse)
 async def generate_work_details(request: WorkDetailsRequest):
@@ -87,7 +91,8 @@ async def generate_work_details(request: WorkDetailsRequest):
         
         return WorkDetailsResponse(
             work_title=work_details['work_title'],
-            work_details=work_details['work_details']
+            work_details=work_details['work_details'],
+            cache_hit=work_details.get('cache_hit', False)
         )
         
     except HTTPException:
@@ -96,6 +101,85 @@ async def generate_work_details(request: WorkDetailsRequest):
         logger.error(f"작업상세 생성 오류: {e}")
         raise HTTPException(status_code=500, detail="서버 내부 오류가 발생했습니다.")
 
+@router.post("/generate-work-details/stream")
+async def stream_work_details(request: WorkDetailsBatchRequest):
+    """
+    작업상세 스트리밍 생성 엔드포인트 (Server-Sent Events)
+    
+    chat.py에서 lazy_work_details=True로 받은 추천 목록의 작업명/상세를 동시에 생성하고,
+    완료되는 순서대로 항목별 이벤트를 전송합니다.
+    
+    Args:
+        request: WorkDetailsBatchRequest - 추천 항목 목록과 사용자 메시지
+        
+    Returns:
+        text/event-stream 응답
+        - data: {"index", "itemno", "work_title", "work_details", "generated", "cache_hit"} (항목별)
+        - event: done (모든 항목 완료)
+        
+    연계 파일:
+    - config.py: WORK_DETAILS_CONCURRENCY, WORK_DETAILS_TIMEOUT_SECONDS
+    
+    담당자 수정 가이드:
+    - 생성 실패/시간 초과 항목은 generated=false와 함께 이력 작업명/상세를 전송
+    - index는 요청 목록에서의 위치 (프론트엔드 카드 매칭용)
+    """
+    logger.info(f"작업상세 스트리밍 요청: {len(request.recommendations)}건")
+    return StreamingResponse(
+        _work_details_event_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _work_details_event_stream(request: WorkDetailsBatchRequest):
+    """추천 항목별 작업상세를 완료 순서대로 SSE 이벤트로 생성"""
+    semaphore = asyncio.Semaphore(max(1, Config.WORK_DETAILS_CONCURRENCY))
+    
+    async def generate(index: int, recommendation) -> dict:
+        async with semaphore:
+            try:
+                work_details = await asyncio.wait_for(
+                    _generate_work_details_with_llm(recommendation, request.user_message),
+                    timeout=Config.WORK_DETAILS_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"작업상세 생성 시간 초과: {recommendation.itemno} (이력 작업명 유지)")
+                work_details = {}
+        generated = bool(work_details.get('work_title') and work_details.get('work_details'))
+        return {
+            "index": index,
+            "itemno": recommendation.itemno,
+            "work_title": work_details['work_title'] if generated else recommendation.work_title,
+            "work_details": work_details['work_details'] if generated else recommendation.work_details,
+            "generated": generated,
+            "cache_hit": generated and work_details.get('cache_hit', False)
+        }
+    
+    tasks = [asyncio.ensure_future(generate(i, rec)) for i, rec in enumerate(request.recommendations)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+    finally:
+        # 클라이언트 연결 종료 시 남은 생성 작업 취소
+        for task in tasks:
+            task.cancel()
+
+@router.get("/work-details-cache-stats")
+async def get_work_details_cache_stats():
+    """
+    작업명/상세 생성 캐시 통계 조회
+    
+    Returns:
+        메모리/DB 적중 수, 미스 수, 저장/제거 수, 적중률
+    """
+    try:
+        return work_details_cache.get_stats()
+    except Exception as e:
+        logger.error(f"작업상세 캐시 통계 조회 오류: {e}")
+        raise HTTPException(status_code=500, detail="캐시 통계 조회 중 오류가 발생했습니다.")
+
 @router.post("/finalize-work-order", response_model=FinalizeResponse)
 async def finalize_work_order(request: FinalizeRequest):
     """
@@ -188,7 +272,7 @@ async def _generate_work_details_with_llm(recommendation, user_message: str) ->
         user_message: 사용자 원본 메시지
         
     Returns:
-        생성된 작업명과 상세 딕셔너리
+        생성된 작업명과 상세 딕셔너리 (캐시 적중 시 cache_hit=True 포함)
         
     사용처:
     - generate_work_details()에서 호출
@@ -200,25 +284,31 @@ async def _generate_work_details_with_llm(recommendation, user_message: str) ->
     - 특정 설비유형별 맞춤 프롬프트 사용 가능
     """
     try:
+        # 같은 (설비유형, 현상코드, 위치, 우선순위, 사용자 메시지) 조합은 캐시된 결과 재사용
+        # (SQLite 조회/사용 시각 갱신이 포함되므로 이벤트 루프 밖에서 실행)
+        cached = await asyncio.to_thread(work_details_cache.get, recommendation, user_message)
+        if cached:
+            return dict(cached, cache_hit=True)
+        
         # LLM 프롬프트 생성
         prompt = _create_work_details_prompt(recommendation, user_message)
         
         # LLM 호출
-        client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model=Config.OPENAI_MODEL,
+        result_text = await llm_gateway.complete(
             messages=[
                 {"role": "system", "content": "당신은 설비관리 시스템의 작업명과 상세 생성 전문가입니다."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,  # 적당한 창의성
-            max_tokens=400
+            max_tokens=400,
+            model=Config.OPENAI_MODEL
         )
         
-        result_text = response.choices[0].message.content.strip()
-        
         # 응답 파싱
         work_details = _parse_work_details_response(result_text)
+        if work_details.get('work_title') and work_details.get('work_details'):
+            await asyncio.to_thread(work_details_cache.put, recommendation,
+                                    work_details['work_title'], work_details['work_details'], user_message)
         return work_details
         
     except Exception as e:
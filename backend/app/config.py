@@ -19,10 +19,14 @@ class Config:
     LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")  # openai, local
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")  # 비우면 OpenAI 기본 주소 (테스트 시 로컬 가짜 서버 지정)
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 30))
     
     # 데이터베이스 설정
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/sample_notifications.db")
     SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "./data/sample_notifications.db")
+    SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", 256))  # 연결별 prepared statement 캐시 크기
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))  # 잠금 대기 시간
     
     # 파일 경로 설정 (절대 경로 사용)
     # 현재 파일(backend/app/config.py)에서 프로젝트 루트까지의 경로 계산
@@ -35,13 +39,68 @@ class Config:
     STATUS_CODE_FILE = os.getenv("STATUS_CODE_FILE") or os.path.join(PROJECT_ROOT, "[현상코드].xlsx")
     EQUIPMENT_TYPE_FILE = os.getenv("EQUIPMENT_TYPE_FILE") or os.path.join(PROJECT_ROOT, "설비유형 자료_20250522.xlsx")
     
+    # Excel 원본 캐시 설정 (파싱 결과를 Parquet으로 저장해 다음 실행부터 재사용)
+    EXCEL_CACHE_ENABLED = os.getenv("EXCEL_CACHE_ENABLED", "True").lower() == "true"
+    EXCEL_CACHE_DIR = os.getenv("EXCEL_CACHE_DIR", "./data/excel_cache")
+    
     # 벡터 DB 설정
     VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH", "./data/vector_db")
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    EMBEDDING_ENABLED = os.getenv("EMBEDDING_ENABLED", "True").lower() == "true"
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 64))
+    EMBEDDING_TOP_K = int(os.getenv("EMBEDDING_TOP_K", 50))
+    # IVF 근사 검색 (벡터 수가 MIN_VECTORS 이상이면 사용, LISTS=0이면 sqrt(벡터 수))
+    VECTOR_IVF_MIN_VECTORS = int(os.getenv("VECTOR_IVF_MIN_VECTORS", 20000))
+    VECTOR_IVF_LISTS = int(os.getenv("VECTOR_IVF_LISTS", 0))
+    VECTOR_IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", 16))
+    
+    # 정규화 캐시 설정 (메모리 LRU + SQLite 영구 캐시)
+    NORMALIZATION_CACHE_SIZE = int(os.getenv("NORMALIZATION_CACHE_SIZE", 2048))
+    NORMALIZATION_CACHE_TTL_HOURS = float(os.getenv("NORMALIZATION_CACHE_TTL_HOURS", 24 * 7))
+    
+    # 로컬 정규화 설정 (이 신뢰도 이상이면 LLM 호출 생략)
+    LOCAL_NORMALIZATION_MIN_CONFIDENCE = float(os.getenv("LOCAL_NORMALIZATION_MIN_CONFIDENCE", 0.9))
+    
+    # 정규화 후보 검색 설정 (프롬프트에는 상위 K개 후보만 포함)
+    NORMALIZATION_SHORTLIST_SIZE = int(os.getenv("NORMALIZATION_SHORTLIST_SIZE", 20))
+    NORMALIZATION_PROMPT_VOCAB_LIMIT = int(os.getenv("NORMALIZATION_PROMPT_VOCAB_LIMIT", 50))  # 이 크기 이하 어휘는 전체 포함
+    NORMALIZATION_ACCEPT_SCORE = float(os.getenv("NORMALIZATION_ACCEPT_SCORE", 0.85))  # 상위 후보 확정 최소 유사도
+    NORMALIZATION_ACCEPT_MARGIN = float(os.getenv("NORMALIZATION_ACCEPT_MARGIN", 0.15))  # 2순위와의 최소 차이
+    
+    # 추천 작업명/상세 생성 설정 (동시 호출 수, 호출당 제한 시간)
+    WORK_DETAILS_CONCURRENCY = int(os.getenv("WORK_DETAILS_CONCURRENCY", 5))
+    WORK_DETAILS_TIMEOUT_SECONDS = float(os.getenv("WORK_DETAILS_TIMEOUT_SECONDS", 8))
+    
+    # 작업명/상세 생성 캐시 설정 (메모리 LRU 크기, 영구 캐시 최대 항목 수, 유효 시간)
+    WORK_DETAILS_CACHE_SIZE = int(os.getenv("WORK_DETAILS_CACHE_SIZE", 512))
+    WORK_DETAILS_CACHE_MAX_ENTRIES = int(os.getenv("WORK_DETAILS_CACHE_MAX_ENTRIES", 10000))
+    WORK_DETAILS_CACHE_TTL_HOURS = float(os.getenv("WORK_DETAILS_CACHE_TTL_HOURS", 24 * 30))
+    
+    # 영구 캐시 정리 주기 (TTL 지난 항목 삭제, main.py 백그라운드 작업)
+    CACHE_PURGE_INTERVAL_SECONDS = float(os.getenv("CACHE_PURGE_INTERVAL_SECONDS", 3600))
+    
+    # ITEMNO 유사 검색 설정 (상위 후보 수, 최소 점수 = 1 - 편집거리/길이)
+    ITEMNO_FUZZY_TOP_K = int(os.getenv("ITEMNO_FUZZY_TOP_K", 5))
+    ITEMNO_FUZZY_MIN_SCORE = float(os.getenv("ITEMNO_FUZZY_MIN_SCORE", 0.7))
     
     # 추천 설정
     MAX_RECOMMENDATIONS = int(os.getenv("MAX_RECOMMENDATIONS", 15))
     MIN_RECOMMENDATIONS = int(os.getenv("MIN_RECOMMENDATIONS", 1))
+    RECOMMENDATION_CANDIDATE_POOL = int(os.getenv("RECOMMENDATION_CANDIDATE_POOL", 200))  # 점수를 계산할 DB 후보 수
+    SIMILARITY_MEMO_SIZE = int(os.getenv("SIMILARITY_MEMO_SIZE", 50000))  # (입력, 후보 값) 유사도 메모 최대 항목 수
+    RETRIEVAL_FUZZY_POOL_SIZE = int(os.getenv("RETRIEVAL_FUZZY_POOL_SIZE", 100))  # 유사 후보 단계 최대 후보 수
+    RETRIEVAL_STAGE_BUDGET_MS = float(os.getenv("RETRIEVAL_STAGE_BUDGET_MS", 150))  # 후보 수집 단계별 쿼리 시간 제한
+    RETRIEVAL_PIPELINE_BUDGET_MS = float(os.getenv("RETRIEVAL_PIPELINE_BUDGET_MS", 400))  # 후보 수집 전체 시간 제한
+    
+    # 세션 저장소 설정 (memory: 단일 워커, sqlite: 같은 서버의 여러 워커, redis: 여러 서버)
+    SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+    SESSION_TIMEOUT_MINUTES = float(os.getenv("SESSION_TIMEOUT_MINUTES", 30))
+    MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", 10000))  # 초과 시 가장 오래 갱신되지 않은 세션부터 삭제 (0이면 제한 없음)
+    SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", 60))  # 만료 세션 정리 주기
+    SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "")  # 비우면 SQLITE_DB_PATH 사용
+    SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+    SESSION_REDIS_PREFIX = os.getenv("SESSION_REDIS_PREFIX", "pmark:session:")
+    SESSION_REDIS_TIMEOUT_SECONDS = float(os.getenv("SESSION_REDIS_TIMEOUT_SECONDS", 2))  # Redis 연결/명령 제한 시간
     
     # 에러 처리 설정
     MAX_SQL_RETRY = int(os.getenv("MAX_SQL_RETRY", 5))
@@ -9,14 +9,28 @@ PMark1 AI Assistant - 데이터베이스 관리 모듈
 - DB 스키마 변경 시 기존 데이터 마이그레이션 필요
 - LLM 정규화 엔진과 연동되어 정확한 용어 매칭 제공
 - 성능 최적화를 위해 인덱스 설정 권장
+- 텍스트 검색은 FTS5 trigram 인덱스(notification_fts)를 사용하며, 트리거와 적재 후 rebuild로 동기화됩니다
+- 위치/설비유형/현상코드/우선순위는 사전 테이블(dim_*)의 정수 코드(*_id)로도 저장되어 복합 인덱스로 필터링합니다
+- Excel 적재는 파일 지문(크기/수정시각/sha256)이 바뀐 경우에만 수행하며, 이력은 행 해시 기준으로 변경분만 반영합니다
+- Excel 파싱 결과는 excel_cache.py에 원본 sha256 기준으로 캐시되어 DB를 새로 만들 때 재사용됩니다
 """
 
+import asyncio
+import hashlib
 import sqlite3
+import time
+import uuid
 import pandas as pd
 import os
 from typing import List, Dict, Any, Optional
 from .config import Config
+from .db_connection import get_connection_manager, close_all_connections
+from .excel_cache import excel_cache
+from .models import NormalizedTerm
 from .logic.normalizer import normalizer
+from .logic.vocabulary import vocabulary_service
+from .logic.itemno_index import itemno_index
+from .vector_db import embedding_index
 import logging
 
 class DatabaseManager:
@@ -36,293 +50,799 @@ class DatabaseManager:
     - DB 스키마 변경 시 create_tables() 메서드 수정
     - 새로운 검색 조건 추가 시 search_similar_notifications() 수정
     - 성능 최적화를 위해 인덱스 추가 고려
+    - 검색 대상 텍스트 컬럼 추가 시 FTS_COLUMNS와 트리거(_ensure_search_index) 함께 수정
     """
     
+    # 부분 일치 검색용 FTS5 trigram 인덱스 (notification_history 외부 콘텐츠 테이블)
+    FTS_TABLE = "notification_fts"
+    FTS_COLUMNS = ("itemno", "location", "process", "equipType", "statusCode", "work_title")
+    # trigram 인덱스는 3글자 이상 검색어만 처리 가능 (더 짧으면 LIKE로 대체)
+    FTS_MIN_TERM_LENGTH = 3
+    # FTS를 끄고 LIKE 검색으로 대체하는 오류 (FTS5 모듈/trigram 토크나이저 미지원)
+    FTS_UNSUPPORTED_ERRORS = ("no such module: fts5", "no such tokenizer")
+    # database_meta의 이력 테이블 식별자 키 (테이블을 새로 만들 때마다 새 값)
+    HISTORY_TABLE_ID_KEY = "history_table_id"
+    # 범주형 컬럼 사전 인코딩: 원본 컬럼 → (코드 컬럼, 사전 테이블)
+    CATEGORY_COLUMNS = {
+        "location": ("location_id", "dim_location"),
+        "equipType": ("equip_id", "dim_equip_type"),
+        "statusCode": ("status_id", "dim_status_code"),
+        "priority": ("priority_id", "dim_priority"),
+    }
+    # 작업요청 이력 보조 인덱스 (대량 적재 시 삭제 후 재생성)
+    HISTORY_INDEXES = {
+        "idx_equipType": "equipType",
+        "idx_location": "location",
+        "idx_statusCode": "statusCode",
+        "idx_process": "process",
+        "idx_cost_center": "cost_center",
+        "idx_itemno": "itemno",
+        # 정규화된 위치/설비유형/현상코드 조합 검색은 복합 인덱스 탐색으로 처리
+        "idx_category_codes": "location_id, equip_id, status_id",
+        "idx_equip_status_codes": "equip_id, status_id",
+    }
+    # Excel 이력 원본 컬럼 (행 해시 계산 대상)
+    HISTORY_SOURCE_COLUMNS = ['itemno', 'process', 'location', 'cost_center', 'equipType', 'statusCode', 'work_title', 'priority']
+    # 새로 추가할 행이 이 수 이상이면 트리거/인덱스를 내리고 적재 후 일괄 재생성
+    BULK_REINDEX_MIN_ROWS = 5000
+    
     def __init__(self):
         """
         데이터베이스 매니저 초기화
         
         설정:
-        - 데이터베이스 연결 설정
+        - 연결 관리자 연결 (스레드별 읽기 연결 + 단일 쓰기 연결, db_connection.py)
         - 테이블 생성 (없는 경우)
         - 로깅 설정
         """
         self.db_path = Config.SQLITE_DB_PATH
-        self.conn = None
         self.logger = logging.getLogger(__name__)
         self._ensure_data_directory()
+        self.connections = get_connection_manager(self.db_path)
+        self.fts_enabled = False
         self._initialize_database()
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """현재 스레드의 읽기 전용 연결 (쓰기는 self.connections.writer() 사용)"""
+        return self.connections.reader()
+    
     def _ensure_data_directory(self):
         """데이터 디렉토리 생성"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
     def _initialize_database(self):
         """데이터베이스 초기화 및 테이블 생성"""
-        self.conn = sqlite3.connect(self.db_path)
-        
-        # 작업요청 이력 테이블 생성
-        self.conn.execute('''
-            CREATE TABLE IF NOT EXISTS notification_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                itemno TEXT NOT NULL,
-                process TEXT,
-                location TEXT,
-                cost_center TEXT,
-                equipType TEXT,
-                statusCode TEXT,
-                work_title TEXT,
-                work_details TEXT,
-                priority TEXT DEFAULT '일반작업',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        with self.connections.writer() as conn:
+            # 이전 버전의 전체 교체 적재(pandas to_sql)로 만들어진 이력 테이블은 스키마가 달라 재생성
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(notification_history)")}
+            if existing and "id" not in existing:
+                self.logger.info("이전 적재 방식의 작업요청 이력 테이블을 재생성합니다 (다음 적재 시 전체 재적재)")
+                conn.execute("DROP TABLE notification_history")
+                conn.execute("DROP TABLE IF EXISTS ingest_sources")
+            
+            # 작업요청 이력 테이블 생성
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS notification_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    itemno TEXT NOT NULL,
+                    process TEXT,
+                    location TEXT,
+                    cost_center TEXT,
+                    equipType TEXT,
+                    statusCode TEXT,
+                    work_title TEXT,
+                    work_details TEXT,
+                    priority TEXT DEFAULT '일반작업',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    location_id INTEGER,
+                    equip_id INTEGER,
+                    status_id INTEGER,
+                    priority_id INTEGER,
+                    row_hash TEXT,
+                    source TEXT
+                )
+            ''')
+            created = not existing or "id" not in existing
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(notification_history)")}
+            for column in ("row_hash", "source"):
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE notification_history ADD COLUMN {column} TEXT")
+            
+            # 이력 테이블 식별자: 테이블(또는 DB 파일)을 새로 만들면 rowid가 다시 1부터 쓰이므로
+            # rowid를 보관하는 임베딩 인덱스(vector_db.py)가 이 값으로 같은 테이블인지 확인
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS database_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            ''')
+            conn.execute(
+                f"INSERT OR {'REPLACE' if created else 'IGNORE'} INTO database_meta (key, value) VALUES (?, ?)",
+                (self.HISTORY_TABLE_ID_KEY, uuid.uuid4().hex)
             )
-        ''')
+            
+            # 적재한 원본 파일 지문 (변경 감지용)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ingest_sources (
+                    source_path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    row_count INTEGER,
+                    ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
         
-        # 현상코드 테이블 생성
-        self.conn.execute('''
-            CREATE TABLE IF NOT EXISTS status_codes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                code TEXT NOT NULL,
-                description TEXT,
-                category TEXT
-            )
-        ''')
+            # 현상코드 테이블 생성
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS status_codes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    code TEXT NOT NULL,
+                    description TEXT,
+                    category TEXT
+                )
+            ''')
         
-        # 설비유형 테이블 생성
-        self.conn.execute('''
-            CREATE TABLE IF NOT EXISTS equipment_types (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                type_code TEXT NOT NULL,
-                type_name TEXT,
-                category TEXT
-            )
-        ''')
+            # 설비유형 테이블 생성
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS equipment_types (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    type_code TEXT NOT NULL,
+                    type_name TEXT,
+                    category TEXT
+                )
+            ''')
         
-        # 인덱스 생성 (검색 성능 향상)
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_equipType ON notification_history(equipType)")
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_location ON notification_history(location)")
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_statusCode ON notification_history(statusCode)")
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_process ON notification_history(process)")
-        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cost_center ON notification_history(cost_center)")
+            # 범주형 컬럼 코드 (기존 DB에 코드 컬럼이 없으면 추가 후 인코딩)
+            self._ensure_category_codes(conn)
+            # 인덱스 생성 (검색 성능 향상)
+            self._create_history_indexes(conn)
+            # 부분 일치 검색용 FTS 인덱스 (기존 DB에 처음 만들 때는 전체 색인)
+            self._ensure_search_index(conn)
         
-        self.conn.commit()
         self.logger.info("데이터베이스 초기화 완료")
     
+    def _create_history_indexes(self, conn: sqlite3.Connection):
+        """작업요청 이력 보조 인덱스와 행 해시 고유 인덱스 생성 (이미 있으면 유지)"""
+        for name, columns in self.HISTORY_INDEXES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON notification_history({columns})")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_row_hash ON notification_history(row_hash)")
+    
+    def _ensure_search_index(self, conn: sqlite3.Connection, rebuild: bool = False):
+        """
+        FTS5 trigram 검색 인덱스와 동기화 트리거 생성
+        
+        notification_history의 INSERT/UPDATE/DELETE는 트리거로 인덱스에 반영됩니다.
+        Excel 대량 적재처럼 트리거를 내린 상태로 데이터를 바꾼 경우에는 rebuild=True로 호출합니다.
+        FTS5/trigram 토크나이저를 지원하지 않는 SQLite에서만 LIKE 검색으로 대체하며,
+        잠금 등 일시적인 오류는 그대로 올려 FTS가 프로세스 수명 동안 꺼지지 않도록 합니다.
+        """
+        columns = ", ".join(self.FTS_COLUMNS)
+        new_columns = ", ".join(f"new.{column}" for column in self.FTS_COLUMNS)
+        old_columns = ", ".join(f"old.{column}" for column in self.FTS_COLUMNS)
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.FTS_TABLE,)
+            ).fetchone() is not None
+            conn.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {self.FTS_TABLE}
+                USING fts5({columns}, content='notification_history', tokenize='trigram')
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {self.FTS_TABLE}_ai AFTER INSERT ON notification_history BEGIN
+                    INSERT INTO {self.FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_columns});
+                END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {self.FTS_TABLE}_ad AFTER DELETE ON notification_history BEGIN
+                    INSERT INTO {self.FTS_TABLE}({self.FTS_TABLE}, rowid, {columns})
+                    VALUES ('delete', old.rowid, {old_columns});
+                END
+            ''')
+            # 텍스트 컬럼이 바뀔 때만 재색인 (코드 컬럼 갱신은 제외)
+            # 모든 컬럼 갱신에 반응하던 이전 정의가 남아 있는 경우에만 다시 생성
+            update_trigger = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f"{self.FTS_TABLE}_au",)
+            ).fetchone()
+            if update_trigger and "UPDATE OF" not in update_trigger[0]:
+                conn.execute(f"DROP TRIGGER {self.FTS_TABLE}_au")
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {self.FTS_TABLE}_au AFTER UPDATE OF {columns} ON notification_history BEGIN
+                    INSERT INTO {self.FTS_TABLE}({self.FTS_TABLE}, rowid, {columns})
+                    VALUES ('delete', old.rowid, {old_columns});
+                    INSERT INTO {self.FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_columns});
+                END
+            ''')
+            if rebuild or not exists:
+                conn.execute(f"INSERT INTO {self.FTS_TABLE}({self.FTS_TABLE}) VALUES ('rebuild')")
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            if not any(reason in str(e) for reason in self.FTS_UNSUPPORTED_ERRORS):
+                raise
+            self.logger.warning(f"FTS 검색 인덱스 사용 불가, LIKE 검색 사용: {e}")
+            self.fts_enabled = False
+    
+    def _ensure_category_codes(self, conn: sqlite3.Connection, rebuild: bool = False):
+        """
+        범주형 컬럼 사전 테이블, 코드 컬럼, 인코딩 트리거 생성 (복합 인덱스는 HISTORY_INDEXES)
+        
+        - 사전 테이블(dim_*)은 값별 정수 id를 가지며 대소문자를 구분하지 않습니다
+        - 새 이력 행은 트리거가 사전에 값을 등록하고 코드 컬럼을 채웁니다
+        - 코드 컬럼이 새로 추가되었거나 rebuild=True(Excel 대량 적재)면 전체 행을 일괄 인코딩합니다
+        """
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(notification_history)")}
+        added = False
+        for column, (id_column, dim_table) in self.CATEGORY_COLUMNS.items():
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {dim_table} (
+                    id INTEGER PRIMARY KEY,
+                    value TEXT NOT NULL UNIQUE COLLATE NOCASE
+                )
+            ''')
+            if id_column not in existing:
+                conn.execute(f"ALTER TABLE notification_history ADD COLUMN {id_column} INTEGER")
+                added = True
+        
+        register = "".join(
+            f"INSERT OR IGNORE INTO {dim_table}(value) SELECT new.{column} WHERE new.{column} IS NOT NULL;\n"
+            for column, (_, dim_table) in self.CATEGORY_COLUMNS.items()
+        )
+        assignments = ", ".join(
+            f"{id_column} = (SELECT id FROM {dim_table} WHERE value = new.{column})"
+            for column, (id_column, dim_table) in self.CATEGORY_COLUMNS.items()
+        )
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS notification_codes_ai AFTER INSERT ON notification_history BEGIN
+                {register}
+                UPDATE notification_history SET {assignments} WHERE rowid = new.rowid;
+            END
+        ''')
+        
+        if rebuild or added:
+            for column, (id_column, dim_table) in self.CATEGORY_COLUMNS.items():
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {dim_table}(value) "
+                    f"SELECT DISTINCT {column} FROM notification_history WHERE {column} IS NOT NULL"
+                )
+                conn.execute(
+                    f"UPDATE notification_history SET {id_column} = "
+                    f"(SELECT id FROM {dim_table} WHERE value = notification_history.{column})"
+                )
+    
     def load_excel_data(self):
-        """Excel 파일에서 데이터 로드"""
+        """
+        Excel 파일에서 데이터 로드 (변경된 파일만)
+        
+        파일 지문이 지난 적재와 같으면 해당 파일은 읽지 않습니다.
+        작업요청 이력은 행 해시로 비교하여 새 행만 추가하고 파일에서 사라진 행만 삭제합니다.
+        """
         try:
-            # 작업요청 이력 로드
-            if os.path.exists(Config.NOTIFICATION_HISTORY_FILE):
-                df_history = pd.read_excel(Config.NOTIFICATION_HISTORY_FILE)
-                
-                # 컬럼명 매핑 (실제 Excel 파일 구조에 맞춤)
-                column_mapping = {
-                    '작업대상': 'itemno',
-                    'Plant': 'process', 
-                    'Location': 'location',
-                    'Cost Center': 'cost_center',  # 공정명 표시용
-                    '설비유형': 'equipType',
-                    '현상코드': 'statusCode',
-                    '작업명': 'work_title',
-                    '우선 순위': 'priority'
-                }
+            with self.connections.writer() as conn:
+                # 작업요청 이력 로드
+                history_fingerprint = self._detect_source_change(conn, Config.NOTIFICATION_HISTORY_FILE)
+                if history_fingerprint is not None:
+                    started = time.perf_counter()
+                    df_history = excel_cache.read_excel(Config.NOTIFICATION_HISTORY_FILE, sha256=history_fingerprint["sha256"])
+                    self._log_stage("작업요청 이력 읽기", len(df_history), started)
                 
-                # 컬럼명 변경
-                df_history = df_history.rename(columns=column_mapping)
+                    # 컬럼명 매핑 (실제 Excel 파일 구조에 맞춤)
+                    column_mapping = {
+                        '작업대상': 'itemno',
+                        'Plant': 'process', 
+                        'Location': 'location',
+                        'Cost Center': 'cost_center',  # 공정명 표시용
+                        '설비유형': 'equipType',
+                        '현상코드': 'statusCode',
+                        '작업명': 'work_title',
+                        '우선 순위': 'priority'
+                    }
                 
-                # 필요한 컬럼만 선택하고 나머지는 기본값으로 설정
-                required_columns = ['itemno', 'process', 'location', 'cost_center', 'equipType', 'statusCode', 'work_title', 'priority']
-                for col in required_columns:
-                    if col not in df_history.columns:
-                        df_history[col] = ''
+                    # 컬럼명 변경
+                    df_history = df_history.rename(columns=column_mapping)
                 
-                # work_details 컬럼 추가 (작업명을 복사)
-                df_history['work_details'] = df_history.get('work_title', '')
+                    # 필요한 컬럼만 선택하고 나머지는 기본값으로 설정
+                    required_columns = ['itemno', 'process', 'location', 'cost_center', 'equipType', 'statusCode', 'work_title', 'priority']
+                    for col in required_columns:
+                        if col not in df_history.columns:
+                            df_history[col] = ''
                 
-                # created_at 컬럼 추가 (현재 시간으로 설정)
-                df_history['created_at'] = pd.Timestamp.now()
-                
-                # 필요한 컬럼만 선택
-                df_history = df_history[required_columns + ['work_details', 'created_at']]
-                
-                df_history.to_sql('notification_history', self.conn, if_exists='replace', index=False)
-                self.logger.info(f"작업요청 이력 로드 완료: {len(df_history)} 건")
+                    # 필요한 컬럼만 선택 후 변경분 반영
+                    started = time.perf_counter()
+                    df_history = df_history[required_columns]
+                    inserted, removed = self._upsert_history(conn, df_history)
+                    self._record_source(conn, history_fingerprint, len(df_history))
+                    self._log_stage("작업요청 이력 반영", len(df_history), started)
+                    self.logger.info(f"작업요청 이력 로드 완료: {len(df_history)} 건 (추가 {inserted}, 삭제 {removed})")
             
-            # 현상코드 로드
-            if os.path.exists(Config.STATUS_CODE_FILE):
-                df_status = pd.read_excel(Config.STATUS_CODE_FILE)
-                # 컬럼명 정리 (공백 제거)
-                df_status.columns = [c.strip() for c in df_status.columns]
-                self.logger.info(f"현상코드 파일 로드: {len(df_status)} 건, 컬럼: {df_status.columns.tolist()}")
+                # 현상코드 로드
+                status_fingerprint = self._detect_source_change(conn, Config.STATUS_CODE_FILE)
+                if status_fingerprint is not None:
+                    started = time.perf_counter()
+                    df_status = excel_cache.read_excel(Config.STATUS_CODE_FILE, sha256=status_fingerprint["sha256"])
+                    # 컬럼명 정리 (공백 제거)
+                    df_status.columns = [str(c).strip() for c in df_status.columns]
+                    self._log_stage("현상코드 읽기", len(df_status), started)
+                    self.logger.info(f"현상코드 파일 컬럼: {df_status.columns.tolist()}")
                 
-                # '현상코드' 컬럼만 추출하여 표준 테이블 구조로 변환
-                if '현상코드' in df_status.columns:
-                    # 빈 값 제거
-                    df_status = df_status.dropna(subset=['현상코드'])
-                    df_status = df_status[df_status['현상코드'].str.strip() != '']
+                    # '현상코드' 컬럼만 추출하여 표준 테이블 구조로 변환
+                    if '현상코드' not in df_status.columns:
+                        self.logger.error("현상코드 파일에 '현상코드' 컬럼이 없습니다.")
+                        raise RuntimeError("현상코드 파일에 '현상코드' 컬럼이 없습니다.")
                     
-                    # 표준 테이블 구조로 변환
-                    status_codes = []
-                    for _, row in df_status.iterrows():
-                        code = row['현상코드'].strip()
-                        status_codes.append({
-                            'code': code,
-                            'description': code,  # 설명은 코드와 동일
-                            'category': '표준'    # 기본 카테고리
-                        })
+                    started = time.perf_counter()
+                    codes = self._clean_text_column(df_status['현상코드'])
+                    codes = codes[codes != '']
+                    # 설명은 코드와 동일, 기본 카테고리 '표준'
+                    rows = [(code, code, '표준') for code in codes.tolist()]
+                    self._log_stage("현상코드 변환", len(rows), started)
                     
-                    # DataFrame으로 변환 후 DB에 저장
-                    df_status_final = pd.DataFrame(status_codes)
-                    df_status_final.to_sql('status_codes', self.conn, if_exists='replace', index=False)
-                    self.logger.info(f"현상코드 로드 완료: {len(df_status_final)} 건")
-                else:
-                    self.logger.error("현상코드 파일에 '현상코드' 컬럼이 없습니다.")
-                    raise RuntimeError("현상코드 파일에 '현상코드' 컬럼이 없습니다.")
+                    started = time.perf_counter()
+                    conn.execute("DELETE FROM status_codes")
+                    conn.executemany("INSERT INTO status_codes (code, description, category) VALUES (?, ?, ?)", rows)
+                    self._record_source(conn, status_fingerprint, len(rows))
+                    self._log_stage("현상코드 저장", len(rows), started)
+                    self.logger.info(f"현상코드 로드 완료: {len(rows)} 건")
             
-            # 설비유형 자료 로드 (두 번째 시트)
-            if os.path.exists(Config.EQUIPMENT_TYPE_FILE):
-                try:
-                    # 두 번째 시트 로드 (sheet_name=1), header=None
-                    df_equip = pd.read_excel(Config.EQUIPMENT_TYPE_FILE, sheet_name=1, header=None)
-                    # row 2(인덱스 2)부터가 실제 데이터
-                    df_equip = df_equip.iloc[2:].reset_index(drop=True)
-                    # 컬럼명 지정: idx, category, type_code, type_name
-                    df_equip.columns = ['idx', 'category', 'type_code', 'type_name']
-                    df_equip = df_equip[['type_code', 'type_name', 'category']]
-                    df_equip.to_sql('equipment_types', self.conn, if_exists='replace', index=False)
-                    self.logger.info(f"설비유형 자료 로드 완료: {len(df_equip)} 건")
-                except Exception as e:
-                    self.logger.warning(f"설비유형 자료 로드 실패 (두 번째 시트): {e}")
-                    # 첫 번째 시트로 재시도
+                # 설비유형 자료 로드 (두 번째 시트)
+                equipment_fingerprint = self._detect_source_change(conn, Config.EQUIPMENT_TYPE_FILE)
+                if equipment_fingerprint is not None:
                     try:
-                        df_equip = pd.read_excel(Config.EQUIPMENT_TYPE_FILE, sheet_name=0)
-                        df_equip.to_sql('equipment_types', self.conn, if_exists='replace', index=False)
-                        self.logger.info(f"설비유형 자료 로드 완료 (첫 번째 시트): {len(df_equip)} 건")
-                    except Exception as e2:
-                        self.logger.error(f"설비유형 자료 로드 완전 실패: {e2}")
+                        # 두 번째 시트 로드 (sheet_name=1), header=None
+                        started = time.perf_counter()
+                        df_equip = excel_cache.read_excel(Config.EQUIPMENT_TYPE_FILE, sha256=equipment_fingerprint["sha256"],
+                                                           sheet_name=1, header=None)
+                        self._log_stage("설비유형 읽기", len(df_equip), started)
+                        
+                        # row 2(인덱스 2)부터가 실제 데이터
+                        # 컬럼: idx, category, type_code, type_name
+                        started = time.perf_counter()
+                        df_equip = df_equip.iloc[2:, :4]
+                        df_equip.columns = ['idx', 'category', 'type_code', 'type_name']
+                        rows = self._equipment_rows(df_equip)
+                        self._log_stage("설비유형 변환", len(rows), started)
+                        
+                        started = time.perf_counter()
+                        self._replace_equipment_types(conn, rows)
+                        self._record_source(conn, equipment_fingerprint, len(rows))
+                        self._log_stage("설비유형 저장", len(rows), started)
+                        self.logger.info(f"설비유형 자료 로드 완료: {len(rows)} 건")
+                    except Exception as e:
+                        self.logger.warning(f"설비유형 자료 로드 실패 (두 번째 시트): {e}")
+                        # 첫 번째 시트로 재시도 (헤더 행 기준, 테이블 스키마는 유지)
+                        try:
+                            df_equip = excel_cache.read_excel(Config.EQUIPMENT_TYPE_FILE, sha256=equipment_fingerprint["sha256"],
+                                                               sheet_name=0)
+                            rows = self._equipment_rows(self._map_equipment_columns(df_equip))
+                            self._replace_equipment_types(conn, rows)
+                            self._record_source(conn, equipment_fingerprint, len(rows))
+                            self.logger.info(f"설비유형 자료 로드 완료 (첫 번째 시트): {len(rows)} 건")
+                        except Exception as e2:
+                            self.logger.error(f"설비유형 자료 로드 완전 실패: {e2}")
             
         except Exception as e:
             self.logger.error(f"Excel 데이터 로드 중 오류: {e}")
             # 샘플 데이터 생성
             self._create_sample_data()
+        
+        # 적재된 데이터 기준으로 정규화 어휘 스냅샷과 ITEMNO 인덱스 갱신
+        vocabulary_service.refresh()
+        itemno_index.refresh()
     
-    def _create_sample_data(self):
-        """샘플 데이터 생성 (Excel 파일이 없을 경우)"""
-        # 샘플 작업요청 이력
-        sample_history = [
-            ("44043-CA1-6\"-P", "RFCC", "No.1 PE", "Pressure Vessel", "고장", "압력용기 누설 점검", "압력용기 연결부위 누설 확인 및 수리", "일반작업"),
-            ("Y-MV1035", "석유제품배합/저장", "Motor Operated Valve", "Motor Operated Valve", "작동불량", "모터밸브 작동불량 점검", "모터밸브 작동상태 확인 및 수리", "긴급작업"),
-            ("SW-CV1307-02", "합성수지 포장", "1창고 #7Line", "Conveyor", "고장", "컨베이어 러버벨트 교체", "컨베이어 러버벨트 마모 확인 및 교체", "우선작업"),
-            ("RFCC-001", "RFCC", "No.1 PE", "Heat Exchanger", "누설", "열교환기 누설 점검", "열교환기 튜브 누설 확인 및 수리", "일반작업"),
-            ("MV-2024-001", "석유제품배합/저장", "Storage Tank", "Valve", "고장", "저장탱크 밸브 교체", "저장탱크 출구 밸브 교체", "긴급작업")
-        ]
+    @staticmethod
+    def _clean_text_column(column: pd.Series) -> pd.Series:
+        """Excel 텍스트 컬럼 정리 (빈 값은 '', 나머지는 문자열로 변환 후 앞뒤 공백 제거)"""
+        return column.fillna('').astype(str).str.strip()
+    
+    def _log_stage(self, stage: str, rows: int, started: float):
+        """적재 단계별 처리 건수와 소요 시간 기록"""
+        self.logger.info(f"[적재] {stage}: {rows} 건, {(time.perf_counter() - started) * 1000:.1f} ms")
+    
+    def _detect_source_change(self, conn: sqlite3.Connection, path: str) -> Optional[Dict[str, Any]]:
+        """
+        원본 파일 변경 감지
         
-        for itemno, process, location, equipType, statusCode, work_title, work_details, priority in sample_history:
-            self.conn.execute('''
-                INSERT INTO notification_history 
-                (itemno, process, location, equipType, statusCode, work_title, work_details, priority, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (itemno, process, location, equipType, statusCode, work_title, work_details, priority))
-        
-        # 샘플 현상코드
-        sample_status_codes = [
-            ("고장", "설비 고장", "설비"),
-            ("누설", "유체 누설", "누설"),
-            ("작동불량", "정상 작동하지 않음", "작동"),
-            ("소음", "비정상 소음 발생", "소음"),
-            ("진동", "과도한 진동", "진동"),
-            ("온도상승", "비정상 온도 상승", "온도"),
-            ("압력상승", "비정상 압력 상승", "압력")
-        ]
+        크기와 수정시각이 지난 적재와 같으면 변경 없음으로 판단합니다 (해시 계산 생략).
+        다르면 sha256을 계산하여 내용이 같으면 크기/수정시각만 갱신합니다.
         
-        for code, description, category in sample_status_codes:
-            self.conn.execute('''
-                INSERT INTO status_codes (code, description, category)
-                VALUES (?, ?, ?)
-            ''', (code, description, category))
-        
-        # 샘플 설비유형
-        sample_equipment_types = [
-            ("PV", "Pressure Vessel", "용기"),
-            ("HE", "Heat Exchanger", "열교환기"),
-            ("MV", "Motor Operated Valve", "밸브"),
-            ("CV", "Control Valve", "제어밸브"),
-            ("PU", "Pump", "펌프"),
-            ("CO", "Conveyor", "컨베이어"),
-            ("DR", "Drum", "드럼"),
-            ("TK", "Tank", "탱크")
+        Returns:
+            변경된 파일의 지문 {"source_path", "size", "mtime", "sha256"} 또는 None (파일 없음/변경 없음)
+        """
+        if not os.path.exists(path):
+            return None
+        source_path = os.path.abspath(path)
+        stat = os.stat(path)
+        row = conn.execute(
+            "SELECT size, mtime, sha256 FROM ingest_sources WHERE source_path = ?", (source_path,)
+        ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime:
+            self.logger.info(f"변경 없는 원본 파일 적재 생략: {path}")
+            return None
+        
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        fingerprint = {"source_path": source_path, "size": stat.st_size, "mtime": stat.st_mtime,
+                       "sha256": digest.hexdigest()}
+        if row and row[2] == fingerprint["sha256"]:
+            conn.execute("UPDATE ingest_sources SET size = ?, mtime = ? WHERE source_path = ?",
+                         (fingerprint["size"], fingerprint["mtime"], source_path))
+            self.logger.info(f"내용이 같은 원본 파일 적재 생략: {path}")
+            return None
+        return fingerprint
+    
+    def _record_source(self, conn: sqlite3.Connection, fingerprint: Dict[str, Any], row_count: int):
+        """적재 완료한 원본 파일 지문 기록 (적재와 같은 트랜잭션에서 호출)"""
+        conn.execute('''
+            INSERT OR REPLACE INTO ingest_sources (source_path, size, mtime, sha256, row_count, ingested_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (fingerprint["source_path"], fingerprint["size"], fingerprint["mtime"], fingerprint["sha256"], row_count))
+    
+    def _upsert_history(self, conn: sqlite3.Connection, df_history: pd.DataFrame) -> tuple:
+        """
+        Excel 작업요청 이력 변경분 반영
+        
+        - 행 해시: 원본 컬럼 값의 해시 + 같은 내용 행의 순번 (중복 행도 건수 유지)
+        - 파일에서 사라진 Excel 행만 삭제, 처음 보는 행만 추가 (기존 행의 created_at 유지)
+        - 작업요청 저장(save_work_order)이나 샘플로 추가된 행은 건드리지 않음
+        - 추가할 행이 BULK_REINDEX_MIN_ROWS 이상이면 트리거/인덱스를 내리고 적재 후 일괄 재생성
+        
+        Returns:
+            (추가 건수, 삭제 건수)
+        """
+        columns = self.HISTORY_SOURCE_COLUMNS
+        text = df_history[columns].fillna('').astype(str)
+        content_hash = pd.util.hash_pandas_object(text, index=False)
+        occurrence = content_hash.groupby(content_hash).cumcount()
+        row_hashes = [f"{value:016x}-{count}" for value, count in zip(content_hash.tolist(), occurrence.tolist())]
+        
+        existing = {row[0] for row in conn.execute(
+            "SELECT row_hash FROM notification_history WHERE source = 'excel' AND row_hash IS NOT NULL"
+        )}
+        incoming = set(row_hashes)
+        stale = existing - incoming
+        new_positions = [i for i, row_hash in enumerate(row_hashes) if row_hash not in existing]
+        
+        bulk = len(new_positions) >= self.BULK_REINDEX_MIN_ROWS
+        if bulk:
+            self._drop_history_indexes(conn)
+        
+        if stale:
+            conn.executemany("DELETE FROM notification_history WHERE row_hash = ?", ((row_hash,) for row_hash in stale))
+        
+        if new_positions:
+            values = df_history[columns].astype(object).where(df_history[columns].notna(), None)
+            values['itemno'] = values['itemno'].map(lambda value: '' if value is None else value)
+            created_at = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = values.iloc[new_positions].itertuples(index=False, name=None)
+            conn.executemany('''
+                INSERT INTO notification_history
+                (itemno, process, location, cost_center, equipType, statusCode, work_title, priority,
+                 work_details, created_at, row_hash, source)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'excel')
+            ''', (
+                # work_details는 작업명을 복사
+                row + (row[6], created_at, row_hashes[position])
+                for position, row in zip(new_positions, rows)
+            ))
+        
+        if bulk:
+            self._ensure_category_codes(conn, rebuild=True)
+            self._create_history_indexes(conn)
+            self._ensure_search_index(conn, rebuild=True)
+        return len(new_positions), len(stale)
+    
+    def _drop_history_indexes(self, conn: sqlite3.Connection):
+        """대량 적재 전 작업요청 이력 보조 인덱스와 동기화 트리거 삭제 (적재 후 재생성 필요)"""
+        for name in self.HISTORY_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        for trigger in (f"{self.FTS_TABLE}_ai", f"{self.FTS_TABLE}_ad", f"{self.FTS_TABLE}_au", "notification_codes_ai"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    
+    def _equipment_rows(self, df_equip: pd.DataFrame) -> List[tuple]:
+        """
+        설비유형 DataFrame(type_code/type_name/category 컬럼)을 INSERT 행으로 변환
+        
+        설비유형 코드가 빈 행은 제외합니다.
+        """
+        type_codes = self._clean_text_column(df_equip['type_code'])
+        valid = type_codes != ''
+        return [
+            (type_code, type_name or None, category or None)
+            for type_code, type_name, category in zip(
+                type_codes[valid].tolist(),
+                self._clean_text_column(df_equip['type_name'])[valid].tolist(),
+                self._clean_text_column(df_equip['category'])[valid].tolist()
+            )
         ]
+    
+    @staticmethod
+    def _map_equipment_columns(df_equip: pd.DataFrame) -> pd.DataFrame:
+        """
+        첫 번째 시트의 컬럼을 equipment_types 컬럼에 대응
+        
+        헤더 이름(type_code/설비유형코드 등)으로 찾고, 찾지 못하면 앞의 세 컬럼을
+        type_code, type_name, category 순서로 사용합니다.
+        """
+        aliases = {
+            'type_code': ('type_code', 'code', '설비유형코드', '코드'),
+            'type_name': ('type_name', 'name', '설비유형명', '설비유형'),
+            'category': ('category', '분류', '구분'),
+        }
+        normalized = {str(column).strip().lower(): column for column in df_equip.columns}
+        mapped = {}
+        for target, names in aliases.items():
+            for name in names:
+                if name in normalized:
+                    mapped[target] = df_equip[normalized[name]]
+                    break
+        if 'type_code' not in mapped:
+            if df_equip.shape[1] < 2:
+                raise ValueError(f"설비유형 시트 컬럼 부족: {list(df_equip.columns)}")
+            positional = df_equip.iloc[:, :3]
+            mapped = {
+                'type_code': positional.iloc[:, 0],
+                'type_name': positional.iloc[:, 1],
+                'category': positional.iloc[:, 2] if positional.shape[1] > 2 else None,
+            }
+        empty = pd.Series([None] * len(df_equip), index=df_equip.index, dtype=object)
+        return pd.DataFrame({
+            target: mapped.get(target) if mapped.get(target) is not None else empty
+            for target in ('type_code', 'type_name', 'category')
+        })
+    
+    @staticmethod
+    def _replace_equipment_types(conn: sqlite3.Connection, rows: List[tuple]):
+        """equipment_types 내용 교체 (스키마와 인덱스는 유지)"""
+        conn.execute("DELETE FROM equipment_types")
+        conn.executemany("INSERT INTO equipment_types (type_code, type_name, category) VALUES (?, ?, ?)", rows)
+    
+    def _create_sample_data(self):
+        """
+        샘플 데이터 생성 (Excel 적재 실패 시)
+        
+        테이블이 비어 있을 때만 채우므로 적재 실패가 반복되어도 샘플 행이 중복되지 않습니다.
+        """
+        with self.connections.writer() as conn:
+            def is_empty(table: str) -> bool:
+                return conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+            
+            # 샘플 작업요청 이력
+            sample_history = [
+                ("44043-CA1-6\"-P", "RFCC", "No.1 PE", "Pressure Vessel", "고장", "압력용기 누설 점검", "압력용기 연결부위 누설 확인 및 수리", "일반작업"),
+                ("Y-MV1035", "석유제품배합/저장", "Motor Operated Valve", "Motor Operated Valve", "작동불량", "모터밸브 작동불량 점검", "모터밸브 작동상태 확인 및 수리", "긴급작업"),
+                ("SW-CV1307-02", "합성수지 포장", "1창고 #7Line", "Conveyor", "고장", "컨베이어 러버벨트 교체", "컨베이어 러버벨트 마모 확인 및 교체", "우선작업"),
+                ("RFCC-001", "RFCC", "No.1 PE", "Heat Exchanger", "누설", "열교환기 누설 점검", "열교환기 튜브 누설 확인 및 수리", "일반작업"),
+                ("MV-2024-001", "석유제품배합/저장", "Storage Tank", "Valve", "고장", "저장탱크 밸브 교체", "저장탱크 출구 밸브 교체", "긴급작업")
+            ]
+        
+            if is_empty("notification_history"):
+                conn.executemany('''
+                    INSERT INTO notification_history 
+                    (itemno, process, location, equipType, statusCode, work_title, work_details, priority, created_at, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, 'sample')
+                ''', sample_history)
+        
+            # 샘플 현상코드
+            sample_status_codes = [
+                ("고장", "설비 고장", "설비"),
+                ("누설", "유체 누설", "누설"),
+                ("작동불량", "정상 작동하지 않음", "작동"),
+                ("소음", "비정상 소음 발생", "소음"),
+                ("진동", "과도한 진동", "진동"),
+                ("온도상승", "비정상 온도 상승", "온도"),
+                ("압력상승", "비정상 압력 상승", "압력")
+            ]
+        
+            if is_empty("status_codes"):
+                conn.executemany('''
+                    INSERT INTO status_codes (code, description, category)
+                    VALUES (?, ?, ?)
+                ''', sample_status_codes)
+        
+            # 샘플 설비유형
+            sample_equipment_types = [
+                ("PV", "Pressure Vessel", "용기"),
+                ("HE", "Heat Exchanger", "열교환기"),
+                ("MV", "Motor Operated Valve", "밸브"),
+                ("CV", "Control Valve", "제어밸브"),
+                ("PU", "Pump", "펌프"),
+                ("CO", "Conveyor", "컨베이어"),
+                ("DR", "Drum", "드럼"),
+                ("TK", "Tank", "탱크")
+            ]
         
-        for type_code, type_name, category in sample_equipment_types:
-            self.conn.execute('''
-                INSERT INTO equipment_types (type_code, type_name, category)
-                VALUES (?, ?, ?)
-            ''', (type_code, type_name, category))
+            if is_empty("equipment_types"):
+                conn.executemany('''
+                    INSERT INTO equipment_types (type_code, type_name, category)
+                    VALUES (?, ?, ?)
+                ''', sample_equipment_types)
+        self.logger.info("샘플 데이터 확인 완료 (빈 테이블만 생성)")
+    
+    async def search_similar_notifications(self, equip_type: str = None, location: str = None, 
+                                   status_code: str = None, priority: str = None, limit: int = 15,
+                                   normalized_terms: Optional[Dict[str, NormalizedTerm]] = None) -> List[Dict[str, Any]]:
+        """
+        유사한 작업요청 이력 검색 (위치 기반 검색 강화)
         
-        self.conn.commit()
-        self.logger.info("샘플 데이터 생성 완료")
+        normalized_terms에 이미 정규화된 값으로 기록된 필드는 재정규화하지 않습니다.
+        (parser.py에서 정규화된 ParsedInput.normalized_terms 전달)
+        """
+        terms = await self.resolve_search_terms(equip_type, location, status_code, priority, normalized_terms)
+        return self.query_notifications(**terms, limit=limit)
     
-    def search_similar_notifications(self, equip_type: str = None, location: str = None, 
-                                   status_code: str = None, priority: str = None, limit: int = 15) -> List[Dict[str, Any]]:
-        """유사한 작업요청 이력 검색 (위치 기반 검색 강화)"""
+    async def resolve_search_terms(self, equip_type: str = None, location: str = None,
+                                   status_code: str = None, priority: str = None,
+                                   normalized_terms: Optional[Dict[str, NormalizedTerm]] = None) -> Dict[str, Optional[str]]:
+        """
+        검색어 정규화 (필드별 정규화를 동시에 수행)
         
-        # 입력값 정규화 (위치 우선 정규화)
-        normalized_location = self.normalize_term(location, "location") if location else None
-        normalized_equip_type = self.normalize_term(equip_type, "equipment") if equip_type else None
-        normalized_status_code = self.normalize_term(status_code, "status") if status_code else None
-        normalized_priority = self.normalize_term(priority, "priority") if priority else None
+        Returns:
+            query_notifications()에 그대로 전달할 수 있는 {"location", "equip_type", "status_code", "priority"}
+        """
+        normalized_terms = normalized_terms or {}
+        normalized_location, normalized_equip_type, normalized_status_code, normalized_priority = await asyncio.gather(
+            self._resolve_search_term(location, "location", "location", normalized_terms),
+            self._resolve_search_term(equip_type, "equipment_type", "equipment", normalized_terms),
+            self._resolve_search_term(status_code, "status_code", "status", normalized_terms),
+            self._resolve_search_term(priority, "priority", "priority", normalized_terms)
+        )
+        return {
+            "location": normalized_location,
+            "equip_type": normalized_equip_type,
+            "status_code": normalized_status_code,
+            "priority": normalized_priority,
+        }
+    
+    def query_notifications(self, location: str = None, equip_type: str = None, status_code: str = None,
+                            priority: str = None, limit: int = 15, exact: bool = False,
+                            match_all: bool = True, budget_ms: float = None) -> List[Dict[str, Any]]:
+        """
+        정규화된 검색어로 작업요청 이력 조회
         
+        Args:
+            location, equip_type, status_code, priority: 정규화된 검색어 (None이면 조건 제외)
+            limit: 최대 조회 건수
+            exact: True면 사전 값과 정확히 일치(대소문자 무시)하는 코드만, False면 부분 일치
+            match_all: True면 모든 조건 AND, False면 하나라도 일치(OR)
+            budget_ms: 쿼리 시간 제한 (초과 시 그때까지 읽은 행만 반환)
+            
+        Returns:
+            이력 행 목록 (rowid 포함, 위치 일치 우선 후 최신순)
+        """
         query = '''
-            SELECT itemno, process, location, cost_center, equipType, statusCode, work_title, work_details, priority
+            SELECT rowid AS rowid, itemno, process, location, cost_center, equipType, statusCode, work_title, work_details, priority
             FROM notification_history
-            WHERE 1=1
         '''
+        conditions = []
         params = []
         
         # 위치 기반 검색 강화 (위치가 입력된 경우 우선 검색)
-        if normalized_location:
-            # 위치와 공정명 모두에서 검색하되, 위치 매칭에 더 높은 가중치
-            query += " AND (location LIKE ? OR process LIKE ?)"
-            params.extend([f"%{normalized_location}%", f"%{normalized_location}%"])
+        if location:
+            if exact:
+                conditions.append(self._category_condition("location", location, params, exact=True))
+            else:
+                # 위치와 공정명 모두에서 검색하되, 위치 매칭에 더 높은 가중치
+                location_condition = self._category_condition("location", location, params)
+                process_condition = self._text_condition("process", location, params)
+                conditions.append(f"({location_condition} OR {process_condition})")
+        
+        # 범주형 조건은 사전 테이블에서 일치하는 코드를 찾은 뒤 코드 인덱스로 조회
+        if equip_type:
+            conditions.append(self._category_condition("equipType", equip_type, params, exact=exact))
         
-        if normalized_equip_type:
-            query += " AND equipType LIKE ?"
-            params.append(f"%{normalized_equip_type}%")
+        if status_code:
+            conditions.append(self._category_condition("statusCode", status_code, params, exact=exact))
         
-        if normalized_status_code:
-            query += " AND statusCode LIKE ?"
-            params.append(f"%{normalized_status_code}%")
+        if priority:
+            conditions.append(self._category_condition("priority", priority, params, exact=exact))
         
-        if normalized_priority:
-            query += " AND priority LIKE ?"
-            params.append(f"%{normalized_priority}%")
+        if conditions:
+            query += " WHERE " + (" AND " if match_all else " OR ").join(conditions)
         
         # 위치가 입력된 경우 위치 기반 정렬 우선
-        if normalized_location:
+        if location:
             query += " ORDER BY CASE WHEN location LIKE ? THEN 1 ELSE 2 END, created_at DESC LIMIT ?"
-            params.extend([f"%{normalized_location}%", limit])
+            params.extend([f"%{location}%", limit])
         else:
             query += " ORDER BY created_at DESC LIMIT ?"
             params.append(limit)
         
-        cursor = self.conn.execute(query, params)
-        columns = [description[0] for description in cursor.description]
+        return self._fetch_with_budget(query, params, budget_ms)
+
+    def get_notifications_by_rowids(self, rowids: List[int]) -> List[Dict[str, Any]]:
+        """
+        rowid 목록으로 작업요청 이력 조회 (vector_db.py 임베딩 검색 결과를 행으로 변환할 때 사용)
+
+        Returns:
+            query_notifications()와 같은 형식의 행 목록 (입력 rowid 순서 유지, 없는 rowid는 제외)
+        """
+        if not rowids:
+            return []
+        placeholders = ", ".join("?" for _ in rowids)
+        rows = self._fetch_with_budget(f'''
+            SELECT rowid AS rowid, itemno, process, location, cost_center, equipType, statusCode, work_title, work_details, priority
+            FROM notification_history WHERE rowid IN ({placeholders})
+        ''', list(rowids))
+        by_rowid = {row["rowid"]: row for row in rows}
+        return [by_rowid[rowid] for rowid in rowids if rowid in by_rowid]
+
+    def _fetch_with_budget(self, query: str, params: List[Any], budget_ms: float = None) -> List[Dict[str, Any]]:
+        """
+        시간 제한 조회 (progress_handler로 제한 시간 초과 시 쿼리 중단)
         
-        results = []
-        for row in cursor.fetchall():
-            result = dict(zip(columns, row))
-            # 실제 유사도 점수는 추천 엔진에서 계산되므로 임시 점수 제거
-            results.append(result)
+        중단되면 경고를 남기고 그때까지 읽은 행만 반환합니다.
+        """
+        conn = self.connections.reader()
+        if budget_ms is not None:
+            deadline = time.perf_counter() + budget_ms / 1000
+            conn.set_progress_handler(lambda: 1 if time.perf_counter() > deadline else 0, 1000)
         
+        results = []
+        try:
+            cursor = conn.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            while True:
+                rows = cursor.fetchmany(100)
+                if not rows:
+                    break
+                results.extend(dict(zip(columns, row)) for row in rows)
+        except sqlite3.OperationalError as e:
+            if budget_ms is None or "interrupt" not in str(e):
+                raise
+            self.logger.warning(f"검색 시간 제한 초과 ({budget_ms} ms): {len(results)} 건까지 사용")
+        finally:
+            if budget_ms is not None:
+                conn.set_progress_handler(None, 0)
         return results
     
-    def normalize_term(self, term: str, category: str) -> str:
+    def _text_condition(self, column: str, term: str, params: List[Any]) -> str:
+        """
+        텍스트 부분 일치 조건 생성 (params에 파라미터 추가)
+        
+        FTS 인덱스를 쓸 수 있고 검색어가 3글자 이상이면 FTS MATCH(컬럼 필터 + 구문) 하위 쿼리,
+        아니면 LIKE 조건을 반환합니다.
+        """
+        term = term.strip()
+        if self.fts_enabled and len(term) >= self.FTS_MIN_TERM_LENGTH:
+            phrase = '"' + term.replace('"', '""') + '"'
+            params.append(f"{column} : {phrase}")
+            return f"rowid IN (SELECT rowid FROM {self.FTS_TABLE} WHERE {self.FTS_TABLE} MATCH ?)"
+        params.append(f"%{term}%")
+        return f"{column} LIKE ?"
+    
+    def _category_condition(self, column: str, term: str, params: List[Any], exact: bool = False) -> str:
+        """
+        범주형 컬럼 조건 생성 (params에 파라미터 추가)
+        
+        작은 사전 테이블에서만 값을 찾고(부분 일치는 LIKE, exact=True면 대소문자 무시 정확 일치),
+        이력 테이블은 코드 컬럼 인덱스로 조회합니다.
+        """
+        id_column, dim_table = self.CATEGORY_COLUMNS[column]
+        if exact:
+            params.append(term.strip())
+            return f"{id_column} IN (SELECT id FROM {dim_table} WHERE value = ?)"
+        params.append(f"%{term.strip()}%")
+        return f"{id_column} IN (SELECT id FROM {dim_table} WHERE value LIKE ?)"
+    
+    async def _resolve_search_term(self, value: Optional[str], field: str, category: str,
+                             normalized_terms: Dict[str, NormalizedTerm]) -> Optional[str]:
+        """검색어 결정 (이미 정규화된 값은 그대로 사용, 아니면 정규화 수행)"""
+        if not value:
+            return None
+        term = normalized_terms.get(field)
+        if term is not None and term.value == value:
+            return value
+        return await self.normalize_term(value, category)
+    
+    async def normalize_term(self, term: str, category: str) -> str:
         """LLM을 사용하여 용어를 표준 용어로 정규화"""
         if not term:
             return term
         
         # LLM 정규화 수행
-        normalized_term, confidence = normalizer.normalize_term(term, category)
+        normalized_term, confidence = await normalizer.normalize_term(term, category)
         
         # 신뢰도가 낮은 경우 원본 반환
         if confidence < 0.3:
@@ -331,33 +851,68 @@ class DatabaseManager:
         return normalized_term
     
     def search_by_itemno(self, itemno: str, limit: int = 15) -> List[Dict[str, Any]]:
-        """ITEMNO로 검색"""
-        query = '''
-            SELECT itemno, process, location, cost_center, equipType, statusCode, work_title, work_details, priority
-            FROM notification_history
-            WHERE itemno LIKE ?
-            ORDER BY created_at DESC LIMIT ?
-        '''
+        """
+        ITEMNO로 검색
         
-        cursor = self.conn.execute(query, [f"%{itemno}%", limit])
-        columns = [description[0] for description in cursor.description]
+        ITEMNO 인덱스의 상위 K개 유사 ITEMNO(오타 보정 포함) 이력과 부분 일치 검색(FTS, 짧은 입력은 LIKE) 결과를
+        합쳐 점수 순으로 반환합니다. 유사 항목은 ITEMNO 점수, 부분 일치만 된 항목은 0.90점입니다.
+        두 조회 모두 SQL에서 limit건까지만 읽습니다.
+        """
+        matches = itemno_index.search(itemno, top_k=Config.ITEMNO_FUZZY_TOP_K)
+        match_scores = dict(matches)
+        columns_sql = ("h.rowid AS rowid, h.created_at AS created_at, h.itemno, h.process, h.location, h.cost_center, "
+                       "h.equipType, h.statusCode, h.work_title, h.work_details, h.priority")
+        conn = self.connections.reader()
         
-        results = []
-        for row in cursor.fetchall():
-            result = dict(zip(columns, row))
-            result['score'] = 0.90  # ITEMNO 매칭 시 높은 점수
-            results.append(result)
+        rows = []
+        if matches:
+            # 유사 ITEMNO별 점수를 SQL에 넘겨 점수/최신순 정렬과 LIMIT을 DB에서 처리
+            values_sql = ", ".join("(?, ?)" for _ in matches)
+            cursor = conn.execute(
+                f"WITH matches(itemno, score) AS (VALUES {values_sql}) "
+                f"SELECT {columns_sql}, m.score AS score FROM notification_history h "
+                "JOIN matches m ON h.itemno = m.itemno ORDER BY m.score DESC, h.created_at DESC LIMIT ?",
+                [value for match in matches for value in match] + [limit]
+            )
+            rows.extend(self._rows_as_dicts(cursor))
         
-        return results
+        # 부분 일치 (유사 검색의 편집 거리로는 찾지 못하는 긴 ITEMNO 안의 입력도 포함)
+        params = []
+        condition = self._text_condition("itemno", itemno, params)
+        cursor = conn.execute(
+            f"SELECT {columns_sql} FROM notification_history h WHERE {condition} ORDER BY h.created_at DESC LIMIT ?",
+            params + [limit]
+        )
+        for result in self._rows_as_dicts(cursor):
+            result['score'] = match_scores.get(result['itemno'], 0.90)
+            rows.append(result)
+        
+        # rowid로 중복 제거 후 점수 순 정렬 (같은 점수는 최신순)
+        merged = {row['rowid']: row for row in rows}
+        results = sorted(merged.values(), key=lambda row: (row['score'], row['created_at'] or ''), reverse=True)
+        for result in results:
+            del result['rowid'], result['created_at']
+        return results[:limit]
+    
+    @staticmethod
+    def _rows_as_dicts(cursor) -> List[Dict[str, Any]]:
+        """커서 결과를 컬럼명 딕셔너리 목록으로 변환"""
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_notification_by_itemno(self, itemno: str) -> Optional[Dict[str, Any]]:
+        """ITEMNO에 가장 잘 맞는 최신 이력 1건 조회 (recommender.py의 get_recommendation_by_itemno()에서 사용)"""
+        results = self.search_by_itemno(itemno, limit=1)
+        return results[0] if results else None
     
     def get_status_codes(self) -> List[Dict[str, Any]]:
         """현상코드 목록 조회"""
-        cursor = self.conn.execute("SELECT code, description, category FROM status_codes")
+        cursor = self.connections.reader().execute("SELECT code, description, category FROM status_codes")
         return [{"code": row[0], "description": row[1], "category": row[2]} for row in cursor.fetchall()]
     
     def get_equipment_types(self) -> List[Dict[str, Any]]:
         """설비유형 목록 조회"""
-        cursor = self.conn.execute("SELECT type_code, type_name, category FROM equipment_types")
+        cursor = self.connections.reader().execute("SELECT type_code, type_name, category FROM equipment_types")
         return [{"type_code": row[0], "type_name": row[1], "category": row[2]} for row in cursor.fetchall()]
     
     def save_work_order(self, work_order_data: Dict[str, Any]) -> bool:
@@ -376,39 +931,59 @@ class DatabaseManager:
         - 감사 로그(Audit Log) 추가 권장
         """
         try:
-            # 작업요청 테이블이 없으면 생성
-            self.conn.execute('''
-                CREATE TABLE IF NOT EXISTS work_orders (
-                    itemno TEXT PRIMARY KEY,
-                    work_title TEXT NOT NULL,
-                    work_details TEXT NOT NULL,
-                    process TEXT,
-                    location TEXT,
-                    equipType TEXT,
-                    statusCode TEXT,
-                    priority TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            with self.connections.writer() as conn:
+                # 작업요청 테이블이 없으면 생성
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS work_orders (
+                        itemno TEXT PRIMARY KEY,
+                        work_title TEXT NOT NULL,
+                        work_details TEXT NOT NULL,
+                        process TEXT,
+                        location TEXT,
+                        equipType TEXT,
+                        statusCode TEXT,
+                        priority TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
             
-            # 작업요청 저장
-            self.conn.execute('''
-                INSERT INTO work_orders 
-                (itemno, work_title, work_details, process, location, equipType, statusCode, priority, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                work_order_data['itemno'],
-                work_order_data['work_title'],
-                work_order_data['work_details'],
-                work_order_data['process'],
-                work_order_data['location'],
-                work_order_data['equipType'],
-                work_order_data['statusCode'],
-                work_order_data['priority'],
-                work_order_data['created_at']
-            ))
+                # 작업요청 저장
+                conn.execute('''
+                    INSERT INTO work_orders 
+                    (itemno, work_title, work_details, process, location, equipType, statusCode, priority, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    work_order_data['itemno'],
+                    work_order_data['work_title'],
+                    work_order_data['work_details'],
+                    work_order_data['process'],
+                    work_order_data['location'],
+                    work_order_data['equipType'],
+                    work_order_data['statusCode'],
+                    work_order_data['priority'],
+                    work_order_data['created_at']
+                ))
+            
+                # 작업요청 이력에도 추가하여 이후 검색 대상에 포함 (FTS 인덱스는 트리거로 갱신)
+                history_cursor = conn.execute('''
+                    INSERT INTO notification_history 
+                    (itemno, process, location, equipType, statusCode, work_title, work_details, priority, created_at, source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'work_order')
+                ''', (
+                    work_order_data['itemno'],
+                    work_order_data['process'],
+                    work_order_data['location'],
+                    work_order_data['equipType'],
+                    work_order_data['statusCode'],
+                    work_order_data['work_title'],
+                    work_order_data['work_details'],
+                    work_order_data['priority'],
+                    work_order_data['created_at']
+                ))
             
-            self.conn.commit()
+            itemno_index.add(work_order_data['itemno'])
+            # 임베딩/재학습은 백그라운드 스레드에서 처리 (요청 처리 지연 방지)
+            embedding_index.add_rows_later([history_cursor.lastrowid])
             self.logger.info(f"작업요청 저장 완료: ITEMNO={work_order_data['itemno']}")
             return True
             
@@ -417,9 +992,8 @@ class DatabaseManager:
             return False
     
     def close(self):
-        """데이터베이스 연결 종료"""
-        if self.conn:
-            self.conn.close()
+        """데이터베이스 연결 종료 (같은 관리자를 쓰는 캐시 연결 포함)"""
+        close_all_connections()
 
 # 전역 데이터베이스 매니저 인스턴스
 db_manager = DatabaseManager() 
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+PMark2 AI Assistant - SQLite 연결 관리
+
+이 파일은 SQLite 연결을 스레드별 읽기 연결과 단일 쓰기 연결로 나누어 관리합니다.
+FastAPI가 동기 핸들러를 스레드풀에서 실행해도 연결을 공유하지 않으므로
+check_same_thread 오류나 요청 간 직렬화 없이 동시에 조회할 수 있습니다.
+
+주요 담당자: 백엔드 개발자
+수정 시 주의사항:
+- WAL 모드를 사용하므로 읽기는 쓰기와 동시에 진행됩니다 (DB 파일 옆에 -wal, -shm 파일 생성)
+- 쓰기는 반드시 writer() 컨텍스트 안에서 수행합니다 (프로세스 내 쓰기 직렬화 + 커밋/롤백)
+- 읽기 연결은 query_only 모드이므로 reader()로 INSERT/UPDATE를 실행하면 오류가 납니다
+- 같은 SQL 문은 연결별 prepared statement 캐시(cached_statements)에서 재사용됩니다
+"""
+
+import os
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+from .config import Config
+
+
+class ConnectionManager:
+    """
+    SQLite 연결 관리자 (스레드별 읽기 연결 + 잠금으로 보호되는 단일 쓰기 연결)
+
+    사용처:
+    - database.py: DatabaseManager의 모든 조회/저장
+    - logic/normalization_cache.py, logic/work_details_cache.py: 영구 캐시 조회/저장
+    - logic/vocabulary.py, logic/itemno_index.py: 어휘/ITEMNO 로드
+
+    연계 파일:
+    - config.py: SQLITE_CACHED_STATEMENTS, SQLITE_BUSY_TIMEOUT_MS
+
+    담당자 수정 가이드:
+    - 같은 DB 파일에 대해서는 get_connection_manager()로 하나의 관리자만 사용
+    - 긴 쓰기(엑셀 적재 등)는 writer() 안에서 한 번에 처리하여 잠금 횟수 최소화
+    """
+
+    def __init__(self, db_path: str = None, cached_statements: int = None, busy_timeout_ms: int = None):
+        """
+        연결 관리자 초기화
+
+        설정:
+        - 데이터 디렉토리 생성
+        - 쓰기 연결 생성 및 WAL 모드 설정
+        - 스레드별 읽기 연결 저장소 준비
+        """
+        self.db_path = db_path or Config.SQLITE_DB_PATH
+        self.cached_statements = cached_statements or Config.SQLITE_CACHED_STATEMENTS
+        self.busy_timeout_ms = busy_timeout_ms or Config.SQLITE_BUSY_TIMEOUT_MS
+        self.logger = logging.getLogger(__name__)
+
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._writer = self._connect()
+        try:
+            self._writer.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            self.logger.warning(f"WAL 모드 설정 실패, 기본 저널 모드 사용: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """공통 설정이 적용된 연결 생성"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """
+        현재 스레드 전용 읽기 연결 반환 (없으면 생성)
+
+        Returns:
+            query_only 모드의 sqlite3.Connection (스레드 간 공유 금지)
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        단일 쓰기 연결 사용 (프로세스 내 쓰기 직렬화)
+
+        블록이 정상 종료되면 커밋, 예외가 발생하면 롤백 후 예외를 다시 발생시킵니다.
+        같은 스레드에서 중첩 사용 시 가장 바깥 블록에서만 커밋됩니다.
+
+        사용 예:
+            with manager.writer() as conn:
+                conn.execute("INSERT ...")
+        """
+        with self._write_lock:
+            depth = getattr(self._local, "write_depth", 0)
+            self._local.write_depth = depth + 1
+            try:
+                yield self._writer
+                if depth == 0:
+                    self._writer.commit()
+            except Exception:
+                if depth == 0:
+                    self._writer.rollback()
+                raise
+            finally:
+                self._local.write_depth = depth
+
+    def close(self):
+        """모든 읽기/쓰기 연결 종료"""
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+        with self._write_lock:
+            self._writer.close()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: str = None) -> ConnectionManager:
+    """
+    DB 파일별 연결 관리자 조회 (없으면 생성)
+
+    같은 DB 파일을 쓰는 모든 모듈이 하나의 쓰기 연결을 공유하도록 경로 기준으로 재사용합니다.
+    """
+    key = os.path.abspath(db_path or Config.SQLITE_DB_PATH)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = ConnectionManager(db_path or Config.SQLITE_DB_PATH)
+            _managers[key] = manager
+        return manager
+
+
+def close_all_connections():
+    """모든 연결 관리자 종료 (애플리케이션 종료 시 호출)"""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
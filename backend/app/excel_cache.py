@@ -0,0 +1,158 @@
+"""
+PMark2 AI Assistant - Excel 원본 열 기반 캐시
+
+이 파일은 Excel 원본(작업요청 이력, 현상코드, 설비유형)을 한 번 파싱한 결과를
+Parquet 파일로 저장해 두고, 같은 내용의 xlsx를 다시 적재할 때 xlsx 대신 캐시를 읽도록 합니다.
+
+database.py는 원본 지문(크기/수정시각/sha256)이 지난 적재와 같으면 Excel을 아예 읽지 않으므로,
+이 캐시가 쓰이는 경우는 DB를 새로 만들 때(새 서버, DB 파일 삭제, 이력 테이블 재생성)
+또는 파일이 복사/재배포되어 수정시각만 바뀌고 내용은 예전에 적재한 적 있는 버전일 때입니다.
+
+주요 담당자: 백엔드 개발자
+수정 시 주의사항:
+- 캐시 유효성은 원본 내용의 sha256(database.py의 _detect_source_change()가 계산한 값)과 읽기 옵션으로 판단합니다
+  sha256을 넘기지 않으면 크기/수정시각으로 판단합니다
+- pyarrow가 설치되어 있으면 Parquet(열 기반, 메모리 매핑 읽기)로 저장합니다
+- pyarrow가 없으면 pandas pickle로 저장합니다. pickle은 열 기반도 메모리 매핑도 아니며 xlsx 파싱만 생략합니다
+- 캐시 저장/읽기에 실패해도 xlsx 결과를 그대로 사용합니다 (캐시는 성능 최적화일 뿐)
+"""
+
+import os
+import json
+import hashlib
+import logging
+import pandas as pd
+from typing import Any, Dict, Optional
+from .config import Config
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+class ExcelCache:
+    """
+    Excel 원본 캐시
+
+    사용처:
+    - database.py: load_excel_data()에서 pd.read_excel() 대신 read_excel() 사용
+
+    연계 파일:
+    - config.py: EXCEL_CACHE_ENABLED, EXCEL_CACHE_DIR
+
+    담당자 수정 가이드:
+    - 캐시 파일은 원본 경로 + 읽기 옵션별로 따로 저장 (같은 파일의 다른 시트도 구분)
+    - 캐시를 강제로 다시 만들려면 EXCEL_CACHE_DIR의 파일을 삭제
+    """
+
+    def __init__(self, cache_dir: str = None, enabled: bool = None):
+        """
+        Excel 캐시 초기화
+
+        설정:
+        - 캐시 디렉토리 경로
+        - 저장 형식 (pyarrow 유무에 따라 Parquet 또는 pickle)
+        """
+        self.cache_dir = cache_dir or Config.EXCEL_CACHE_DIR
+        self.enabled = enabled if enabled is not None else Config.EXCEL_CACHE_ENABLED
+        self.format = "parquet" if PARQUET_AVAILABLE else "pickle"
+        self.logger = logging.getLogger(__name__)
+
+    def read_excel(self, path: str, sha256: str = None, **read_kwargs) -> pd.DataFrame:
+        """
+        Excel 읽기 (유효한 캐시가 있으면 캐시 사용)
+
+        Args:
+            path: Excel 파일 경로
+            sha256: 원본 내용 해시 (database.py 적재 시 지문의 sha256, 없으면 크기/수정시각으로 판단)
+            read_kwargs: pd.read_excel()에 전달할 옵션 (sheet_name, header 등)
+
+        Returns:
+            pd.read_excel()과 같은 DataFrame
+        """
+        if not self.enabled:
+            return pd.read_excel(path, **read_kwargs)
+
+        cache_path, meta_path = self._cache_paths(path, read_kwargs)
+        meta = self._source_meta(path, read_kwargs, sha256)
+
+        df = self._load(cache_path, meta_path, meta)
+        if df is not None:
+            self.logger.info(f"Excel 캐시 사용: {path}")
+            return df
+
+        df = pd.read_excel(path, **read_kwargs)
+        self._store(df, cache_path, meta_path, meta)
+        return df
+
+    def _cache_paths(self, path: str, read_kwargs: Dict[str, Any]):
+        """원본 경로 + 읽기 옵션별 캐시 파일/메타 파일 경로"""
+        key_source = json.dumps([os.path.abspath(path), read_kwargs], sort_keys=True, default=str)
+        key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()[:16]
+        base = os.path.join(self.cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}_{key}")
+        extension = ".parquet" if self.format == "parquet" else ".pkl"
+        return base + extension, base + ".json"
+
+    def _source_meta(self, path: str, read_kwargs: Dict[str, Any], sha256: str = None) -> Dict[str, Any]:
+        """캐시 유효성 판단용 원본 정보 (내용 해시가 있으면 해시, 없으면 크기/수정시각)"""
+        meta = {
+            "source_path": os.path.abspath(path),
+            "read_kwargs": json.loads(json.dumps(read_kwargs, sort_keys=True, default=str)),
+            "format": self.format,
+        }
+        if sha256:
+            meta["sha256"] = sha256
+        else:
+            stat = os.stat(path)
+            meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        return meta
+
+    def _load(self, cache_path: str, meta_path: str, meta: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """메타 정보가 원본과 일치하는 경우에만 캐시 읽기 (없거나 오래되었으면 None)"""
+        if not (os.path.exists(cache_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            columns = stored.pop("columns", None)
+            if stored != meta:
+                self.logger.info(f"Excel 캐시가 원본과 달라 다시 파싱합니다: {meta['source_path']}")
+                return None
+
+            if self.format == "parquet":
+                df = pd.read_parquet(cache_path, memory_map=True)
+            else:
+                df = pd.read_pickle(cache_path)
+            # Parquet은 문자열 컬럼명만 저장하므로 원래 컬럼명(header=None의 정수 등) 복원
+            if columns is not None and len(columns) == len(df.columns):
+                df.columns = columns
+            return df
+        except Exception as e:
+            self.logger.warning(f"Excel 캐시 읽기 실패, xlsx 사용: {e}")
+            return None
+
+    def _store(self, df: pd.DataFrame, cache_path: str, meta_path: str, meta: Dict[str, Any]):
+        """파싱 결과와 메타 정보 저장 (메타 파일은 캐시 파일 저장 후 기록)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = cache_path + ".tmp"
+            if self.format == "parquet":
+                df.set_axis([str(column) for column in df.columns], axis=1).to_parquet(temp_path, index=False)
+            else:
+                df.to_pickle(temp_path)
+            os.replace(temp_path, cache_path)
+
+            stored = dict(meta, columns=list(df.columns))
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f, ensure_ascii=False, default=str)
+        except Exception as e:
+            # 혼합 타입 컬럼 등 열 기반 형식으로 저장할 수 없는 경우
+            self.logger.warning(f"Excel 캐시 저장 실패 (다음 실행도 xlsx 파싱): {e}")
+            if os.path.exists(cache_path + ".tmp"):
+                os.remove(cache_path + ".tmp")
+
+
+# 전역 Excel 캐시 인스턴스
+excel_cache = ExcelCache()
@@ -0,0 +1,79 @@
+"""
+PMark2 AI Assistant - 비동기 LLM 게이트웨이
+
+이 파일은 파서, 정규화 엔진, 추천 엔진, 작업상세 API가 공통으로 사용하는
+비동기 OpenAI 호출 창구입니다. 이벤트 루프를 막지 않으므로 한 사용자의 느린 LLM 호출이
+같은 워커의 다른 세션을 멈추지 않습니다.
+
+주요 담당자: 백엔드 개발자, AI/ML 엔지니어
+수정 시 주의사항:
+- OPENAI_BASE_URL을 지정하면 OpenAI 호환 로컬 서버(테스트용 가짜 서버 등)로 요청을 보냅니다
+- LLM_TIMEOUT_SECONDS로 호출당 최대 대기 시간을 제한합니다
+- 호출 측은 예외 처리를 직접 수행합니다 (기존 폴백 로직 유지)
+"""
+
+from openai import AsyncOpenAI
+from typing import Dict, List, Optional
+from .config import Config
+
+
+class LLMGateway:
+    """
+    비동기 LLM 호출 게이트웨이
+
+    사용처:
+    - agents/parser.py: 시나리오 1 정보 추출
+    - logic/normalizer.py: 용어 정규화 (단일/일괄)
+    - logic/recommender.py: 추천 항목 작업명/상세 생성
+    - api/work_details.py: 선택 항목 작업명/상세 생성
+
+    연계 파일:
+    - config.py: OPENAI_API_KEY, OPENAI_MODEL, OPENAI_BASE_URL, LLM_TIMEOUT_SECONDS
+
+    담당자 수정 가이드:
+    - 다른 LLM 제공자로 교체 시 complete()만 수정
+    - 테스트에서는 OPENAI_BASE_URL로 로컬 가짜 서버를 지정하거나 client를 주입
+      (tests/fake_openai.py의 FakeOpenAIClient: 파서/정규화/추천이 모두 이 전역 게이트웨이를 쓰므로
+      llm_gateway.client만 바꾸면 전체 흐름이 가짜 응답을 사용)
+    """
+
+    def __init__(self, client: AsyncOpenAI = None, model: str = None):
+        """
+        게이트웨이 초기화
+
+        Args:
+            client: 사용할 AsyncOpenAI 클라이언트 (없으면 Config 기반 생성)
+            model: 기본 모델명 (없으면 Config.OPENAI_MODEL)
+        """
+        self.client = client or AsyncOpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            base_url=Config.OPENAI_BASE_URL or None,
+            timeout=Config.LLM_TIMEOUT_SECONDS
+        )
+        self.model = model or Config.OPENAI_MODEL
+
+    async def complete(self, messages: List[Dict[str, str]], temperature: float = 0.1,
+                       max_tokens: int = 200, model: Optional[str] = None) -> str:
+        """
+        채팅 완성 요청
+
+        Args:
+            messages: OpenAI 형식 메시지 목록
+            temperature: 샘플링 온도
+            max_tokens: 최대 응답 토큰 수
+            model: 모델명 (없으면 기본 모델)
+
+        Returns:
+            응답 텍스트 (앞뒤 공백 제거)
+        """
+        response = await self.client.chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return (response.choices[0].message.content or "").strip()
+
+
+# 전역 LLM 게이트웨이 인스턴스
+llm_gateway = LLMGateway()
@@ -0,0 +1,228 @@
+"""
+PMark2 AI Assistant - 추천 후보 일괄 점수 계산
+
+이 파일은 추천 엔진이 DB에서 가져온 후보 전체의 유사도 점수를 한 번에 계산합니다.
+후보 행의 위치/설비유형/현상코드/우선순위는 소수의 값이 반복되므로,
+필드별 고유값에 대해서만 문자열 유사도를 계산하고 행 점수는 NumPy 배열 연산으로 조합합니다.
+
+주요 담당자: AI/ML 엔지니어, 백엔드 개발자
+수정 시 주의사항:
+- 점수 규칙(가중치, 포함 관계 점수, 단어/문자 유사도 비율, 보너스)은 기존 추천 엔진 규칙과 동일합니다
+- rapidfuzz가 설치되어 있으면 편집 거리 계산에 사용하고, 없으면 순수 파이썬 DP로 계산합니다
+- (입력, 후보 값) 쌍의 유사도는 크기 제한 메모에 보관되며, 어휘 스냅샷 버전이 바뀌면 비워집니다
+"""
+
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+from ..config import Config
+from ..models import ParsedInput
+from .vocabulary import vocabulary_service
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    _rapidfuzz_levenshtein = None
+    RAPIDFUZZ_AVAILABLE = False
+
+
+def character_similarity(str1: str, str2: str) -> float:
+    """
+    문자 단위 유사도 계산 (1 - 편집거리 / 긴 쪽 길이)
+
+    Returns:
+        유사도 점수 (0.0 ~ 1.0)
+    """
+    if not str1 or not str2:
+        return 0.0
+    if RAPIDFUZZ_AVAILABLE:
+        return _rapidfuzz_levenshtein.normalized_similarity(str1, str2)
+
+    # 두 행만 유지하는 편집 거리 DP
+    previous = list(range(len(str2) + 1))
+    for i, ch1 in enumerate(str1, 1):
+        current = [i]
+        for j, ch2 in enumerate(str2, 1):
+            if ch1 == ch2:
+                current.append(previous[j - 1])
+            else:
+                current.append(min(previous[j], current[j - 1], previous[j - 1]) + 1)
+        previous = current
+
+    return max(0.0, 1.0 - previous[-1] / max(len(str1), len(str2)))
+
+
+def enhanced_string_similarity(str1: str, str2: str) -> float:
+    """
+    개선된 문자열 유사도 계산
+
+    - 정확한 매칭 1.0
+    - 포함 관계 0.7 ~ 0.9 (짧은 쪽 길이 비율에 따라)
+    - 그 외 공통 단어 비율 0.7 + 문자 유사도 0.3 가중 평균
+
+    Returns:
+        유사도 점수 (0.0 ~ 1.0)
+    """
+    if not str1 or not str2:
+        return 0.0
+
+    # 정확한 매칭
+    if str1 == str2:
+        return 1.0
+
+    # 부분 매칭 (포함 관계)
+    if str1 in str2 or str2 in str1:
+        ratio = min(len(str1), len(str2)) / max(len(str1), len(str2))
+        return 0.7 + (ratio * 0.2)
+
+    # 공통 단어 수 계산
+    words1 = set(str1.split())
+    words2 = set(str2.split())
+    if not words1 or not words2:
+        return 0.0
+
+    word_similarity = len(words1 & words2) / len(words1 | words2)
+    return (word_similarity * 0.7) + (character_similarity(str1, str2) * 0.3)
+
+
+class SimilarityMemo:
+    """
+    문자열 유사도 메모 (크기 제한 LRU, 어휘 버전별)
+
+    위치/설비유형/현상코드/우선순위는 닫힌 어휘라 같은 (입력, 후보 값) 쌍이 요청마다 반복되므로
+    한 번 계산한 enhanced_string_similarity 결과를 재사용합니다.
+    """
+
+    def __init__(self, max_size: int = None):
+        self.max_size = max_size if max_size is not None else Config.SIMILARITY_MEMO_SIZE
+        self.version = None
+        self._memory: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def use_version(self, version: str):
+        """어휘 버전이 바뀌었으면 메모 비우기"""
+        with self._lock:
+            if version != self.version:
+                if self.version is not None:
+                    self._stats["invalidations"] += 1
+                self._memory.clear()
+                self.version = version
+
+    def similarity(self, query: str, value: str) -> float:
+        """메모된 유사도 반환 (없으면 계산 후 저장)"""
+        key = (query, value)
+        with self._lock:
+            score = self._memory.get(key)
+            if score is not None:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return score
+
+        score = enhanced_string_similarity(query, value)
+        with self._lock:
+            self._stats["misses"] += 1
+            self._memory[key] = score
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+        return score
+
+    def get_stats(self) -> Dict:
+        """메모 적중/미스/무효화 횟수와 크기"""
+        with self._lock:
+            return dict(self._stats, size=len(self._memory), version=self.version)
+
+
+class BatchScorer:
+    """
+    추천 후보 일괄 점수 계산기
+
+    사용처:
+    - recommender.py: get_recommendations()에서 후보 전체 점수 계산
+
+    연계 파일:
+    - config.py: RECOMMENDATION_CANDIDATE_POOL (점수를 계산할 후보 수), SIMILARITY_MEMO_SIZE
+    - logic/vocabulary.py: 어휘 버전 변경 시 유사도 메모 무효화
+
+    담당자 수정 가이드:
+    - 필드 가중치 변경 시 FIELD_WEIGHTS 수정
+    - 필드별 유사도 계산은 고유값 단위로 수행되므로 후보 수가 늘어도 문자열 비교 횟수는 거의 늘지 않음
+    """
+
+    # (ParsedInput 필드, 후보 컬럼, 가중치)
+    FIELD_WEIGHTS = (
+        ("equipment_type", "equipType", 0.35),
+        ("location", "location", 0.35),  # 사용자가 "공정명"으로 입력한 경우도 Location 컬럼과 매칭
+        ("status_code", "statusCode", 0.2),
+        ("priority", "priority", 0.1),
+    )
+    # 모든 필드가 이 값을 넘게 일치하면 보너스
+    BONUS_THRESHOLD = 0.8
+    BONUS = 0.1
+
+    def __init__(self, memo: SimilarityMemo = None):
+        self.memo = memo or SimilarityMemo()
+
+    def score(self, parsed_input: ParsedInput, notifications: Sequence[Dict]) -> np.ndarray:
+        """
+        후보 전체 유사도 점수 계산
+
+        Args:
+            parsed_input: 파싱된 입력 데이터
+            notifications: DB 후보 행 목록
+
+        Returns:
+            후보 순서와 같은 점수 배열 (0.0 ~ 1.0)
+
+        처리 과정:
+        1. 필드별로 후보 값의 고유값만 입력과 비교
+        2. 고유값 점수를 행으로 펼친 뒤 값이 있는 필드만 가중 평균
+        3. 입력 4개 필드가 모두 있고 모두 임계값을 넘게 일치하면 보너스
+        """
+        count = len(notifications)
+        if count == 0:
+            return np.zeros(0)
+        self.memo.use_version(vocabulary_service.get_snapshot().version)
+
+        weighted = np.zeros(count)
+        total_weight = np.zeros(count)
+        all_matched = np.ones(count, dtype=bool)
+
+        for input_field, column, weight in self.FIELD_WEIGHTS:
+            query = (getattr(parsed_input, input_field) or "").lower()
+            values = np.array([notification.get(column) or "" for notification in notifications], dtype=str)
+            present = (values != "") if query else np.zeros(count, dtype=bool)
+            matches = self._field_matches(query, values) if query else np.zeros(count)
+
+            weighted += np.where(present, matches * weight, 0.0)
+            total_weight += np.where(present, weight, 0.0)
+            all_matched &= present & (matches > self.BONUS_THRESHOLD)
+
+        scores = np.divide(weighted, total_weight, out=np.zeros(count), where=total_weight > 0)
+
+        if all(getattr(parsed_input, input_field) for input_field, _, _ in self.FIELD_WEIGHTS):
+            scores = np.where(all_matched, np.minimum(scores + self.BONUS, 1.0), scores)
+        return scores
+
+    def _field_matches(self, query: str, values: np.ndarray) -> np.ndarray:
+        """고유값별 유사도(메모 조회)를 행 단위 배열로 펼침"""
+        uniques, inverse = np.unique(values, return_inverse=True)
+        unique_scores = np.array([
+            self.memo.similarity(query, value) for value in np.char.lower(uniques).tolist()
+        ])
+        return unique_scores[inverse.reshape(-1)]
+
+    def rank(self, parsed_input: ParsedInput, notifications: Sequence[Dict],
+             min_score: float = 0.0) -> List[tuple]:
+        """
+        점수 내림차순 (후보, 점수) 목록 (min_score 초과 후보만, 같은 점수는 원래 순서 유지)
+        """
+        scores = self.score(parsed_input, notifications)
+        order = np.argsort(-scores, kind="stable")
+        return [(notifications[i], float(scores[i])) for i in order if scores[i] > min_score]
+
+
+# 전역 일괄 점수 계산기 인스턴스
+batch_scorer = BatchScorer()
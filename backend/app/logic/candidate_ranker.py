@@ -0,0 +1,141 @@
+"""
+PMark2 AI Assistant - 정규화 후보 검색기
+
+이 파일은 입력 용어와 표준 어휘 사이의 문자 n-gram 유사도를 계산하여
+LLM 정규화 프롬프트에 넣을 상위 K개 후보(shortlist)를 선정합니다.
+한글은 자모 단위로 분해하여 비교하므로 "압력베젤"/"압력배젤" 같은 오타에도 강합니다.
+
+주요 담당자: AI/ML 엔지니어, 백엔드 개발자
+수정 시 주의사항:
+- 유사도는 자모 bigram 집합의 Dice 계수 (0.0~1.0)
+- 어휘 인덱스는 (카테고리, 어휘 버전)별로 한 번만 생성
+- 상위 후보가 충분히 확실하면 LLM 호출 없이 바로 확정 (is_unambiguous)
+"""
+
+import re
+import threading
+from typing import Dict, List, Set, Tuple
+from ..config import Config
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_INITIALS = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_MEDIALS = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_FINALS = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+           "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해 (그 외 문자는 그대로)"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            offset = code - _HANGUL_BASE
+            chars.append(_INITIALS[offset // 588])
+            chars.append(_MEDIALS[(offset % 588) // 28])
+            chars.append(_FINALS[offset % 28])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def char_ngrams(text: str, n: int = 2) -> Set[str]:
+    """비교용 n-gram 집합 생성 (소문자화, 공백 제거, 자모 분해)"""
+    folded = decompose_jamo(re.sub(r'\s+', '', text).lower())
+    if not folded:
+        return set()
+    if len(folded) < n:
+        return {folded}
+    return {folded[i:i + n] for i in range(len(folded) - n + 1)}
+
+
+def entry_text(entry) -> str:
+    """어휘 항목의 비교용 문자열 (현상코드 튜플은 코드 + 설명)"""
+    if isinstance(entry, tuple):
+        return " ".join(str(part) for part in entry[:2] if part)
+    return str(entry)
+
+
+def entry_value(entry) -> str:
+    """어휘 항목의 표준 용어 값 (현상코드 튜플은 코드)"""
+    return entry[0] if isinstance(entry, tuple) else entry
+
+
+class CandidateRanker:
+    """
+    단일 어휘 목록에 대한 n-gram 역색인
+
+    담당자 수정 가이드:
+    - 입력과 n-gram을 하나 이상 공유하는 항목만 점수 계산 (전체 스캔 없음)
+    """
+
+    def __init__(self, vocabulary):
+        self.entries = [entry for entry in vocabulary if entry]
+        self.grams: List[Set[str]] = [char_ngrams(entry_text(entry)) for entry in self.entries]
+        self.inverted: Dict[str, List[int]] = {}
+        for idx, grams in enumerate(self.grams):
+            for gram in grams:
+                self.inverted.setdefault(gram, []).append(idx)
+
+    def rank(self, term: str, top_k: int) -> List[Tuple[object, float]]:
+        """
+        입력 용어와 유사한 상위 K개 어휘 항목
+
+        Returns:
+            [(어휘 항목, 유사도), ...] 유사도 내림차순
+        """
+        query = char_ngrams(term)
+        if not query:
+            return []
+
+        shared: Dict[int, int] = {}
+        for gram in query:
+            for idx in self.inverted.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+
+        scored = [
+            (idx, 2.0 * count / (len(query) + len(self.grams[idx])))
+            for idx, count in shared.items()
+        ]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return [(self.entries[idx], score) for idx, score in scored[:top_k]]
+
+
+class CandidateRetriever:
+    """
+    카테고리별 후보 검색기
+
+    사용처:
+    - normalizer.py: _lookup_without_llm()에서 shortlist 생성 및 확정 판단
+
+    연계 파일:
+    - config.py: NORMALIZATION_SHORTLIST_SIZE, NORMALIZATION_ACCEPT_SCORE, NORMALIZATION_ACCEPT_MARGIN
+
+    담당자 수정 가이드:
+    - 확정 기준을 낮추면 LLM 호출은 줄지만 오정규화 위험 증가
+    """
+
+    def __init__(self):
+        self._rankers: Dict[str, Tuple[str, CandidateRanker]] = {}
+        self._lock = threading.Lock()
+
+    def rank(self, term: str, category: str, vocabulary, vocab_version: str, top_k: int = None) -> List[Tuple[object, float]]:
+        """(카테고리, 어휘 버전)별 인덱스로 상위 후보 검색"""
+        with self._lock:
+            cached = self._rankers.get(category)
+        if cached and cached[0] == vocab_version:
+            ranker = cached[1]
+        else:
+            ranker = CandidateRanker(vocabulary)
+            with self._lock:
+                self._rankers[category] = (vocab_version, ranker)
+        return ranker.rank(term, top_k or Config.NORMALIZATION_SHORTLIST_SIZE)
+
+    @staticmethod
+    def is_unambiguous(ranked: List[Tuple[object, float]]) -> bool:
+        """상위 후보가 임계값 이상이고 2순위와 충분히 차이 나는지 확인"""
+        if not ranked or ranked[0][1] < Config.NORMALIZATION_ACCEPT_SCORE:
+            return False
+        second = ranked[1][1] if len(ranked) > 1 else 0.0
+        return ranked[0][1] - second >= Config.NORMALIZATION_ACCEPT_MARGIN
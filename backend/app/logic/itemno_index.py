@@ -0,0 +1,297 @@
+"""
+PMark2 AI Assistant - ITEMNO 인덱스
+
+이 파일은 작업대상(ITEMNO) 존재 여부와 유사 ITEMNO를 빠르게 찾기 위한 메모리 인덱스를 제공합니다.
+정확 일치용 해시 집합과 유사 검색용 trigram 역색인으로 구성됩니다.
+
+주요 담당자: 백엔드 개발자
+수정 시 주의사항:
+- 인덱스는 첫 사용 시 한 번 생성되고, database.py의 load_excel_data()가 끝날 때 refresh()로 갱신됩니다
+- 대소문자는 구분하지 않습니다 (PE-V2884 == pe-v2884)
+- trigram은 앞뒤 경계 문자(^, $)를 붙여 생성하므로 접두어 일치도 반영됩니다
+- search()는 길이 차이와 공유 trigram 수로 후보를 먼저 거른 뒤에만 편집 거리를 계산합니다
+- 공유 trigram 하한은 결과가 전체 스캔과 같도록 계산합니다 (q-gram 보조정리, 근사 컷오프 없음)
+"""
+
+import math
+import sqlite3
+import threading
+import logging
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..config import Config
+from ..db_connection import get_connection_manager
+
+
+def itemno_trigrams(itemno: str) -> Set[str]:
+    """ITEMNO 비교용 trigram 집합 (소문자화, 앞뒤 경계 문자 포함)"""
+    padded = f"^{itemno.strip().lower()}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def itemno_similarity(item1: str, item2: str) -> float:
+    """
+    두 ITEMNO 간의 유사도 계산 (0.0 ~ 1.0)
+
+    - 기본 문자열 유사도 (SequenceMatcher)
+    - 정확한 매칭은 1.0, 부분 매칭은 +0.2 보너스
+    """
+    lowered1, lowered2 = item1.lower(), item2.lower()
+    if lowered1 == lowered2:
+        return 1.0
+
+    similarity = SequenceMatcher(None, lowered1, lowered2).ratio()
+    if lowered1 in lowered2 or lowered2 in lowered1:
+        similarity += 0.2
+    return min(1.0, similarity)
+
+
+def bounded_levenshtein(item1: str, item2: str, max_distance: int) -> Optional[int]:
+    """
+    최대 거리 제한이 있는 편집 거리 (제한을 넘으면 계산을 중단하고 None)
+
+    대각선 기준 max_distance 폭의 띠 안에서만 계산합니다.
+    """
+    if abs(len(item1) - len(item2)) > max_distance:
+        return None
+    if len(item1) > len(item2):
+        item1, item2 = item2, item1
+
+    previous = list(range(len(item2) + 1))
+    for i, ch1 in enumerate(item1, 1):
+        start = max(1, i - max_distance)
+        end = min(len(item2), i + max_distance)
+        current = [max_distance + 1] * (len(item2) + 1)
+        current[0] = i
+        for j in range(start, end + 1):
+            cost = 0 if ch1 == item2[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+        if min(current[start - 1:end + 1]) > max_distance:
+            return None
+        previous = current
+
+    distance = previous[len(item2)]
+    return distance if distance <= max_distance else None
+
+
+class ItemnoIndex:
+    """
+    ITEMNO 메모리 인덱스
+
+    사용처:
+    - parser.py: _check_itemno_in_db()에서 시나리오 2 판단 (DB 조회 없음)
+    - parser.py: _extract_itemno_from_input()에서 오타 ITEMNO를 실제 ITEMNO로 보정 (search)
+    - database.py: search_by_itemno()의 상위 K개 유사 ITEMNO 조회 (search)
+    - database.py: load_excel_data() 완료 후 refresh() 호출
+
+    연계 파일:
+    - config.py: ITEMNO_FUZZY_TOP_K, ITEMNO_FUZZY_MIN_SCORE
+
+    담당자 수정 가이드:
+    - 유사 검색은 결과에 들 수 있는 만큼 trigram을 공유하는 ITEMNO만 점수 계산
+    - 후보 선정 조건을 바꾸면 tests/test_itemno_index.py의 전체 스캔 비교 테스트로 결과가 같은지 확인
+    - 새 ITEMNO가 이력에 추가되면 add()로 인덱스에 반영
+    """
+
+    # 경계 문자를 붙여도 내부 trigram이 없는 짧은 ITEMNO 길이 (부분 일치 판단 시 trigram 없이 따로 확인)
+    SHORT_ITEMNO_LENGTH = 2
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.SQLITE_DB_PATH
+        self.logger = logging.getLogger(__name__)
+        self._exact: Dict[str, str] = {}  # 소문자 ITEMNO → 원본 ITEMNO
+        self._trigrams: Dict[str, Set[str]] = {}  # trigram → 소문자 ITEMNO 집합
+        self._short: Set[str] = set()  # SHORT_ITEMNO_LENGTH 이하 소문자 ITEMNO
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def _ensure_loaded(self):
+        """첫 사용 시 DB에서 인덱스 생성"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._build(self._load_itemnos())
+
+    def refresh(self):
+        """DB에서 ITEMNO를 다시 읽어 인덱스 재생성 (데이터 재적재 후 호출)"""
+        itemnos = self._load_itemnos()
+        with self._lock:
+            self._build(itemnos)
+        self.logger.info(f"ITEMNO 인덱스 갱신: {len(self._exact)} 건")
+
+    def add(self, itemno: str):
+        """ITEMNO 하나를 인덱스에 추가"""
+        if not itemno or not str(itemno).strip():
+            return
+        self._ensure_loaded()
+        with self._lock:
+            self._add(str(itemno).strip())
+
+    def _build(self, itemnos: Iterable[str]):
+        """인덱스 전체 재생성 (호출자가 lock 보유)"""
+        self._exact = {}
+        self._trigrams = {}
+        self._short = set()
+        for itemno in itemnos:
+            self._add(itemno)
+        self._loaded = True
+
+    def _add(self, itemno: str):
+        """단일 ITEMNO 등록 (호출자가 lock 보유)"""
+        key = itemno.lower()
+        if key in self._exact:
+            return
+        self._exact[key] = itemno
+        if len(key) <= self.SHORT_ITEMNO_LENGTH:
+            self._short.add(key)
+        for gram in itemno_trigrams(itemno):
+            self._trigrams.setdefault(gram, set()).add(key)
+
+    def _load_itemnos(self) -> List[str]:
+        """DB에서 DISTINCT ITEMNO 조회 (테이블이 없으면 빈 목록, 현재 스레드의 읽기 연결 사용)"""
+        try:
+            conn = get_connection_manager(self.db_path).reader()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"ITEMNO 인덱스 로드 실패: {e}")
+            return []
+        try:
+            cursor = conn.execute(
+                "SELECT DISTINCT itemno FROM notification_history WHERE itemno IS NOT NULL AND itemno != ''"
+            )
+            return [str(row[0]).strip() for row in cursor.fetchall() if str(row[0]).strip()]
+        except sqlite3.OperationalError:
+            return []
+
+    def contains(self, itemno: str) -> bool:
+        """정확히 일치하는 ITEMNO 존재 여부 (대소문자 무시)"""
+        self._ensure_loaded()
+        return itemno.strip().lower() in self._exact
+
+    def _candidates(self, itemno: str, min_shared: int) -> List[Tuple[str, int]]:
+        """
+        trigram을 min_shared개 이상 공유하는 후보 (소문자 ITEMNO, 공유 수) 목록, 공유 수 내림차순
+
+        min_shared개 이상을 공유하는 ITEMNO는 가장 드문 (n - min_shared + 1)개 trigram 중 하나를
+        반드시 포함하므로, min_shared가 클수록 흔한 trigram(예: "^pe")의 긴 목록은 훑지 않습니다.
+        """
+        query = itemno_trigrams(itemno)
+        min_shared = max(1, min_shared)
+        if min_shared > len(query):
+            return []
+        with self._lock:
+            postings = sorted((self._trigrams.get(gram, set()) for gram in query), key=len)
+        probe_count = len(query) - min_shared + 1
+        shared: Dict[str, int] = {}
+        for posting in postings[:probe_count]:
+            for key in posting:
+                shared[key] = shared.get(key, 0) + 1
+
+        # 나머지(흔한) trigram은 후보 집합과의 교집합만 확인
+        for posting in postings[probe_count:]:
+            for key in shared.keys() & posting:
+                shared[key] += 1
+
+        candidates = [(key, count) for key, count in shared.items() if count >= min_shared]
+        candidates.sort(key=lambda item: item[1], reverse=True)
+        return candidates
+
+    def has_similar(self, itemno: str, threshold: float = 0.8) -> bool:
+        """
+        유사도가 임계값을 넘는 ITEMNO 존재 여부 (전체 ITEMNO를 itemno_similarity로 비교한 것과 같은 결과)
+
+        Args:
+            itemno: 입력 ITEMNO 후보
+            threshold: 유사도 임계값 (itemno_similarity 기준, 0.8 이상 가정)
+
+        두 ITEMNO가 모두 3글자 이상이면 유사도 0.8 초과(부분 일치 보너스 포함)는 trigram을 하나 이상 공유할 때만
+        가능하므로 공유 후보만 비교하고, 그보다 짧은 쪽이 있으면 해당 ITEMNO를 따로 비교합니다.
+        길이 비율상 임계값을 넘을 수 없는 후보는 유사도 계산 전에 제외합니다.
+        """
+        if self.contains(itemno):
+            return True
+        key = itemno.strip().lower()
+        if len(key) <= self.SHORT_ITEMNO_LENGTH:
+            with self._lock:
+                keys = list(self._exact)
+        else:
+            with self._lock:
+                short_keys = list(self._short)
+            keys = [candidate for candidate, _ in self._candidates(key, 1)] + short_keys
+
+        for candidate in keys:
+            # SequenceMatcher 유사도 상한 2·min/(n+m) (+ 부분 일치 보너스 0.2)
+            if 2 * min(len(key), len(candidate)) / (len(key) + len(candidate)) + 0.2 <= threshold:
+                continue
+            if itemno_similarity(itemno, self._exact[candidate]) > threshold:
+                return True
+        return False
+
+    @staticmethod
+    def _min_shared_trigrams(itemno: str, query_grams: Set[str], min_score: float) -> int:
+        """
+        점수 min_score 이상인 ITEMNO가 입력과 반드시 공유하는 trigram 수 (search 후보 하한)
+
+        경계 문자를 붙인 길이 L 문자열의 trigram은 L개이고, 편집 1회는 trigram을 최대 3개 바꾸므로
+        편집 거리 d ≤ (1 - min_score)·L인 두 ITEMNO는 L - 3d ≥ n·(1 - 3·(1 - min_score))개 이상을 공유합니다
+        (n: 입력 길이, L ≥ n). 입력에 중복 trigram이 있으면 그만큼 뺍니다.
+        """
+        bound = math.ceil(len(itemno) * (1 - 3 * (1 - min_score)) - 1e-9)
+        return bound - (len(itemno) - len(query_grams))
+
+    def search(self, itemno: str, top_k: int = None, min_score: float = None) -> List[Tuple[str, float]]:
+        """
+        유사 ITEMNO 상위 K개 검색
+
+        Args:
+            itemno: 입력 ITEMNO (오타 포함 가능)
+            top_k: 반환할 최대 후보 수 (기본 Config.ITEMNO_FUZZY_TOP_K)
+            min_score: 최소 점수 (기본 Config.ITEMNO_FUZZY_MIN_SCORE)
+
+        Returns:
+            [(원본 ITEMNO, 점수), ...] 점수 내림차순
+            점수 = 1 - 편집거리 / 긴 쪽 길이 (정확 일치는 1.0)
+
+        처리 과정:
+        1. 정확 일치 확인
+        2. 공유 trigram 수 하한(_min_shared_trigrams)으로 후보 선정 (하한이 0 이하면 전체 ITEMNO)
+        3. 길이 차이로 허용 편집 거리를 넘는 후보 제외
+        4. 남은 후보만 제한 편집 거리로 점수 계산
+        """
+        top_k = top_k or Config.ITEMNO_FUZZY_TOP_K
+        min_score = min_score if min_score is not None else Config.ITEMNO_FUZZY_MIN_SCORE
+        key = itemno.strip().lower()
+        if not key:
+            return []
+
+        self._ensure_loaded()
+        results: Dict[str, float] = {}
+        if key in self._exact:
+            results[key] = 1.0
+
+        min_shared = self._min_shared_trigrams(key, itemno_trigrams(key), min_score)
+        if min_shared >= 1:
+            candidates = [candidate for candidate, _ in self._candidates(key, min_shared)]
+        else:
+            with self._lock:
+                candidates = list(self._exact)
+
+        for candidate in candidates:
+            if candidate in results:
+                continue
+            longest = max(len(key), len(candidate))
+            max_distance = int((1.0 - min_score) * longest)
+            if abs(len(key) - len(candidate)) > max_distance:
+                continue
+            distance = bounded_levenshtein(key, candidate, max_distance)
+            if distance is not None:
+                results[candidate] = round(1.0 - distance / longest, 3)
+
+        ranked = sorted(results.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        return [(self._exact[candidate], score) for candidate, score in ranked]
+
+
+# 전역 ITEMNO 인덱스 인스턴스
+itemno_index = ItemnoIndex()
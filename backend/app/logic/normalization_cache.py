@@ -0,0 +1,231 @@
+"""
+PMark2 AI Assistant - 용어 정규화 캐시
+
+이 파일은 LLM 정규화 결과를 재사용하기 위한 2단계 캐시를 제공합니다.
+1단계는 프로세스 내부의 크기 제한 LRU 캐시, 2단계는 SQLite 테이블 기반 영구 캐시입니다.
+
+주요 담당자: 백엔드 개발자, AI/ML 엔지니어
+수정 시 주의사항:
+- 캐시 키는 (카테고리, 정규화된 입력, 어휘 버전)입니다
+- 어휘 버전이 바뀌면 기존 캐시는 자동으로 무시됩니다 (DB 데이터 재적재 시)
+- TTL이 지난 항목과 현재 어휘 버전이 아닌 항목은 main.py의 주기 정리 작업이 purge_expired()로 삭제합니다
+"""
+
+import re
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from ..config import Config
+from ..db_connection import get_connection_manager
+
+
+class NormalizationCache:
+    """
+    정규화 결과 2단계 캐시 (메모리 LRU + SQLite)
+
+    사용처:
+    - normalizer.py: normalize_term()에서 LLM 호출 전 조회, 호출 후 저장
+
+    연계 파일:
+    - config.py: NORMALIZATION_CACHE_SIZE, NORMALIZATION_CACHE_TTL_HOURS 설정
+
+    담당자 수정 가이드:
+    - get/put은 SQLite를 읽고 쓰므로 비동기 코드에서는 asyncio.to_thread로 호출
+    - _lock은 메모리 LRU만 보호하고 SQLite 입출력 중에는 잡지 않음
+      (정리 작업이 쓰기 연결을 기다리는 동안 다른 조회가 막히지 않도록)
+    - 메모리 캐시 크기는 자주 쓰이는 구어체 용어 수보다 넉넉하게 설정
+    - 통계(get_stats)는 /api/v1/normalization-cache-stats에서 조회 가능
+    """
+
+    TABLE_NAME = "normalization_cache"
+
+    def __init__(self, db_path: str = None, max_size: int = None, ttl_hours: float = None):
+        """
+        정규화 캐시 초기화
+
+        설정:
+        - 메모리 LRU 저장소 (OrderedDict)
+        - SQLite 캐시 테이블 생성
+        - 적중/미스 카운터 초기화
+        """
+        self.db_path = db_path or Config.SQLITE_DB_PATH
+        self.max_size = max_size if max_size is not None else Config.NORMALIZATION_CACHE_SIZE
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else Config.NORMALIZATION_CACHE_TTL_HOURS) * 3600
+        self.logger = logging.getLogger(__name__)
+
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[str, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0}
+        self._connections = None
+        self._initialize_table()
+
+    def _initialize_table(self):
+        """캐시 테이블 생성 (실패 시 메모리 캐시만 사용)"""
+        try:
+            self._connections = get_connection_manager(self.db_path)
+            with self._connections.writer() as conn:
+                conn.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                        category TEXT NOT NULL,
+                        term_key TEXT NOT NULL,
+                        vocab_version TEXT NOT NULL,
+                        normalized_term TEXT NOT NULL,
+                        confidence REAL NOT NULL,
+                        created_at REAL NOT NULL,
+                        PRIMARY KEY (category, term_key, vocab_version)
+                    )
+                ''')
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"정규화 캐시 테이블 생성 실패, 메모리 캐시만 사용: {e}")
+            self._connections = None
+
+    @staticmethod
+    def make_term_key(term: str) -> str:
+        """입력 용어를 캐시 키로 정규화 (앞뒤 공백 제거, 연속 공백 축약, 소문자화)"""
+        return re.sub(r'\s+', ' ', term.strip()).lower()
+
+    def get(self, term: str, category: str, vocab_version: str) -> Optional[Tuple[str, float]]:
+        """
+        캐시 조회
+
+        Args:
+            term: 원본 입력 용어
+            category: 용어 카테고리
+            vocab_version: 현재 어휘 버전
+
+        Returns:
+            (표준용어, 신뢰도) 또는 None (캐시 미스)
+        """
+        key = (category, self.make_term_key(term), vocab_version)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                normalized_term, confidence, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return normalized_term, confidence
+                del self._memory[key]
+
+        row = None
+        if self._connections is not None:
+            try:
+                row = self._connections.reader().execute(
+                    f"SELECT normalized_term, confidence, created_at FROM {self.TABLE_NAME} "
+                    "WHERE category = ? AND term_key = ? AND vocab_version = ?",
+                    key
+                ).fetchone()
+            except sqlite3.Error as e:
+                self.logger.warning(f"정규화 캐시 조회 오류: {e}")
+
+        with self._lock:
+            if row and now - row[2] <= self.ttl_seconds:
+                self._remember(key, (row[0], row[1], row[2]))
+                self._stats["db_hits"] += 1
+                return row[0], row[1]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, term: str, category: str, vocab_version: str, normalized_term: str, confidence: float):
+        """
+        정규화 결과 저장 (메모리 + SQLite)
+
+        Args:
+            term: 원본 입력 용어
+            category: 용어 카테고리
+            vocab_version: 현재 어휘 버전
+            normalized_term: 정규화된 표준 용어
+            confidence: 신뢰도
+        """
+        self.put_many([(term, category, vocab_version, normalized_term, confidence)])
+
+    def put_many(self, entries: List[Tuple[str, str, str, str, float]]):
+        """
+        여러 정규화 결과 저장 (SQLite는 한 번의 쓰기 트랜잭션)
+
+        Args:
+            entries: [(원본 용어, 카테고리, 어휘 버전, 표준용어, 신뢰도), ...]
+        """
+        created_at = time.time()
+        rows = [(category, self.make_term_key(term), vocab_version, normalized_term, confidence, created_at)
+                for term, category, vocab_version, normalized_term, confidence in entries]
+
+        with self._lock:
+            for row in rows:
+                self._remember(row[:3], row[3:])
+            self._stats["stores"] += len(rows)
+
+        if self._connections is not None and rows:
+            try:
+                with self._connections.writer() as conn:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {self.TABLE_NAME} "
+                        "(category, term_key, vocab_version, normalized_term, confidence, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                self.logger.warning(f"정규화 캐시 저장 오류: {e}")
+
+    def _remember(self, key: Tuple[str, str, str], value: Tuple[str, float, float]):
+        """메모리 LRU에 저장 (크기 초과 시 가장 오래된 항목 제거, 호출자가 lock 보유)"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self, current_version: str = None) -> int:
+        """
+        TTL이 지난 영구 캐시 항목 삭제
+
+        Args:
+            current_version: 현재 어휘 버전 (주어지면 다른 버전 항목도 삭제, 다시 조회될 일이 없음)
+
+        Returns:
+            삭제된 항목 수
+        """
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            if current_version is not None:
+                for key in [key for key in self._memory if key[2] != current_version]:
+                    del self._memory[key]
+        if self._connections is None:
+            return 0
+        # 쓰기 연결 대기 중에도 조회가 막히지 않도록 lock 밖에서 삭제
+        try:
+            with self._connections.writer() as conn:
+                if current_version is None:
+                    cursor = conn.execute(f"DELETE FROM {self.TABLE_NAME} WHERE created_at < ?", (cutoff,))
+                else:
+                    cursor = conn.execute(
+                        f"DELETE FROM {self.TABLE_NAME} WHERE created_at < ? OR vocab_version != ?",
+                        (cutoff, current_version)
+                    )
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            self.logger.warning(f"정규화 캐시 정리 오류: {e}")
+            return 0
+
+    def clear(self):
+        """메모리 캐시 비우기 (영구 캐시는 유지)"""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> Dict:
+        """
+        캐시 통계 반환
+
+        Returns:
+            적중/미스 카운터와 적중률, 메모리 캐시 크기
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
@@ -11,12 +11,16 @@ PMark1 AI Assistant - LLM 기반 용어 정규화 엔진
 - 프롬프트 수정 시 일관성 있는 응답을 위해 temperature를 낮게 유지
 """
 
-from openai import OpenAI
 from typing import Dict, List, Optional, Tuple
 from ..config import Config
+from ..llm_gateway import llm_gateway
+from .normalization_cache import NormalizationCache
+from .term_resolver import LocalTermResolver
+from .candidate_ranker import CandidateRetriever, entry_value
+from .vocabulary import vocabulary_service
+import asyncio
 import json
 import re
-import sqlite3
 
 class LLMNormalizer:
     """
@@ -43,11 +47,17 @@ class LLMNormalizer:
         LLM 정규화 엔진 초기화
         
         설정:
-        - OpenAI 클라이언트 초기화
+        - 비동기 LLM 게이트웨이 연결
         - 표준 용어 사전 정의 (카테고리별)
+        - 정규화 결과 캐시 (메모리 LRU + SQLite)
+        - 로컬 용어 해석기 (정확 일치/코드/별칭)
+        - 후보 검색기 (프롬프트용 shortlist)
         """
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.llm = llm_gateway
         self.model = Config.OPENAI_MODEL
+        self.cache = NormalizationCache()
+        self.resolver = LocalTermResolver()
+        self.retriever = CandidateRetriever()
         
         # 표준 용어 사전 (LLM이 참조할 기준)
         # 실제 DB의 equipType, location, statusCode 값과 일치해야 함
@@ -70,40 +80,16 @@ class LLMNormalizer:
             ]
         }
     
-    def _get_db_terms(self, category: str) -> list:
-        """DB에서 표준 용어 목록 동적 추출"""
-        db_path = Config.SQLITE_DB_PATH
-        conn = sqlite3.connect(db_path)
-        terms = []
-        if category == "equipment":
-            # 설비유형 자료에서 먼저 확인
-            try:
-                cursor = conn.execute("SELECT DISTINCT type_name FROM equipment_types")
-                terms = [row[0] for row in cursor.fetchall() if row[0]]
-            except sqlite3.OperationalError:
-                # equipment_types 테이블이 없으면 notification_history에서 추출
-                cursor = conn.execute("SELECT DISTINCT equipType FROM notification_history")
-                terms = [row[0] for row in cursor.fetchall() if row[0]]
-        elif category == "location":
-            # Location 컬럼에서 추출 (Cost Center가 아님)
-            cursor = conn.execute("SELECT DISTINCT location FROM notification_history")
-            terms = [row[0] for row in cursor.fetchall() if row[0]]
-        elif category == "status":
-            try:
-                cursor = conn.execute("SELECT code, description, category FROM status_codes")
-                # code, description, category 모두 프롬프트에 제공
-                terms = [(row[0], row[1], row[2]) for row in cursor.fetchall() if row[0]]
-            except sqlite3.OperationalError:
-                # status_codes 테이블이 없는 경우 notification_history에서 statusCode 추출
-                cursor = conn.execute("SELECT DISTINCT statusCode FROM notification_history")
-                terms = [row[0] for row in cursor.fetchall() if row[0]]
-        elif category == "priority":
-            cursor = conn.execute("SELECT DISTINCT priority FROM notification_history")
-            terms = [row[0] for row in cursor.fetchall() if row[0]]
-        conn.close()
-        return terms
+    def _get_db_terms(self, category: str) -> tuple:
+        """
+        어휘 스냅샷에서 표준 용어 목록 조회
+        
+        DB를 매번 조회하지 않고 vocabulary.py의 스냅샷(불변 tuple)을 사용합니다.
+        현상코드는 (code, description, category) 튜플 목록입니다.
+        """
+        return vocabulary_service.get_snapshot().terms_for(category)
 
-    def normalize_term(self, term: str, category: str) -> Tuple[str, float]:
+    async def normalize_term(self, term: str, category: str) -> Tuple[str, float]:
         """
         LLM을 사용하여 용어를 표준 용어로 정규화
         
@@ -127,42 +113,114 @@ class LLMNormalizer:
         - 신뢰도가 0.3 미만인 경우 원본 용어를 반환하도록 설정됨
         - 오류 발생 시 원본 용어와 중간 신뢰도(0.5) 반환
         - 새로운 카테고리 추가 시 standard_terms에 추가 필요
+        - 동일한 (카테고리, 입력, 어휘 버전) 조합은 캐시에서 바로 반환
+        - 표준 용어/코드/별칭으로 확정되는 입력은 로컬 해석기로 처리 (LLM 생략)
         """
         if not term:
             return term, 0.0
         
         try:
-            # DB에서 표준 용어 목록 동적 추출
-            db_terms = self._get_db_terms(category)
-            prompt = self._create_normalization_prompt(term, category, db_terms)
-            
-            # LLM 호출 (일관성을 위해 낮은 temperature 사용)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "당신은 설비관리 시스템의 용어 정규화 전문가입니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,  # 일관성을 위해 낮은 temperature
-                max_tokens=200
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # 응답 파싱
-            normalized_term, confidence = self._parse_normalization_response(result_text)
+            # 로컬 해석 및 캐시 조회 (적중 시 LLM 호출 생략)
+            result, db_terms, vocab_version = await self._lookup_without_llm(term, category)
+            if result is not None:
+                return result
             
-            return normalized_term, confidence
+            return await self._normalize_with_llm(term, category, db_terms, vocab_version)
             
         except Exception as e:
             print(f"LLM 정규화 오류: {e}")
             return term, 0.5  # 오류 시 원본 반환, 중간 신뢰도
     
-    def _create_normalization_prompt(self, term: str, category: str, db_terms) -> str:
+    async def _lookup_without_llm(self, term: str, category: str) -> Tuple[Optional[Tuple[str, float]], tuple, str]:
         """
-        DB에서 추출한 표준 용어 목록을 LLM 프롬프트에 직접 제공
-        현상코드는 code, description, category 모두 제공
-        우선순위는 DB의 실제 용어들을 사용
+        LLM 없이 해석 시도 (로컬 해석기 → 캐시 → 확실한 상위 후보 순서)
+        
+        캐시 조회는 SQLite를 읽을 수 있으므로 작업 스레드에서 실행합니다 (이벤트 루프 차단 방지).
+        
+        Returns:
+            (해석 결과 또는 None, 프롬프트에 넣을 후보 용어 목록, 어휘 버전)
+        """
+        # 어휘 스냅샷에서 표준 용어 목록과 버전 조회
+        snapshot = vocabulary_service.get_snapshot()
+        db_terms = snapshot.terms_for(category)
+        vocab_version = snapshot.version
+        
+        # 로컬 해석 (정확 일치, 대소문자/공백 변형, [CODE], 별칭 사전)
+        local_result = self.resolver.resolve(
+            term, category, list(db_terms) + self.standard_terms.get(category, []), vocab_version
+        )
+        if local_result is not None:
+            return local_result, db_terms, vocab_version
+        
+        # 캐시 조회
+        cached = await asyncio.to_thread(self.cache.get, term, category, vocab_version)
+        if cached is not None:
+            return cached, db_terms, vocab_version
+        
+        # n-gram 후보 검색 (상위 후보가 확실하면 LLM 생략)
+        ranked = self.retriever.rank(term, category, db_terms, vocab_version)
+        if self.retriever.is_unambiguous(ranked):
+            return (entry_value(ranked[0][0]), round(ranked[0][1], 2)), db_terms, vocab_version
+        
+        return None, self._select_prompt_terms(category, db_terms, ranked), vocab_version
+    
+    def _select_prompt_terms(self, category: str, db_terms: tuple, ranked: list) -> tuple:
+        """
+        프롬프트에 넣을 표준 용어 선정
+        
+        - 어휘가 작으면 (NORMALIZATION_PROMPT_VOCAB_LIMIT 이하) 전체 포함
+        - 그 외에는 상위 K개 후보 + standard_terms (한영 변환 대비)
+        - 어휘 크기와 무관하게 프롬프트 크기가 일정하게 유지됨
+        """
+        if len(db_terms) <= Config.NORMALIZATION_PROMPT_VOCAB_LIMIT:
+            return db_terms
+        
+        selected = [entry for entry, _ in ranked]
+        if not isinstance(db_terms[0], tuple):
+            for standard_term in self.standard_terms.get(category, []):
+                if standard_term not in selected:
+                    selected.append(standard_term)
+        return tuple(selected)
+    
+    async def _normalize_with_llm(self, term: str, category: str, db_terms: tuple, vocab_version: str) -> Tuple[str, float]:
+        """단일 용어 LLM 정규화 (db_terms는 후보 용어 목록, 결과는 캐시에 저장)"""
+        prompt = self._create_normalization_prompt(term, category, db_terms)
+        
+        # LLM 호출 (일관성을 위해 낮은 temperature 사용)
+        result_text = await self.llm.complete(
+            messages=[
+                {"role": "system", "content": "당신은 설비관리 시스템의 용어 정규화 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,  # 일관성을 위해 낮은 temperature
+            max_tokens=200,
+            model=self.model
+        )
+        
+        # 응답 파싱
+        normalized_term, confidence = self._parse_normalization_response(result_text)
+        
+        # 파싱에 성공한 결과만 캐시에 저장 (SQLite 쓰기는 작업 스레드에서)
+        if normalized_term:
+            await asyncio.to_thread(self.cache.put, term, category, vocab_version, normalized_term, confidence)
+        
+        return normalized_term, confidence
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        정규화 캐시 통계 반환
+        
+        사용처:
+        - chat.py: GET /api/v1/normalization-cache-stats
+        """
+        return self.cache.get_stats()
+    
+    def _format_term_list(self, category: str, db_terms) -> Tuple[str, str]:
+        """
+        카테고리별 표준 용어 목록과 추가 규칙을 프롬프트용 문자열로 변환
+        
+        Returns:
+            (표준 용어 목록 문자열, 카테고리 추가 규칙)
         """
         if category == "status":
             # 현상코드: code, description, category 모두 프롬프트에 포함
@@ -190,6 +248,15 @@ class LLMNormalizer:
         else:
             term_list = "\n".join([f"- {t}" for t in db_terms])
             extra_rule = ""
+        return term_list, extra_rule
+    
+    def _create_normalization_prompt(self, term: str, category: str, db_terms) -> str:
+        """
+        DB에서 추출한 표준 용어 목록을 LLM 프롬프트에 직접 제공
+        현상코드는 code, description, category 모두 제공
+        우선순위는 DB의 실제 용어들을 사용
+        """
+        term_list, extra_rule = self._format_term_list(category, db_terms)
         return f"""
 다음 입력 용어를 설비관리 시스템의 표준 용어로 정규화해주세요.
 
@@ -274,7 +341,7 @@ class LLMNormalizer:
             
             return "", 0.0
     
-    def batch_normalize(self, terms: List[Tuple[str, str]]) -> List[Tuple[str, float]]:
+    async def batch_normalize(self, terms: List[Tuple[str, str]]) -> List[Tuple[str, float]]:
         """
         여러 용어를 일괄 정규화
         
@@ -282,23 +349,164 @@ class LLMNormalizer:
             terms: [(용어, 카테고리), ...] 형태의 리스트
             
         Returns:
-            [(정규화된 용어, 신뢰도), ...] 형태의 리스트
+            [(정규화된 용어, 신뢰도), ...] 형태의 리스트 (입력 순서 유지)
             
         사용처:
+        - parser.py: _normalize_extracted_terms()에서 추출된 4개 필드를 한 번에 정규화
         - 대량의 용어를 한 번에 정규화할 때 사용
-        - 성능 최적화를 위해 배치 처리 가능
+        
+        처리 과정:
+        1. 각 용어를 로컬 해석기/캐시로 먼저 해석
+        2. 남은 용어가 1개면 단일 정규화 프롬프트 사용
+        3. 남은 용어가 2개 이상이면 하나의 구조화된 요청으로 일괄 정규화
         
         담당자 수정 가이드:
-        - OpenAI API 비용 절약을 위해 배치 크기 조정 가능
-        - 병렬 처리로 성능 향상 가능
+        - 일괄 요청 실패 시 각 용어는 원본과 중간 신뢰도(0.5)로 반환
+        - 카테고리별 표준 용어 목록은 요청당 한 번만 포함됨
         """
-        results = []
-        for term, category in terms:
-            normalized, confidence = self.normalize_term(term, category)
-            results.append((normalized, confidence))
+        results: List[Optional[Tuple[str, float]]] = [None] * len(terms)
+        pending = []  # (인덱스, 용어, 카테고리, 후보 용어 목록, 어휘 버전)
+        
+        for i, (term, category) in enumerate(terms):
+            if not term:
+                results[i] = (term, 0.0)
+                continue
+            try:
+                result, db_terms, vocab_version = await self._lookup_without_llm(term, category)
+            except Exception as e:
+                print(f"LLM 정규화 오류: {e}")
+                results[i] = (term, 0.5)
+                continue
+            if result is not None:
+                results[i] = result
+            else:
+                pending.append((i, term, category, db_terms, vocab_version))
+        
+        if len(pending) == 1:
+            i, term, category, db_terms, vocab_version = pending[0]
+            try:
+                results[i] = await self._normalize_with_llm(term, category, db_terms, vocab_version)
+            except Exception as e:
+                print(f"LLM 정규화 오류: {e}")
+                results[i] = (term, 0.5)
+        elif pending:
+            try:
+                prompt = self._create_batch_normalization_prompt(
+                    [(term, category, db_terms) for _, term, category, db_terms, _ in pending]
+                )
+                result_text = await self.llm.complete(
+                    messages=[
+                        {"role": "system", "content": "당신은 설비관리 시스템의 용어 정규화 전문가입니다."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.1,
+                    max_tokens=200 * len(pending),
+                    model=self.model
+                )
+                batch_results = self._parse_batch_normalization_response(result_text, len(pending))
+            except Exception as e:
+                print(f"LLM 일괄 정규화 오류: {e}")
+                batch_results = [None] * len(pending)
+            
+            to_store = []
+            for (i, term, category, _, vocab_version), batch_result in zip(pending, batch_results):
+                if batch_result is None:
+                    results[i] = (term, 0.5)
+                    continue
+                results[i] = batch_result
+                if batch_result[0]:
+                    to_store.append((term, category, vocab_version, batch_result[0], batch_result[1]))
+            if to_store:
+                # 한 번의 쓰기 트랜잭션으로 저장 (작업 스레드에서)
+                await asyncio.to_thread(self.cache.put_many, to_store)
+        
         return results
     
-    def get_similarity_score(self, term1: str, term2: str, category: str) -> float:
+    def _create_batch_normalization_prompt(self, items: List[Tuple[str, str, tuple]]) -> str:
+        """
+        여러 용어를 한 번에 정규화하는 프롬프트 생성
+        
+        Args:
+            items: [(용어, 카테고리, 후보 용어 목록), ...]
+            
+        Returns:
+            LLM 프롬프트 문자열 (카테고리별 후보 목록은 합쳐서 한 번씩만 포함)
+        """
+        input_lines = [
+            f"{i}. 입력 용어: {term} / 카테고리: {category}"
+            for i, (term, category, _) in enumerate(items)
+        ]
+        
+        # 카테고리별 후보 목록 합집합 (카테고리당 한 번만 포함)
+        category_terms: Dict[str, list] = {}
+        for _, category, candidates in items:
+            merged = category_terms.setdefault(category, [])
+            for candidate in candidates:
+                if candidate not in merged:
+                    merged.append(candidate)
+        
+        sections = []
+        for category, candidates in category_terms.items():
+            term_list, extra_rule = self._format_term_list(category, candidates)
+            sections.append(f"### 카테고리: {category}\n{term_list}\n{extra_rule}")
+        
+        input_text = "\n".join(input_lines)
+        section_text = "\n\n".join(sections)
+        
+        return f"""
+다음 입력 용어들을 각 카테고리의 설비관리 시스템 표준 용어로 정규화해주세요.
+
+**입력 용어 목록**:
+{input_text}
+
+**카테고리별 표준 용어 목록**:
+{section_text}
+
+**정규화 규칙**:
+1. 오타, 띄어쓰기 오류, 한영 혼용을 DB에 있는 표준 용어로 변환
+2. 각 입력 용어는 해당 카테고리의 표준 용어 목록에서만 선택
+3. 유사한 의미나 동의어를 적절한 표준 용어로 변환
+4. 표준 용어 목록에 없는 경우 가장 유사한 용어 선택
+5. 전혀 매칭되지 않는 경우 "UNKNOWN" 반환
+
+**응답 형식** (입력 번호 순서대로 모든 항목 포함):
+```json
+{{
+    "results": [
+        {{"index": 0, "normalized_term": "표준용어", "confidence": 0.95}}
+    ]
+}}
+```
+"""
+    
+    def _parse_batch_normalization_response(self, response_text: str, count: int) -> List[Optional[Tuple[str, float]]]:
+        """
+        일괄 정규화 응답 파싱
+        
+        Args:
+            response_text: LLM 응답 텍스트
+            count: 요청한 용어 수
+            
+        Returns:
+            입력 순서대로 (정규화된 용어, 신뢰도) 또는 None (누락/파싱 실패)
+        """
+        parsed: List[Optional[Tuple[str, float]]] = [None] * count
+        try:
+            json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
+            if json_match:
+                data = json.loads(json_match.group(1))
+            else:
+                data = json.loads(response_text)
+            
+            for position, item in enumerate(data.get("results", [])):
+                index = item.get("index", position)
+                if isinstance(index, int) and 0 <= index < count:
+                    parsed[index] = (item.get("normalized_term", ""), item.get("confidence", 0.5))
+        except Exception as e:
+            print(f"일괄 정규화 응답 파싱 오류: {e}")
+        return parsed
+    
+    async def get_similarity_score(self, term1: str, term2: str, category: str) -> float:
         """
         두 용어 간의 유사도 점수 계산 (LLM 활용)
         
@@ -343,18 +551,16 @@ class LLMNormalizer:
 ```
 """
             
-            response = self.client.chat.completions.create(
-                model=self.model,
+            result_text = await self.llm.complete(
                 messages=[
                     {"role": "system", "content": "당신은 용어 유사도 평가 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
-                max_tokens=150
+                max_tokens=150,
+                model=self.model
             )
             
-            result_text = response.choices[0].message.content.strip()
-            
             # 응답 파싱
             json_match = re.search(r'```json\s*(.*?)\s*```', result_text, re.DOTALL)
             if json_match:
@@ -11,11 +11,15 @@ PMark1 AI Assistant - 추천 엔진
 - LLM을 활용한 작업명/상세 생성 기능 포함
 """
 
-from openai import OpenAI
 from typing import List, Dict, Optional
 from ..models import ParsedInput, Recommendation
 from ..database import db_manager
 from ..config import Config
+from ..llm_gateway import llm_gateway
+from .work_details_cache import work_details_cache
+from .batch_scorer import batch_scorer
+from ..vector_db import embedding_index, notification_text
+import asyncio
 import logging
 
 class RecommendationEngine:
@@ -28,34 +32,45 @@ class RecommendationEngine:
     
     연계 파일:
     - models.py: ParsedInput, Recommendation 모델 사용
-    - database.py: search_similar_notifications() 호출
+    - database.py: resolve_search_terms(), query_notifications() 호출 (단계별 후보 수집)
+    - vector_db.py: 임베딩 코사인 유사도 후보 (의미 유사 단계)
     - logic/normalizer.py: 이미 정규화된 입력 사용
     
     담당자 수정 가이드:
     - 추천 알고리즘 개선 시 get_recommendations() 메서드 수정
+    - 후보 수집 단계/완화 순서 변경 시 _retrieve_candidates(), RELAXATION_ORDER 수정
     - 유사도 점수 임계값 조정으로 추천 품질 제어
     - 새로운 추천 기준 추가 가능
     """
     
+    # 후보 수집 시 조건 완화 순서 (가중치가 낮은 필드부터 누적 제외)
+    RELAXATION_ORDER = (
+        ("priority",),
+        ("priority", "status_code"),
+        ("priority", "status_code", "location"),
+    )
+    
     def __init__(self):
         """
         추천 엔진 초기화
         
         설정:
-        - OpenAI 클라이언트 초기화
+        - 비동기 LLM 게이트웨이 연결
         - 로깅 설정
         """
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.llm = llm_gateway
         self.model = Config.OPENAI_MODEL
         self.logger = logging.getLogger(__name__)
     
-    def get_recommendations(self, parsed_input: ParsedInput, limit: int = 5) -> List[Recommendation]:
+    async def get_recommendations(self, parsed_input: ParsedInput, limit: int = 5,
+                                  generate_work_details: bool = True) -> List[Recommendation]:
         """
         파싱된 입력을 기반으로 추천 목록 생성
         
         Args:
             parsed_input: 파싱된 사용자 입력
             limit: 반환할 최대 추천 수
+            generate_work_details: False면 작업명/상세 생성 없이 순위 목록만 즉시 반환 (지연 모드)
             
         Returns:
             추천 항목 리스트 (유사도 점수 순으로 정렬)
@@ -84,45 +99,35 @@ class RecommendationEngine:
                 self.logger.info("추천 조건 미충족: 위치, 설비유형, 현상코드가 모두 필요합니다.")
                 return []
             
-            # 데이터베이스에서 유사한 알림 검색
-            similar_notifications = db_manager.search_similar_notifications(
-                equip_type=parsed_input.equipment_type,
-                location=parsed_input.location,
-                status_code=parsed_input.status_code,
-                priority=parsed_input.priority,
-                limit=limit * 2  # 더 많은 결과를 가져와서 필터링
+            # 데이터베이스에서 유사한 알림 검색 (단계별 후보 수집, 넓은 후보군을 일괄 점수로 순위화)
+            similar_notifications = await self._retrieve_candidates(
+                parsed_input, max(Config.RECOMMENDATION_CANDIDATE_POOL, limit * 2), min_candidates=limit
             )
             
             if not similar_notifications:
                 self.logger.warning("유사한 알림을 찾을 수 없습니다.")
                 return []
             
-            # 유사도 점수 계산 및 추천 항목 생성 (LLM 호출 최소화)
-            recommendations = []
-            for notification in similar_notifications:
-                # 간단한 문자열 매칭 기반 유사도 점수 계산 (LLM 호출 없음)
-                score = self._calculate_simple_similarity_score(
-                    parsed_input, notification
-                )
-                
-                # 유사도 점수가 임계값 이상인 경우만 추천 (임계값을 낮춰서 더 많은 추천 제공)
-                if score > 0.2:  # 0.3에서 0.2로 낮춤
-                    recommendation = Recommendation(
-                        itemno=notification['itemno'],
-                        process=notification['process'],
-                        location=notification['location'],
-                        cost_center=notification.get('cost_center'),
-                        equipType=notification['equipType'],
-                        statusCode=notification['statusCode'],
-                        priority=notification['priority'],
-                        score=score,
-                        work_title=notification.get('work_title'),
-                        work_details=notification.get('work_details')
-                    )
-                    recommendations.append(recommendation)
+            # 후보 전체 유사도 점수 일괄 계산 후 정렬 (LLM 호출 없음, batch_scorer.py)
+            # 유사도 점수가 임계값 이상인 경우만 추천 (임계값을 낮춰서 더 많은 추천 제공)
+            ranked = batch_scorer.rank(parsed_input, similar_notifications, min_score=0.2)
             
-            # 유사도 점수 순으로 정렬
-            recommendations.sort(key=lambda x: x.score, reverse=True)
+            # 순위화는 넓은 후보군에서 하되, 결과 건수 구간 판단은 기존과 같은 후보 수(limit * 2) 기준
+            recommendations = [
+                Recommendation(
+                    itemno=notification['itemno'],
+                    process=notification['process'],
+                    location=notification['location'],
+                    cost_center=notification.get('cost_center'),
+                    equipType=notification['equipType'],
+                    statusCode=notification['statusCode'],
+                    priority=notification['priority'],
+                    score=score,
+                    work_title=notification.get('work_title'),
+                    work_details=notification.get('work_details')
+                )
+                for notification, score in ranked[:limit * 2]
+            ]
             
             # 요구사항에 따른 결과 처리
             total_count = len(recommendations)
@@ -144,13 +149,10 @@ class RecommendationEngine:
                 top_recommendations = recommendations[:15]
                 self.logger.warning(f"15개 이상 ({total_count}개): 아이템 넘버 입력 요청 필요")
             
-            # LLM을 사용하여 작업명과 상세 생성 (없는 경우)
-            for rec in top_recommendations:
-                if not rec.work_title or not rec.work_details:
-                    work_info = self._generate_work_details(rec, parsed_input)
-                    if work_info:
-                        rec.work_title = work_info.get('work_title', rec.work_title)
-                        rec.work_details = work_info.get('work_details', rec.work_details)
+            # LLM을 사용하여 작업명과 상세 생성 (없는 경우, 동시 실행)
+            # 지연 모드에서는 생략하고 선택 시 또는 스트림으로 생성 (work_details.py)
+            if generate_work_details:
+                await self._fill_work_details(top_recommendations, parsed_input)
             
             self.logger.info(f"추천 목록 생성 완료: {len(top_recommendations)} 건")
             return top_recommendations
@@ -159,7 +161,144 @@ class RecommendationEngine:
             self.logger.error(f"추천 생성 오류: {e}")
             return []
     
-    def _generate_work_details(self, recommendation: Recommendation, parsed_input: ParsedInput) -> Optional[Dict]:
+    async def _retrieve_candidates(self, parsed_input: ParsedInput, pool_size: int,
+                                   min_candidates: int = 1) -> List[Dict]:
+        """
+        단계별 후보 수집 (정확 일치 → 부분 일치 → 조건 완화 → 의미 유사 → 유사 후보)
+        
+        Args:
+            parsed_input: 파싱된 입력 (정규화 완료 필드는 재정규화 생략)
+            pool_size: 최대 후보 수
+            min_candidates: 1~2단계 후보가 이보다 적을 때만 3~5단계(대체 단계) 수행
+            
+        Returns:
+            rowid 기준으로 중복 제거된 후보 목록 (앞 단계 후보가 먼저)
+            
+        처리 과정:
+        1. 모든 필드가 사전 값과 정확히 일치하는 이력 (복합 인덱스 탐색)
+        2. 모든 필드 부분 일치 (기존 검색 조건)
+        3. RELAXATION_ORDER 순서로 가중치가 낮은 필드부터 조건에서 제외
+        4. 임베딩 코사인 유사도 상위 EMBEDDING_TOP_K개 (vector_db.py, 인덱스 사용 가능 시)
+        5. 하나라도 일치하는 이력 중 RETRIEVAL_FUZZY_POOL_SIZE개 (FTS/코드 인덱스)
+        
+        각 단계 쿼리는 작업 스레드에서 실행되어 이벤트 루프를 막지 않습니다.
+        단계별 쿼리는 RETRIEVAL_STAGE_BUDGET_MS, 전체 수집은 RETRIEVAL_PIPELINE_BUDGET_MS를 넘지 않도록
+        남은 시간만큼만 실행되고, 전체 시간이 다 되거나 후보가 pool_size만큼 모이면 이후 단계는 생략합니다.
+        모든 단계의 후보는 호출 측에서 한 번에 점수 계산/정렬합니다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + Config.RETRIEVAL_PIPELINE_BUDGET_MS / 1000
+        terms = await db_manager.resolve_search_terms(
+            equip_type=parsed_input.equipment_type,
+            location=parsed_input.location,
+            status_code=parsed_input.status_code,
+            priority=parsed_input.priority,
+            normalized_terms=parsed_input.normalized_terms
+        )
+        
+        def sql_stage(stage_terms: Dict, **options):
+            # SQLite 조회는 동기 호출이므로 작업 스레드에서 실행 (제한 시간 초과 시 쿼리 자체가 중단됨)
+            return lambda remaining, budget_ms: asyncio.to_thread(
+                db_manager.query_notifications, **stage_terms, limit=remaining, budget_ms=budget_ms, **options
+            )
+        
+        # (단계명, 조회 함수, 단계 최대 건수, 대체 단계 여부)
+        stages = [("정확 일치", sql_stage(terms, exact=True), pool_size, False),
+                  ("부분 일치", sql_stage(terms), pool_size, False)]
+        for relaxed_fields in self.RELAXATION_ORDER:
+            relaxed_terms = dict(terms, **{field: None for field in relaxed_fields})
+            if any(relaxed_terms.values()) and relaxed_terms != terms:
+                stages.append((f"조건 완화({', '.join(relaxed_fields)})", sql_stage(relaxed_terms), pool_size, True))
+        if embedding_index.available:
+            stages.append(("의미 유사",
+                           lambda remaining, budget_ms: self._semantic_candidates(parsed_input, remaining, budget_ms),
+                           Config.EMBEDDING_TOP_K, True))
+        stages.append(("유사 후보", sql_stage(terms, match_all=False), Config.RETRIEVAL_FUZZY_POOL_SIZE, True))
+        
+        candidates: Dict[int, Dict] = {}
+        for stage_name, fetch, stage_limit, fallback in stages:
+            if len(candidates) >= pool_size or (fallback and len(candidates) >= min_candidates):
+                break
+            remaining_ms = (deadline - loop.time()) * 1000
+            if remaining_ms <= 0:
+                self.logger.warning(f"후보 수집 시간 초과 ({Config.RETRIEVAL_PIPELINE_BUDGET_MS:.0f} ms), "
+                                    f"[{stage_name}] 단계부터 생략")
+                break
+            rows = await fetch(min(pool_size - len(candidates), stage_limit),
+                               min(Config.RETRIEVAL_STAGE_BUDGET_MS, remaining_ms))
+            before = len(candidates)
+            for row in rows:
+                candidates.setdefault(row["rowid"], row)
+            self.logger.info(f"후보 수집 [{stage_name}]: 조회 {len(rows)} 건, 신규 {len(candidates) - before} 건")
+        
+        return list(candidates.values())
+    
+    async def _semantic_candidates(self, parsed_input: ParsedInput, top_k: int,
+                                   budget_ms: float = None) -> List[Dict]:
+        """
+        임베딩 인덱스에서 입력 문장과 코사인 유사도가 높은 이력 조회
+        
+        입력의 위치/설비유형/현상코드를 이력 임베딩과 같은 형식의 문장으로 만들어 검색하므로,
+        사전에 없는 표현(동의어, 오타)도 의미가 가까운 이력을 후보로 가져올 수 있습니다.
+        다른 단계와 같이 budget_ms(기본 RETRIEVAL_STAGE_BUDGET_MS)를 넘으면 빈 목록을 반환합니다
+        (작업 스레드의 검색은 끝까지 실행되지만 결과는 버림).
+        """
+        budget_ms = Config.RETRIEVAL_STAGE_BUDGET_MS if budget_ms is None else budget_ms
+        query = notification_text(None, parsed_input.location, parsed_input.equipment_type, parsed_input.status_code)
+        try:
+            # 문장 임베딩은 CPU 연산이므로 작업 스레드에서 실행
+            hits = await asyncio.wait_for(
+                asyncio.to_thread(embedding_index.search, query, top_k),
+                timeout=budget_ms / 1000
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(f"의미 유사 검색 시간 초과 ({budget_ms:.0f} ms), 단계 생략")
+            return []
+        return await asyncio.to_thread(db_manager.get_notifications_by_rowids, [rowid for rowid, _ in hits])
+    
+    async def _fill_work_details(self, recommendations: List[Recommendation], parsed_input: ParsedInput):
+        """
+        작업명/상세가 없는 추천 항목들을 동시에 생성하여 채움
+        
+        Args:
+            recommendations: 추천 항목 목록 (제자리에서 갱신)
+            parsed_input: 원본 파싱된 입력
+            
+        연계 파일:
+        - config.py: WORK_DETAILS_CONCURRENCY (동시 호출 수), WORK_DETAILS_TIMEOUT_SECONDS (호출당 제한 시간)
+        
+        담당자 수정 가이드:
+        - 제한 시간 초과/실패 항목은 이력의 작업명/상세를 그대로 유지 (항목별로 예외를 잡아 목록 전체를 막지 않음)
+        - 제한 시간은 세마포어 대기 시간을 제외한 실제 호출 시간에만 적용
+        """
+        targets = [rec for rec in recommendations if not rec.work_title or not rec.work_details]
+        if not targets:
+            return
+        
+        semaphore = asyncio.Semaphore(max(1, Config.WORK_DETAILS_CONCURRENCY))
+        
+        async def generate(rec: Recommendation) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._generate_work_details(rec, parsed_input),
+                        timeout=Config.WORK_DETAILS_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"작업상세 생성 시간 초과: {rec.itemno} (이력 작업명 유지)")
+                    return None
+                except Exception as e:
+                    self.logger.error(f"작업상세 생성 실패: {rec.itemno} (이력 작업명 유지): {e}")
+                    return None
+        
+        results = await asyncio.gather(*(generate(rec) for rec in targets))
+        for rec, work_info in zip(targets, results):
+            if work_info:
+                rec.work_title = work_info.get('work_title', rec.work_title)
+                rec.work_details = work_info.get('work_details', rec.work_details)
+                rec.work_details_cache_hit = work_info.get('cache_hit', False)
+    
+    async def _generate_work_details(self, recommendation: Recommendation, parsed_input: ParsedInput) -> Optional[Dict]:
         """
         LLM을 사용하여 작업명과 상세 생성
         
@@ -168,10 +307,10 @@ class RecommendationEngine:
             parsed_input: 원본 파싱된 입력
             
         Returns:
-            생성된 작업명과 상세 (없으면 None)
+            생성된 작업명과 상세 (없으면 None, 캐시 적중 시 cache_hit=True 포함)
             
         사용처:
-        - get_recommendations()에서 작업명/상세가 없는 추천 항목에 대해 호출
+        - _fill_work_details()에서 작업명/상세가 없는 추천 항목에 대해 동시 호출
         - work_details.py: generate_work_details()에서도 유사한 로직 사용
         
         담당자 수정 가이드:
@@ -180,22 +319,29 @@ class RecommendationEngine:
         - 특정 설비유형별 맞춤 프롬프트 사용 가능
         """
         try:
+            # 같은 (설비유형, 현상코드, 위치, 우선순위) 조합은 캐시된 결과 재사용
+            # (SQLite 조회/사용 시각 갱신이 이벤트 루프를 막지 않도록 작업 스레드에서 실행)
+            cached = await asyncio.to_thread(work_details_cache.get, recommendation)
+            if cached:
+                return dict(cached, cache_hit=True)
+            
             prompt = self._create_work_details_prompt(recommendation, parsed_input)
             
-            response = self.client.chat.completions.create(
-                model=self.model,
+            result_text = await self.llm.complete(
                 messages=[
                     {"role": "system", "content": "당신은 설비관리 시스템의 작업명과 상세 생성 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,  # 적당한 창의성
-                max_tokens=300
+                max_tokens=300,
+                model=self.model
             )
             
-            result_text = response.choices[0].message.content.strip()
-            
             # 응답 파싱
             work_info = self._parse_work_details_response(result_text)
+            if work_info and work_info.get('work_title') and work_info.get('work_details'):
+                await asyncio.to_thread(work_details_cache.put, recommendation,
+                                        work_info['work_title'], work_info['work_details'])
             return work_info
             
         except Exception as e:
@@ -350,162 +496,6 @@ class RecommendationEngine:
         """
         return [rec for rec in recommendations if rec.priority == priority]
     
-    def _calculate_simple_similarity_score(self, parsed_input: ParsedInput, notification: Dict) -> float:
-        """
-        개선된 유사도 점수 계산 (LLM 호출 없음)
-        
-        Args:
-            parsed_input: 파싱된 입력 데이터
-            notification: 데이터베이스 알림 데이터
-            
-        Returns:
-            유사도 점수 (0.0 ~ 1.0)
-            
-        담당자 수정 가이드:
-        - 매칭 로직 개선으로 정확도 향상 가능
-        - 가중치 조정으로 특정 필드 중요도 변경 가능
-        - 새로운 매칭 기준 추가 가능
-        """
-        score = 0.0
-        total_weight = 0.0
-        
-        # 설비유형 매칭 (가중치: 0.35)
-        if parsed_input.equipment_type and notification['equipType']:
-            equip_match = self._calculate_enhanced_string_similarity(
-                parsed_input.equipment_type.lower(), 
-                notification['equipType'].lower()
-            )
-            score += equip_match * 0.35
-            total_weight += 0.35
-        
-        # 위치/공정명 매칭 (가중치: 0.35)
-        # 사용자가 "공정명"으로 입력한 경우 DB의 "Location" 컬럼과 매칭
-        if parsed_input.location and notification['location']:
-            location_match = self._calculate_enhanced_string_similarity(
-                parsed_input.location.lower(), 
-                notification['location'].lower()
-            )
-            score += location_match * 0.35
-            total_weight += 0.35
-        
-        # 현상코드 매칭 (가중치: 0.2)
-        if parsed_input.status_code and notification['statusCode']:
-            status_match = self._calculate_enhanced_string_similarity(
-                parsed_input.status_code.lower(), 
-                notification['statusCode'].lower()
-            )
-            score += status_match * 0.2
-            total_weight += 0.2
-        
-        # 우선순위 매칭 (가중치: 0.1)
-        if parsed_input.priority and notification['priority']:
-            priority_match = self._calculate_enhanced_string_similarity(
-                parsed_input.priority.lower(), 
-                notification['priority'].lower()
-            )
-            score += priority_match * 0.1
-            total_weight += 0.1
-        
-        # 가중 평균 계산
-        final_score = score / total_weight if total_weight > 0 else 0.0
-        
-        # 보너스 점수: 모든 필드가 매칭되는 경우
-        if (parsed_input.equipment_type and parsed_input.location and 
-            parsed_input.status_code and parsed_input.priority):
-            if (equip_match > 0.8 and location_match > 0.8 and 
-                status_match > 0.8 and priority_match > 0.8):
-                final_score = min(final_score + 0.1, 1.0)  # 최대 0.1점 보너스
-        
-        return final_score
-    
-    def _calculate_enhanced_string_similarity(self, str1: str, str2: str) -> float:
-        """
-        개선된 문자열 유사도 계산
-        
-        Args:
-            str1: 첫 번째 문자열
-            str2: 두 번째 문자열
-            
-        Returns:
-            유사도 점수 (0.0 ~ 1.0)
-        """
-        if not str1 or not str2:
-            return 0.0
-        
-        # 정확한 매칭
-        if str1 == str2:
-            return 1.0
-        
-        # 부분 매칭 (포함 관계)
-        if str1 in str2 or str2 in str1:
-            # 포함된 문자열의 길이 비율에 따라 점수 조정
-            shorter = min(len(str1), len(str2))
-            longer = max(len(str1), len(str2))
-            ratio = shorter / longer
-            return 0.7 + (ratio * 0.2)  # 0.7 ~ 0.9 범위
-        
-        # 공통 단어 수 계산
-        words1 = set(str1.split())
-        words2 = set(str2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        common_words = words1.intersection(words2)
-        total_words = words1.union(words2)
-        
-        word_similarity = len(common_words) / len(total_words) if total_words else 0.0
-        
-        # 문자 단위 유사도 계산 (Levenshtein 거리 기반)
-        char_similarity = self._calculate_character_similarity(str1, str2)
-        
-        # 단어 유사도와 문자 유사도의 가중 평균
-        return (word_similarity * 0.7) + (char_similarity * 0.3)
-    
-    def _calculate_character_similarity(self, str1: str, str2: str) -> float:
-        """
-        문자 단위 유사도 계산 (간단한 Levenshtein 거리 기반)
-        
-        Args:
-            str1: 첫 번째 문자열
-            str2: 두 번째 문자열
-            
-        Returns:
-            유사도 점수 (0.0 ~ 1.0)
-        """
-        if not str1 or not str2:
-            return 0.0
-        
-        # 간단한 편집 거리 계산
-        len1, len2 = len(str1), len(str2)
-        
-        # 동적 프로그래밍 테이블
-        dp = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-        
-        # 초기화
-        for i in range(len1 + 1):
-            dp[i][0] = i
-        for j in range(len2 + 1):
-            dp[0][j] = j
-        
-        # 편집 거리 계산
-        for i in range(1, len1 + 1):
-            for j in range(1, len2 + 1):
-                if str1[i-1] == str2[j-1]:
-                    dp[i][j] = dp[i-1][j-1]
-                else:
-                    dp[i][j] = min(dp[i-1][j], dp[i][j-1], dp[i-1][j-1]) + 1
-        
-        # 유사도 점수 계산 (편집 거리를 유사도로 변환)
-        max_len = max(len1, len2)
-        if max_len == 0:
-            return 1.0
-        
-        distance = dp[len1][len2]
-        similarity = 1.0 - (distance / max_len)
-        
-        return max(0.0, similarity)
-    
     def get_recommendation_statistics(self, recommendations: List[Recommendation]) -> Dict:
         """
         추천 항목 통계 정보 생성
@@ -0,0 +1,229 @@
+"""
+PMark2 AI Assistant - 로컬 용어 해석기
+
+이 파일은 LLM을 호출하기 전에 결정적으로 처리할 수 있는 용어를 로컬에서 정규화합니다.
+표준 용어 정확 일치, 대소문자/공백 변형, [VEDR] 같은 설비유형 코드, 한영 별칭 사전을 지원합니다.
+
+주요 담당자: 백엔드 개발자, AI/ML 엔지니어
+수정 시 주의사항:
+- TERM_ALIASES는 현장에서 자주 쓰이는 구어체 표현의 유지보수 대상 사전입니다
+- parser.py의 프롬프트에 들어가는 설비유형 키워드 매핑도 이 사전에서 생성됩니다
+- 모호한 입력(여러 표준 용어에 해당)은 해석하지 않고 LLM에 넘깁니다
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from ..config import Config
+
+# 한국어/영어 별칭 사전 (카테고리 → 표준 용어 → 별칭 목록)
+# 별칭의 대소문자와 공백은 비교 시 무시됩니다
+TERM_ALIASES: Dict[str, Dict[str, List[str]]] = {
+    "equipment": {
+        "Pressure Vessel": ["압력베젤", "베젤", "베셀", "vessel", "pressure vessel", "압력용기"],
+        "Pump": ["펌프", "pump"],
+        "Heat Exchanger": ["열교환", "열교환기", "heat exchanger"],
+        "Storage Tank": ["탱크", "tank", "저장탱크"],
+        "Motor Operated Valve": ["밸브", "valve", "모터밸브", "모터 밸브", "MOV"],
+        "Control Valve": ["컨트롤밸브", "제어밸브", "control valve"],
+        "Conveyor": ["컨베이어", "conveyor"],
+        "Filter": ["필터", "filter"],
+        "Reactor": ["반응기", "reactor"],
+        "Compressor": ["압축기", "compressor"],
+        "Fan": ["팬", "fan"],
+        "Blower": ["블로워", "blower"],
+    },
+    "location": {
+        "No.1 PE": ["1PE", "1 PE", "No1 PE", "1번 PE"],
+        "No.2 PE": ["2PE", "2 PE", "No2 PE", "2번 PE"],
+        "석유제품배합/저장": ["석유제품배합", "석유제품 저장", "석유제품배합저장"],
+        "공통 시설": ["공통시설"],
+    },
+    "status": {
+        "누설": ["누출", "leak", "리크"],
+        "작동불량": ["작동 안됨", "작동안됨", "오작동"],
+        "소음": ["noise"],
+        "진동": ["vibration"],
+    },
+    "priority": {
+        "긴급작업(최우선순위)": ["긴급", "긴급작업", "최우선", "emergency", "urgent", "긴급하게", "즉시", "바로"],
+        "우선작업(Deadline준수)": ["우선", "우선작업", "priority", "high", "우선적으로", "먼저", "중요"],
+        "일반작업(Deadline없음)": ["일반", "일반작업", "normal", "regular", "보통", "평상시", "정상"],
+        "주기작업(TA.PM)": ["주기", "주기작업", "TA", "PM", "정기", "정기적", "주기적", "점검"],
+    },
+}
+
+# 해석 방식별 신뢰도
+EXACT_CONFIDENCE = 1.0
+VARIANT_CONFIDENCE = 0.98
+CODE_CONFIDENCE = 0.95
+ALIAS_CONFIDENCE = 0.9
+
+_BRACKET_CODE_PATTERN = re.compile(r'\[([A-Za-z0-9]+)\]\s*(.*)')
+
+
+def fold_term(term: str) -> str:
+    """비교용 키 생성 (소문자화, 모든 공백 제거)"""
+    return re.sub(r'\s+', '', term).lower()
+
+
+def format_alias_rules(category: str) -> str:
+    """
+    별칭 사전을 프롬프트용 매핑 규칙 문자열로 변환
+
+    사용처:
+    - parser.py: _create_scenario_1_context_prompt()의 설비유형 키워드 매핑
+    """
+    lines = []
+    for standard_term, aliases in TERM_ALIASES.get(category, {}).items():
+        quoted = ", ".join(f'"{alias}"' for alias in aliases)
+        lines.append(f'- {quoted} → "{standard_term}"')
+    return "\n".join(lines)
+
+
+class _VocabularyIndex:
+    """카테고리별 어휘 조회 인덱스 (모호한 키는 None으로 표시)"""
+
+    def __init__(self, vocabulary: list):
+        self.exact: Dict[str, str] = {}
+        self.folded: Dict[str, Optional[str]] = {}
+        self.codes: Dict[str, Optional[str]] = {}
+        self.names: Dict[str, Optional[str]] = {}
+        self.entries: List[str] = []
+
+        for item in vocabulary:
+            if isinstance(item, tuple):
+                # status_codes 테이블 (code, description, category): 설명도 코드로 해석
+                entry = item[0]
+                if not entry:
+                    continue
+                if len(item) > 1 and item[1]:
+                    self._add(self.names, fold_term(str(item[1])), entry)
+            else:
+                entry = item
+                if not entry:
+                    continue
+            entry = str(entry)
+            self.entries.append(entry)
+            self.exact[entry.strip()] = entry
+            self._add(self.folded, fold_term(entry), entry)
+
+            # [VEDR]Pressure Vessel/ Drum → 코드(VEDR), 이름(Pressure Vessel, Drum)
+            match = _BRACKET_CODE_PATTERN.match(entry.strip())
+            if match:
+                code, name = match.group(1), match.group(2)
+                self._add(self.codes, code.lower(), entry)
+                self._add(self.names, fold_term(name), entry)
+                for part in name.split("/"):
+                    if part.strip():
+                        self._add(self.names, fold_term(part), entry)
+
+    @staticmethod
+    def _add(table: Dict[str, Optional[str]], key: str, entry: str):
+        """키 등록 (서로 다른 표준 용어가 같은 키를 가지면 모호함으로 표시)"""
+        if not key:
+            return
+        if key in table and table[key] != entry:
+            table[key] = None
+        else:
+            table[key] = entry
+
+    def lookup(self, term: str) -> Optional[Tuple[str, float]]:
+        """별칭을 제외한 어휘 조회 (정확 일치 → 변형 → 코드 → 이름 순서)"""
+        stripped = term.strip()
+        if stripped in self.exact:
+            return self.exact[stripped], EXACT_CONFIDENCE
+
+        key = fold_term(stripped)
+        if self.folded.get(key):
+            return self.folded[key], VARIANT_CONFIDENCE
+
+        code_match = re.fullmatch(r'\[?([A-Za-z0-9]+)\]?', stripped)
+        if code_match and self.codes.get(code_match.group(1).lower()):
+            return self.codes[code_match.group(1).lower()], CODE_CONFIDENCE
+
+        if self.names.get(key):
+            return self.names[key], CODE_CONFIDENCE
+
+        return None
+
+    def contains_fragment(self, term: str) -> bool:
+        """어휘 중 하나라도 term을 포함하는지 (LIKE 검색으로 매칭 가능한지) 확인"""
+        lowered = term.lower()
+        return any(lowered in entry.lower() for entry in self.entries)
+
+
+class LocalTermResolver:
+    """
+    로컬 결정적 용어 해석기
+
+    사용처:
+    - normalizer.py: normalize_term()에서 LLM 호출 전 먼저 시도
+
+    연계 파일:
+    - config.py: LOCAL_NORMALIZATION_MIN_CONFIDENCE (이 값 이상일 때만 LLM 생략)
+    - parser.py: format_alias_rules()로 프롬프트 매핑 생성
+
+    담당자 수정 가이드:
+    - 새로운 구어체 표현은 TERM_ALIASES에 추가
+    - 어휘 인덱스는 (카테고리, 어휘 버전)별로 한 번만 생성
+    """
+
+    def __init__(self, aliases: Dict[str, Dict[str, List[str]]] = None, min_confidence: float = None):
+        self.aliases = aliases if aliases is not None else TERM_ALIASES
+        self.min_confidence = (min_confidence if min_confidence is not None
+                               else Config.LOCAL_NORMALIZATION_MIN_CONFIDENCE)
+        self._alias_keys: Dict[str, Dict[str, str]] = {
+            category: {fold_term(alias): standard for standard, alias_list in table.items() for alias in alias_list}
+            for category, table in self.aliases.items()
+        }
+        self._indexes: Dict[str, Tuple[str, _VocabularyIndex]] = {}
+        self._lock = threading.Lock()
+
+    def _get_index(self, category: str, vocabulary: list, vocab_version: str) -> _VocabularyIndex:
+        """(카테고리, 어휘 버전)별 인덱스 조회 또는 생성"""
+        with self._lock:
+            cached = self._indexes.get(category)
+            if cached and cached[0] == vocab_version:
+                return cached[1]
+        index = _VocabularyIndex(vocabulary)
+        with self._lock:
+            self._indexes[category] = (vocab_version, index)
+        return index
+
+    def resolve(self, term: str, category: str, vocabulary: list, vocab_version: str = "") -> Optional[Tuple[str, float]]:
+        """
+        로컬 규칙으로 용어 해석
+
+        Args:
+            term: 정규화할 용어
+            category: 용어 카테고리
+            vocabulary: 표준 용어 목록 (DB 용어 + standard_terms)
+            vocab_version: 어휘 버전 (인덱스 재사용 키)
+
+        Returns:
+            (표준용어, 신뢰도) 또는 None (신뢰도가 낮아 LLM이 필요한 경우)
+
+        예시:
+        - resolve("[VEDR]", "equipment", ...) → ("[VEDR]Pressure Vessel/ Drum", 0.95)
+        - resolve("압력베젤", "equipment", ...) → ("[VEDR]Pressure Vessel/ Drum", 0.9)
+        """
+        if not term or not term.strip():
+            return None
+
+        index = self._get_index(category, vocabulary, vocab_version)
+        result = index.lookup(term)
+
+        if result is None:
+            standard = self._alias_keys.get(category, {}).get(fold_term(term))
+            if standard:
+                target = index.lookup(standard)
+                if target:
+                    result = target[0], ALIAS_CONFIDENCE
+                elif not index.entries or index.contains_fragment(standard):
+                    # 어휘에 포함된 부분 표현이면 LIKE 검색으로 매칭 가능
+                    result = standard, ALIAS_CONFIDENCE
+
+        if result and result[1] >= self.min_confidence:
+            return result
+        return None
@@ -0,0 +1,135 @@
+"""
+PMark2 AI Assistant - 어휘 스냅샷 서비스
+
+이 파일은 정규화에 사용하는 표준 어휘(위치, 설비유형, 현상코드, 우선순위)를
+DB에서 한 번만 읽어 메모리에 보관하고, 버전이 붙은 불변 스냅샷으로 제공합니다.
+
+주요 담당자: 백엔드 개발자
+수정 시 주의사항:
+- 스냅샷은 database.py의 load_excel_data()가 끝날 때 refresh()로 갱신됩니다
+- 스냅샷의 목록은 tuple(불변)이므로 호출 측에서 수정하지 않습니다
+- version은 내용 해시이므로 재시작 후에도 같은 데이터면 같은 버전입니다 (정규화 캐시 키로 사용)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import logging
+from typing import Tuple
+from ..config import Config
+from ..db_connection import get_connection_manager
+
+
+class VocabularySnapshot:
+    """
+    표준 어휘 불변 스냅샷
+
+    속성:
+    - locations: notification_history의 DISTINCT location
+    - equipment_types: equipment_types.type_name (없으면 notification_history.equipType)
+    - status_codes: status_codes의 (code, description, category) (없으면 notification_history.statusCode)
+    - priorities: notification_history의 DISTINCT priority
+    - version: 전체 내용 해시
+    """
+
+    __slots__ = ("locations", "equipment_types", "status_codes", "priorities", "version")
+
+    def __init__(self, locations: Tuple = (), equipment_types: Tuple = (),
+                 status_codes: Tuple = (), priorities: Tuple = ()):
+        object.__setattr__(self, "locations", tuple(locations))
+        object.__setattr__(self, "equipment_types", tuple(equipment_types))
+        object.__setattr__(self, "status_codes", tuple(status_codes))
+        object.__setattr__(self, "priorities", tuple(priorities))
+        content = repr((self.locations, self.equipment_types, self.status_codes, self.priorities))
+        object.__setattr__(self, "version", hashlib.sha1(content.encode("utf-8")).hexdigest()[:16])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("VocabularySnapshot은 수정할 수 없습니다.")
+
+    def terms_for(self, category: str) -> Tuple:
+        """카테고리별 어휘 반환 (normalizer.py의 카테고리명 사용)"""
+        return {
+            "equipment": self.equipment_types,
+            "location": self.locations,
+            "status": self.status_codes,
+            "priority": self.priorities,
+        }.get(category, ())
+
+
+class VocabularyService:
+    """
+    어휘 스냅샷 서비스
+
+    사용처:
+    - normalizer.py: _get_db_terms()에서 DISTINCT 조회 대신 스냅샷 사용
+    - database.py: load_excel_data() 완료 후 refresh() 호출
+
+    담당자 수정 가이드:
+    - 첫 get_snapshot() 호출 시 한 번만 로드 (이후 refresh() 전까지 재사용)
+    - 새로운 어휘 카테고리 추가 시 VocabularySnapshot과 _load()를 함께 수정
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.SQLITE_DB_PATH
+        self.logger = logging.getLogger(__name__)
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def get_snapshot(self) -> VocabularySnapshot:
+        """현재 스냅샷 반환 (없으면 DB에서 로드)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load()
+                snapshot = self._snapshot
+        return snapshot
+
+    def refresh(self) -> VocabularySnapshot:
+        """DB에서 어휘를 다시 읽어 스냅샷 교체 (데이터 재적재 후 호출)"""
+        snapshot = self._load()
+        with self._lock:
+            previous = self._snapshot
+            self._snapshot = snapshot
+        if previous is None or previous.version != snapshot.version:
+            self.logger.info(f"어휘 스냅샷 갱신: 버전 {snapshot.version}")
+        return snapshot
+
+    def _load(self) -> VocabularySnapshot:
+        """DB에서 DISTINCT 어휘 조회 (현재 스레드의 읽기 연결 사용)"""
+        try:
+            conn = get_connection_manager(self.db_path).reader()
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"어휘 로드 실패: {e}")
+            return VocabularySnapshot()
+
+        # 설비유형 자료에서 먼저 확인 (없으면 notification_history에서 추출)
+        equipment_types = self._distinct(conn, "SELECT DISTINCT type_name FROM equipment_types")
+        if equipment_types is None:
+            equipment_types = self._distinct(conn, "SELECT DISTINCT equipType FROM notification_history") or []
+
+        # Location 컬럼에서 추출 (Cost Center가 아님)
+        locations = self._distinct(conn, "SELECT DISTINCT location FROM notification_history") or []
+
+        # 현상코드: code, description, category 모두 보관
+        try:
+            cursor = conn.execute("SELECT code, description, category FROM status_codes")
+            status_codes = [(row[0], row[1], row[2]) for row in cursor.fetchall() if row[0]]
+        except sqlite3.OperationalError:
+            status_codes = self._distinct(conn, "SELECT DISTINCT statusCode FROM notification_history") or []
+
+        priorities = self._distinct(conn, "SELECT DISTINCT priority FROM notification_history") or []
+
+        return VocabularySnapshot(locations, equipment_types, status_codes, priorities)
+
+    @staticmethod
+    def _distinct(conn: sqlite3.Connection, query: str):
+        """단일 컬럼 DISTINCT 조회 (테이블이 없으면 None)"""
+        try:
+            return [row[0] for row in conn.execute(query).fetchall() if row[0]]
+        except sqlite3.OperationalError:
+            return None
+
+
+# 전역 어휘 서비스 인스턴스
+vocabulary_service = VocabularyService()
@@ -0,0 +1,288 @@
+"""
+PMark2 AI Assistant - 작업명/상세 생성 캐시
+
+이 파일은 LLM이 생성한 작업명/상세를 (설비유형, 현상코드, 위치, 우선순위) 조합별로 재사용하기 위한
+2단계 캐시를 제공합니다. 1단계는 프로세스 내부의 크기 제한 LRU 캐시, 2단계는 SQLite 영구 캐시입니다.
+
+주요 담당자: 백엔드 개발자, AI/ML 엔지니어
+수정 시 주의사항:
+- 캐시 키는 프롬프트 종류와 정규화된 (equipType, statusCode, location, priority)의 sha1 해시입니다
+- 작업상세 API는 사용자 메시지에 맞춘 프롬프트를 쓰므로 메시지 해시를 항상 키에 포함하고,
+  추천 엔진(일반 프롬프트)과는 키 공간을 분리합니다 (다른 사용자 메시지용 결과가 적중하지 않도록)
+- TTL이 지난 항목은 조회 시 무시되고, 영구 캐시는 최대 항목 수를 넘으면 오래 사용되지 않은 순으로 제거됩니다
+- 메모리 적중도 영구 캐시의 last_used_at에 반영합니다 (모아 두었다가 TOUCH_FLUSH_SECONDS마다 또는 저장 시 일괄 갱신)
+- TTL이 지난 영구 캐시 항목은 main.py의 주기 정리 작업이 purge_expired()로 삭제합니다
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from ..config import Config
+from ..db_connection import get_connection_manager
+
+
+class WorkDetailsCache:
+    """
+    작업명/상세 2단계 캐시 (메모리 LRU + SQLite)
+
+    사용처:
+    - recommender.py: _generate_work_details()에서 LLM 호출 전 조회, 호출 후 저장
+    - api/work_details.py: _generate_work_details_with_llm()에서 동일하게 사용
+
+    연계 파일:
+    - config.py: WORK_DETAILS_CACHE_SIZE, WORK_DETAILS_CACHE_MAX_ENTRIES, WORK_DETAILS_CACHE_TTL_HOURS 설정
+
+    담당자 수정 가이드:
+    - 적중 여부는 Recommendation.work_details_cache_hit, WorkDetailsResponse.cache_hit로 응답에 표시
+    - SQLite 조회/저장이 포함되므로 비동기 코드에서는 asyncio.to_thread로 호출
+    - 통계(get_stats)는 /api/v1/work-details-cache-stats에서 조회 가능
+    - 자주 쓰이는 항목은 메모리에서만 적중하므로, 적중 시각을 _pending_touches에 모아 영구 캐시에 반영해야
+      _evict_overflow()가 가장 많이 쓰이는 항목을 먼저 지우지 않음
+    """
+
+    TABLE_NAME = "work_details_cache"
+    # 메모리 적중 시각을 영구 캐시 last_used_at에 일괄 반영하는 최소 간격 (초)
+    TOUCH_FLUSH_SECONDS = 60
+    # 프롬프트 종류별 키 공간 (추천 엔진의 일반 프롬프트 / 작업상세 API의 메시지 맞춤 프롬프트)
+    SCOPE_RECOMMENDATION = "recommendation"
+    SCOPE_REQUEST = "request"
+
+    def __init__(self, db_path: str = None, max_size: int = None, max_entries: int = None,
+                 ttl_hours: float = None):
+        """
+        작업상세 캐시 초기화
+
+        설정:
+        - 메모리 LRU 저장소 (OrderedDict)
+        - SQLite 캐시 테이블 생성
+        - 적중/미스 카운터 초기화
+        """
+        self.db_path = db_path or Config.SQLITE_DB_PATH
+        self.max_size = max_size if max_size is not None else Config.WORK_DETAILS_CACHE_SIZE
+        self.max_entries = max_entries if max_entries is not None else Config.WORK_DETAILS_CACHE_MAX_ENTRIES
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else Config.WORK_DETAILS_CACHE_TTL_HOURS) * 3600
+        self.logger = logging.getLogger(__name__)
+
+        self._memory: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        # 아직 영구 캐시에 반영하지 않은 메모리 적중 (캐시 키 → 마지막 적중 시각)
+        self._pending_touches: Dict[str, float] = {}
+        self._last_touch_flush = time.time()
+        self._connections = None
+        self._initialize_table()
+
+    def _initialize_table(self):
+        """캐시 테이블 생성 (실패 시 메모리 캐시만 사용)"""
+        try:
+            self._connections = get_connection_manager(self.db_path)
+            with self._connections.writer() as conn:
+                conn.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                        cache_key TEXT PRIMARY KEY,
+                        equip_type TEXT,
+                        status_code TEXT,
+                        location TEXT,
+                        priority TEXT,
+                        work_title TEXT NOT NULL,
+                        work_details TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_used_at REAL NOT NULL
+                    )
+                ''')
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE_NAME}_last_used ON {self.TABLE_NAME}(last_used_at)"
+                )
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"작업상세 캐시 테이블 생성 실패, 메모리 캐시만 사용: {e}")
+            self._connections = None
+
+    @staticmethod
+    def _canonicalize(value: Optional[str]) -> str:
+        """키 구성 요소 정규화 (앞뒤 공백 제거, 연속 공백 축약, 소문자화)"""
+        return re.sub(r'\s+', ' ', (value or "").strip()).lower()
+
+    def make_key(self, equip_type: str, status_code: str, location: str, priority: str,
+                 user_message: str = None) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            user_message: 작업상세 API의 사용자 메시지 (None이면 추천 엔진의 일반 프롬프트 키)
+
+        Returns:
+            (프롬프트 종류, 정규화된 설비유형/현상코드/위치/우선순위[, 메시지 해시])의 sha1 해시
+        """
+        scope = self.SCOPE_RECOMMENDATION if user_message is None else self.SCOPE_REQUEST
+        parts = [scope] + [self._canonicalize(value) for value in (equip_type, status_code, location, priority)]
+        if user_message is not None:
+            parts.append(hashlib.sha1(self._canonicalize(user_message).encode("utf-8")).hexdigest())
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, recommendation, user_message: str = None) -> Optional[Dict[str, str]]:
+        """
+        캐시 조회
+
+        Args:
+            recommendation: equipType, statusCode, location, priority 속성을 가진 추천 항목
+            user_message: 작업상세 API의 사용자 원본 메시지 (추천 엔진은 None, 메시지별로 별도 키)
+
+        Returns:
+            {"work_title", "work_details"} 또는 None (캐시 미스)
+        """
+        key = self.make_key(recommendation.equipType, recommendation.statusCode,
+                            recommendation.location, recommendation.priority, user_message)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                work_title, work_details, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    self._pending_touches[key] = now
+                    if now - self._last_touch_flush >= self.TOUCH_FLUSH_SECONDS:
+                        self._flush_touches()
+                    return {"work_title": work_title, "work_details": work_details}
+                del self._memory[key]
+
+            if self._connections is not None:
+                try:
+                    row = self._connections.reader().execute(
+                        f"SELECT work_title, work_details, created_at FROM {self.TABLE_NAME} WHERE cache_key = ?",
+                        (key,)
+                    ).fetchone()
+                    if row and now - row[2] <= self.ttl_seconds:
+                        with self._connections.writer() as conn:
+                            conn.execute(
+                                f"UPDATE {self.TABLE_NAME} SET last_used_at = ? WHERE cache_key = ?", (now, key)
+                            )
+                except sqlite3.Error as e:
+                    self.logger.warning(f"작업상세 캐시 조회 오류: {e}")
+                    row = None
+                if row and now - row[2] <= self.ttl_seconds:
+                    self._remember(key, (row[0], row[1], row[2]))
+                    self._stats["db_hits"] += 1
+                    return {"work_title": row[0], "work_details": row[1]}
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, recommendation, work_title: str, work_details: str, user_message: str = None):
+        """
+        생성 결과 저장 (메모리 + SQLite, 최대 항목 수 초과 시 제거)
+
+        Args:
+            recommendation: equipType, statusCode, location, priority 속성을 가진 추천 항목
+            work_title: 생성된 작업명
+            work_details: 생성된 작업상세
+            user_message: 작업상세 API의 사용자 원본 메시지 (추천 엔진은 None)
+        """
+        key = self.make_key(recommendation.equipType, recommendation.statusCode,
+                            recommendation.location, recommendation.priority, user_message)
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, (work_title, work_details, created_at))
+            self._stats["stores"] += 1
+            if self._connections is not None:
+                try:
+                    with self._connections.writer() as conn:
+                        conn.execute(
+                            f"INSERT OR REPLACE INTO {self.TABLE_NAME} "
+                            "(cache_key, equip_type, status_code, location, priority, "
+                            "work_title, work_details, created_at, last_used_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (key, recommendation.equipType, recommendation.statusCode, recommendation.location,
+                             recommendation.priority, work_title, work_details, created_at, created_at)
+                        )
+                        # 메모리 적중 시각을 먼저 반영해야 제거 순서가 실제 사용 순서와 맞음
+                        self._flush_touches(conn)
+                        self._evict_overflow(conn)
+                except sqlite3.Error as e:
+                    self.logger.warning(f"작업상세 캐시 저장 오류: {e}")
+
+    def _evict_overflow(self, conn: sqlite3.Connection):
+        """영구 캐시가 최대 항목 수를 넘으면 오래 사용되지 않은 항목 제거 (호출자가 lock과 쓰기 연결 보유)"""
+        count = conn.execute(f"SELECT COUNT(*) FROM {self.TABLE_NAME}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            cursor = conn.execute(
+                f"DELETE FROM {self.TABLE_NAME} WHERE cache_key IN "
+                f"(SELECT cache_key FROM {self.TABLE_NAME} ORDER BY last_used_at ASC LIMIT ?)",
+                (overflow,)
+            )
+            self._stats["evictions"] += cursor.rowcount
+
+    def _flush_touches(self, conn: sqlite3.Connection = None):
+        """모아 둔 메모리 적중 시각을 영구 캐시 last_used_at에 일괄 반영 (호출자가 lock 보유)"""
+        self._last_touch_flush = time.time()
+        if not self._pending_touches or self._connections is None:
+            self._pending_touches.clear()
+            return
+        touches = [(used_at, key) for key, used_at in self._pending_touches.items()]
+        self._pending_touches.clear()
+        try:
+            if conn is not None:
+                conn.executemany(f"UPDATE {self.TABLE_NAME} SET last_used_at = ? WHERE cache_key = ?", touches)
+            else:
+                with self._connections.writer() as writer:
+                    writer.executemany(f"UPDATE {self.TABLE_NAME} SET last_used_at = ? WHERE cache_key = ?", touches)
+        except sqlite3.Error as e:
+            self.logger.warning(f"작업상세 캐시 사용 시각 갱신 오류: {e}")
+
+    def _remember(self, key: str, value: Tuple[str, str, float]):
+        """메모리 LRU에 저장 (크기 초과 시 가장 오래된 항목 제거, 호출자가 lock 보유)"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """
+        TTL이 지난 영구 캐시 항목 삭제
+
+        Returns:
+            삭제된 항목 수
+        """
+        if self._connections is None:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            try:
+                with self._connections.writer() as conn:
+                    self._flush_touches(conn)
+                    cursor = conn.execute(f"DELETE FROM {self.TABLE_NAME} WHERE created_at < ?", (cutoff,))
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                self.logger.warning(f"작업상세 캐시 정리 오류: {e}")
+                return 0
+
+    def clear(self):
+        """메모리 캐시 비우기 (영구 캐시는 유지)"""
+        with self._lock:
+            self._memory.clear()
+
+    def get_stats(self) -> Dict:
+        """
+        캐시 통계 반환
+
+        Returns:
+            적중/미스/제거 카운터와 적중률, 메모리 캐시 크기
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# 전역 작업상세 캐시 인스턴스 (추천 엔진과 작업상세 API가 공유)
+work_details_cache = WorkDetailsCache()
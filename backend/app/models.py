@@ -46,6 +46,26 @@ class ChatRequest(BaseModel):
     message: str = Field(..., description="사용자 입력 메시지")
     conversation_history: List[ChatMessage] = Field(default=[], description="대화 히스토리")
     session_id: Optional[str] = Field(None, description="세션 ID (누적 정보 관리용)")
+    lazy_work_details: bool = Field(default=False, description="추천 목록을 먼저 반환하고 작업명/상세는 선택 시 또는 스트림으로 생성")
+
+class NormalizedTerm(BaseModel):
+    """
+    정규화 완료된 용어 모델
+    
+    사용처:
+    - parser.py: _normalize_extracted_terms()에서 정규화 결과 기록
+    - ParsedInput/AccumulatedClues.normalized_terms로 전달
+    - database.py: search_similar_notifications()에서 재정규화 생략 판단
+    
+    담당자 수정 가이드:
+    - value는 표준 용어 (DB 검색에 그대로 사용 가능한 값)
+    - original은 정규화 전 사용자 표현
+    - 필드 값이 value와 다르면 (사용자가 수정한 경우) 정규화되지 않은 것으로 간주
+    """
+    value: str = Field(..., description="표준 용어")
+    category: str = Field(..., description="용어 카테고리 (equipment/location/status/priority)")
+    confidence: float = Field(default=0.0, description="정규화 신뢰도")
+    original: Optional[str] = Field(None, description="정규화 전 원본 표현")
 
 class AccumulatedClues(BaseModel):
     """
@@ -72,6 +92,9 @@ class AccumulatedClues(BaseModel):
     status_code_confidence: float = Field(default=0.0, description="현상코드 신뢰도")
     priority_confidence: float = Field(default=0.0, description="우선순위 신뢰도")
     
+    # 정규화 완료된 필드 (필드명 → NormalizedTerm)
+    normalized_terms: Dict[str, NormalizedTerm] = Field(default={}, description="정규화 완료된 단서 항목들")
+    
     def merge_with(self, parsed_input: "ParsedInput") -> "AccumulatedClues":
         """
         새로운 ParsedInput과 기존 누적 정보를 병합
@@ -96,7 +119,8 @@ class AccumulatedClues(BaseModel):
             location_confidence=self.location_confidence,
             equipment_type_confidence=self.equipment_type_confidence,
             status_code_confidence=self.status_code_confidence,
-            priority_confidence=self.priority_confidence
+            priority_confidence=self.priority_confidence,
+            normalized_terms=dict(self.normalized_terms)
         )
         
         # 위치 정보 병합
@@ -106,6 +130,7 @@ class AccumulatedClues(BaseModel):
         ):
             merged.location = parsed_input.location
             merged.location_confidence = parsed_input.confidence
+            merged._carry_normalized_term("location", parsed_input)
             
         # 설비유형 병합
         if parsed_input.equipment_type and (
@@ -114,6 +139,7 @@ class AccumulatedClues(BaseModel):
         ):
             merged.equipment_type = parsed_input.equipment_type
             merged.equipment_type_confidence = parsed_input.confidence
+            merged._carry_normalized_term("equipment_type", parsed_input)
             
         # 현상코드 병합
         if parsed_input.status_code and (
@@ -122,6 +148,7 @@ class AccumulatedClues(BaseModel):
         ):
             merged.status_code = parsed_input.status_code
             merged.status_code_confidence = parsed_input.confidence
+            merged._carry_normalized_term("status_code", parsed_input)
             
         # 우선순위 병합 (기본값이 아닌 경우만)
         if parsed_input.priority and parsed_input.priority != "일반작업" and (
@@ -130,6 +157,7 @@ class AccumulatedClues(BaseModel):
         ):
             merged.priority = parsed_input.priority
             merged.priority_confidence = parsed_input.confidence
+            merged._carry_normalized_term("priority", parsed_input)
             
         # ITEMNO 병합 (시나리오 2용)
         if parsed_input.itemno:
@@ -137,6 +165,14 @@ class AccumulatedClues(BaseModel):
             
         return merged
     
+    def _carry_normalized_term(self, field: str, parsed_input: "ParsedInput"):
+        """병합으로 갱신된 필드의 정규화 정보를 함께 반영 (없으면 제거)"""
+        term = parsed_input.normalized_terms.get(field)
+        if term is not None and term.value == getattr(self, field):
+            self.normalized_terms[field] = term
+        else:
+            self.normalized_terms.pop(field, None)
+    
     def to_parsed_input(self, scenario: str = "S1") -> "ParsedInput":
         """
         누적된 단서를 ParsedInput 형태로 변환
@@ -165,7 +201,11 @@ class AccumulatedClues(BaseModel):
             status_code=self.status_code,
             priority=self.priority or "일반작업",
             itemno=self.itemno,
-            confidence=avg_confidence
+            confidence=avg_confidence,
+            normalized_terms={
+                field: term for field, term in self.normalized_terms.items()
+                if getattr(self, field, None) == term.value
+            }
         )
     
     def get_missing_fields(self) -> List[str]:
@@ -232,6 +272,7 @@ class ParsedInput(BaseModel):
     - confidence 필드는 LLM 응답의 신뢰도를 나타냄 (0.0~1.0)
     - missing_items는 시나리오 1에서 누락된 주요 3개 단서 항목 목록
     - needs_additional_input은 추가 입력이 필요한지 여부
+    - normalized_terms는 이미 표준 용어로 정규화된 필드 (database.py에서 재정규화 생략)
     """
     scenario: str = Field(..., description="시나리오 (S1/S2)")
     location: Optional[str] = Field(None, description="위치/공정")
@@ -242,6 +283,7 @@ class ParsedInput(BaseModel):
     confidence: float = Field(..., description="분석 신뢰도")
     missing_items: List[str] = Field(default=[], description="누락된 주요 단서 항목들 (location, equipment_type, status_code)")
     needs_additional_input: bool = Field(default=False, description="추가 입력 필요 여부")
+    normalized_terms: Dict[str, NormalizedTerm] = Field(default={}, description="정규화 완료된 필드 (DB 검색 시 재정규화 생략)")
 
 class Recommendation(BaseModel):
     """
@@ -274,6 +316,7 @@ class Recommendation(BaseModel):
     score: float = Field(..., description="유사도 점수")
     work_title: Optional[str] = Field(None, description="작업명")
     work_details: Optional[str] = Field(None, description="작업상세")
+    work_details_cache_hit: bool = Field(default=False, description="작업명/상세를 생성 캐시에서 가져왔는지 여부")
 
 class ChatResponse(BaseModel):
     """
@@ -316,6 +359,22 @@ class WorkDetailsRequest(BaseModel):
     selected_recommendation: Recommendation = Field(..., description="선택된 추천 항목")
     user_message: str = Field(..., description="사용자 원본 메시지")
 
+class WorkDetailsBatchRequest(BaseModel):
+    """
+    작업상세 일괄 스트리밍 생성 요청 모델
+    
+    사용처:
+    - work_details.py: POST /api/v1/generate-work-details/stream
+    
+    연계 파일:
+    - chat.py: lazy_work_details=True로 받은 추천 목록을 그대로 전달
+    
+    담당자 수정 가이드:
+    - 작업명/상세가 이미 있는 항목도 요청 시 새로 생성하여 전송
+    """
+    recommendations: List[Recommendation] = Field(..., description="작업상세를 생성할 추천 항목들")
+    user_message: str = Field(..., description="사용자 원본 메시지")
+
 class WorkDetailsResponse(BaseModel):
     """
     작업상세 생성 응답 모델
@@ -334,6 +393,7 @@ class WorkDetailsResponse(BaseModel):
     """
     work_title: str = Field(..., description="생성된 작업명")
     work_details: str = Field(..., description="생성된 작업상세")
+    cache_hit: bool = Field(default=False, description="생성 캐시 적중 여부")
 
 class FinalizeRequest(BaseModel):
     """
@@ -6,15 +6,23 @@ PMark2.5 AI Assistant - 세션 상태 관리자
 
 주요 담당자: 백엔드 개발자, AI/ML 엔지니어
 수정 시 주의사항:
-- 메모리 기반 저장이므로 서버 재시작 시 세션 초기화
-- 향후 Redis 등 영구 저장소로 확장 가능
-- 세션 타임아웃 관리로 메모리 누수 방지 필요
+- 세션은 session_store.py의 저장소(Config.SESSION_BACKEND: memory/sqlite/redis)에 보관
+- memory 저장소는 서버 재시작 시 세션 초기화, 여러 워커 사용 시 sqlite/redis 저장소 필요
+- 세션을 수정하는 메서드는 수정 직후 저장소에 save() (다른 워커가 다음 턴을 이어받을 수 있도록)
+- 만료 시각은 최소 힙으로 추적하며, main.py 시작 시 실행되는 run_sweeper()가 주기적으로 purge_expired() 호출
+- MAX_SESSIONS를 넘으면 가장 오래 갱신되지 않은 세션부터 삭제 (LRU)
+  memory 저장소는 저장 즉시 힙으로, 공유 저장소(sqlite/redis)는 주기 정리 때 저장소 기준으로 삭제
 """
 
 import uuid
+import heapq
+import asyncio
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+from .config import Config
 from .models import SessionState, AccumulatedClues, ParsedInput, ChatMessage
+from .session_store import SessionStore, create_session_store
 import logging
 
 class SessionManager:
@@ -25,24 +33,95 @@ class SessionManager:
     - chat.py: 세션 기반 컨텍스트 유지
     - parser.py: 누적된 단서 항목 활용
     
+    연계 파일:
+    - session_store.py: 세션 저장소 (memory/sqlite/redis)
+    - config.py: SESSION_BACKEND, SESSION_TIMEOUT_MINUTES, MAX_SESSIONS, SESSION_SWEEP_INTERVAL_SECONDS
+    - main.py: 시작 시 run_sweeper() 백그라운드 실행
+    
     담당자 수정 가이드:
-    - _sessions는 메모리 기반 저장 (향후 DB 확장 가능)
+    - _store는 설정에 따라 생성되며, 테스트 시 저장소를 주입 가능
+    - 공개 메서드는 저장소(SQLite/Redis)를 동기 호출하므로 비동기 핸들러에서는 asyncio.to_thread로 호출 (chat.py)
     - SESSION_TIMEOUT으로 오래된 세션 정리
+    - _expiry_heap은 (만료 시각, 세션 ID, 추적 시점 last_updated) 최소 힙, _deadlines는 세션별 현재 만료 시각
+      세션이 갱신되면 새 항목만 추가하고 이전 항목은 꺼낼 때 _deadlines와 비교해 버림 (지연 삭제)
+    - 만료 시각은 마지막 갱신 시각 순서와 같으므로 힙의 최솟값이 곧 LRU 세션
+    - 공유 저장소(sqlite/redis)에서는 이 워커가 생성/갱신한 세션만 힙으로 추적하고,
+      다른 워커의 세션은 저장소 자체 정리(purge_expired, Redis 만료 시간)로 처리
+    - 공유 저장소의 세션은 다른 워커가 이어서 갱신할 수 있으므로 힙 만료 시에도
+      delete_if_unchanged()로 이 워커가 본 last_updated 이후 갱신이 없을 때만 삭제하고,
+      최대 세션 수는 힙이 아닌 저장소 전체 기준(evict_oldest)으로 적용
     - 세션 상태별 다른 처리 로직 추가 가능
     """
     
-    def __init__(self):
+    def __init__(self, store: SessionStore = None):
         """
         세션 매니저 초기화
         
         설정:
-        - 메모리 기반 세션 저장소
-        - 세션 타임아웃 설정 (30분)
+        - 세션 저장소 (주입하지 않으면 Config.SESSION_BACKEND에 따라 생성)
+        - 세션 타임아웃 설정 (기본 30분)
         - 로깅 설정
         """
-        self._sessions: Dict[str, SessionState] = {}
-        self.SESSION_TIMEOUT = timedelta(minutes=30)  # 30분 타임아웃
+        self._store = store if store is not None else create_session_store()
+        self.SESSION_TIMEOUT = timedelta(minutes=Config.SESSION_TIMEOUT_MINUTES)
+        self.COMPLETED_SESSION_TIMEOUT = timedelta(minutes=5)  # 완료된 세션 유지 시간
+        self.max_sessions = Config.MAX_SESSIONS
         self.logger = logging.getLogger(__name__)
+        self.logger.info(f"세션 저장소: {self._store.backend_name}")
+        
+        self._expiry_heap: List[Tuple[float, str, datetime]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._heap_lock = threading.Lock()
+        self._sweep_stats = {"expired": 0, "evicted": 0, "sweeps": 0}
+    
+    def _save(self, session: SessionState):
+        """세션 저장 (저장소 자체 만료는 타임아웃과 동일하게 설정) 후 만료 시각 갱신"""
+        self._store.save(session, ttl_seconds=self.SESSION_TIMEOUT.total_seconds())
+        self._track(session)
+    
+    def _deadline(self, session: SessionState) -> float:
+        """세션 만료 시각 (완료된 세션은 COMPLETED_SESSION_TIMEOUT 적용)"""
+        timeout = self.COMPLETED_SESSION_TIMEOUT if session.session_status == "completed" else self.SESSION_TIMEOUT
+        return (session.last_updated + timeout).timestamp()
+    
+    def _track(self, session: SessionState):
+        """
+        만료 힙에 세션 등록 (이전 항목은 지연 삭제)
+        
+        memory 저장소는 힙이 전체 세션을 추적하므로 최대 세션 수 초과 시 바로 LRU 삭제합니다.
+        공유 저장소는 이 워커의 세션만 보이므로 purge_expired()에서 저장소 기준으로 삭제합니다.
+        """
+        deadline = self._deadline(session)
+        with self._heap_lock:
+            self._deadlines[session.session_id] = deadline
+            heapq.heappush(self._expiry_heap, (deadline, session.session_id, session.last_updated))
+            # 갱신이 반복되어 버릴 항목이 쌓이면 힙 재구성 (유효 항목만 남김)
+            if len(self._expiry_heap) > 2 * len(self._deadlines) + 64:
+                self._expiry_heap = [entry for entry in self._expiry_heap
+                                     if self._deadlines.get(entry[1]) == entry[0]]
+                heapq.heapify(self._expiry_heap)
+            evicted = []
+            while not self._store.shared and self.max_sessions > 0 and len(self._deadlines) > self.max_sessions:
+                evicted.append(self._pop_oldest())
+        
+        for session_id in evicted:
+            self._store.delete(session_id)
+            self._sweep_stats["evicted"] += 1
+            self.logger.info(f"최대 세션 수 초과로 삭제: {session_id}")
+    
+    def _untrack(self, session_id: str):
+        """만료 힙 추적 해제 (힙 항목은 꺼낼 때 버림)"""
+        with self._heap_lock:
+            self._deadlines.pop(session_id, None)
+    
+    def _pop_oldest(self) -> Optional[str]:
+        """만료 시각이 가장 이른 유효 세션 ID를 힙에서 꺼냄 (호출자가 lock 보유, 없으면 None)"""
+        while self._expiry_heap:
+            deadline, session_id, _ = heapq.heappop(self._expiry_heap)
+            if self._deadlines.get(session_id) == deadline:
+                del self._deadlines[session_id]
+                return session_id
+        return None
         
     def create_session(self) -> str:
         """
@@ -67,7 +146,7 @@ class SessionManager:
             turn_count=0
         )
         
-        self._sessions[session_id] = session_state
+        self._save(session_state)
         self.logger.info(f"새 세션 생성: {session_id}")
         
         return session_id
@@ -86,15 +165,15 @@ class SessionManager:
         - 타임아웃된 세션은 자동 삭제
         - 존재하지 않는 세션은 None 반환
         """
-        if session_id not in self._sessions:
+        session = self._store.get(session_id)
+        if session is None:
             return None
-            
-        session = self._sessions[session_id]
         
-        # 타임아웃 체크
+        # 타임아웃 체크 (조회 직후 다른 워커가 갱신했다면 삭제하지 않음)
         if datetime.now() - session.last_updated > self.SESSION_TIMEOUT:
             self.logger.info(f"세션 타임아웃으로 삭제: {session_id}")
-            del self._sessions[session_id]
+            self._store.delete_if_unchanged(session_id, session.last_updated)
+            self._untrack(session_id)
             return None
             
         return session
@@ -117,13 +196,18 @@ class SessionManager:
         2. 세션 상태 업데이트 (collecting_info/recommending)
         3. 턴 카운트 증가
         4. 마지막 업데이트 시간 갱신
+        5. 저장소에 저장
+        
+        주의사항:
+        - 조회 후 전체 덮어쓰기(last-writer-wins)이므로 같은 세션에 동시 요청이 오면
+          먼저 끝난 요청의 병합 결과는 나중 요청의 저장으로 덮어써짐 (session_store.py 참고)
         """
         session = self.get_session(session_id)
         if not session:
             # 세션이 없으면 새로 생성
             self.logger.info(f"세션 없음. 새 세션 생성: {session_id}")
             session_id = self.create_session()
-            session = self._sessions[session_id]
+            session = self._store.get(session_id)
         
         # 기존 누적 단서 로그
         self.logger.info(f"기존 누적 단서 - 위치: {session.accumulated_clues.location}, 설비: {session.accumulated_clues.equipment_type}, 현상: {session.accumulated_clues.status_code}")
@@ -145,6 +229,7 @@ class SessionManager:
         session.session_status = new_status
         session.turn_count += 1
         session.last_updated = datetime.now()
+        self._save(session)
         
         self.logger.info(f"세션 업데이트 완료: {session_id}, 상태: {new_status}, 턴: {session.turn_count}")
         
@@ -187,45 +272,79 @@ class SessionManager:
         Returns:
             삭제 성공 여부
         """
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        self._untrack(session_id)
+        if self._store.delete(session_id):
             self.logger.info(f"세션 삭제: {session_id}")
             return True
         return False
     
-    def cleanup_expired_sessions(self):
+    def purge_expired(self) -> int:
         """
-        만료된 세션들 정리
+        만료된 세션들 정리 (만료 힙에서 기한이 지난 항목만 꺼냄, O(k log n))
         
         정리 대상:
         - 타임아웃된 세션들
         - 완료 후 5분 경과한 세션들
+        - 공유 저장소의 다른 워커 세션 중 타임아웃된 것 (저장소 purge_expired)
+        - 공유 저장소의 최대 세션 수 초과분 (저장소 evict_oldest)
+        
+        힙에서 만료된 세션은 이 워커가 본 last_updated 이후 다른 워커의 갱신이 없을 때만 삭제합니다.
+        
+        Returns:
+            삭제한 세션 수 (초과 삭제 제외)
         
         사용처:
-        - 주기적 호출 (cron job 등)
-        - 메모리 사용량 관리
+        - run_sweeper(): 주기적 호출
         """
-        current_time = datetime.now()
+        now = datetime.now()
         expired_sessions = []
+        with self._heap_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now.timestamp():
+                deadline, session_id, last_updated = heapq.heappop(self._expiry_heap)
+                if self._deadlines.get(session_id) == deadline:
+                    del self._deadlines[session_id]
+                    expired_sessions.append((session_id, last_updated))
         
-        for session_id, session in self._sessions.items():
-            # 일반 타임아웃 체크
-            if current_time - session.last_updated > self.SESSION_TIMEOUT:
-                expired_sessions.append(session_id)
-                continue
-                
-            # 완료된 세션 중 5분 경과한 것들
-            if (session.session_status == "completed" and 
-                current_time - session.last_updated > timedelta(minutes=5)):
-                expired_sessions.append(session_id)
-        
-        # 만료된 세션들 삭제
-        for session_id in expired_sessions:
-            del self._sessions[session_id]
-            self.logger.info(f"만료된 세션 삭제: {session_id}")
-            
-        if expired_sessions:
-            self.logger.info(f"총 {len(expired_sessions)}개 세션 정리 완료")
+        # 만료된 세션들 삭제 (다른 워커가 이어서 갱신한 세션은 유지)
+        purged = 0
+        for session_id, last_updated in expired_sessions:
+            if self._store.delete_if_unchanged(session_id, last_updated):
+                purged += 1
+                self.logger.info(f"만료된 세션 삭제: {session_id}")
+        
+        purged += self._store.purge_expired(now - self.SESSION_TIMEOUT)
+        
+        if self._store.shared and self.max_sessions > 0:
+            for session_id in self._store.evict_oldest(self.max_sessions):
+                self._untrack(session_id)
+                self._sweep_stats["evicted"] += 1
+                self.logger.info(f"최대 세션 수 초과로 삭제: {session_id}")
+        
+        self._sweep_stats["expired"] += purged
+        self._sweep_stats["sweeps"] += 1
+        if purged:
+            self.logger.info(f"총 {purged}개 세션 정리 완료")
+        return purged
+    
+    def cleanup_expired_sessions(self):
+        """만료된 세션들 정리 (purge_expired()와 동일, 기존 호출 호환용)"""
+        self.purge_expired()
+    
+    async def run_sweeper(self, interval_seconds: float = None):
+        """
+        만료 세션 주기 정리 루프 (main.py 시작 시 백그라운드 작업으로 실행, 종료 시 취소)
+        
+        Args:
+            interval_seconds: 정리 주기 (기본 Config.SESSION_SWEEP_INTERVAL_SECONDS)
+        """
+        interval_seconds = interval_seconds or Config.SESSION_SWEEP_INTERVAL_SECONDS
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                # 공유 저장소 정리는 DB/네트워크 호출이므로 작업 스레드에서 실행
+                await asyncio.to_thread(self.purge_expired)
+            except Exception as e:
+                self.logger.error(f"세션 정리 오류: {e}")
     
     def get_session_stats(self) -> Dict:
         """
@@ -238,21 +357,26 @@ class SessionManager:
         - 시스템 모니터링
         - 성능 분석
         """
+        sessions = self._store.list_sessions()
         stats = {
-            "total_sessions": len(self._sessions),
+            "total_sessions": len(sessions),
             "status_breakdown": {},
-            "avg_turn_count": 0
+            "avg_turn_count": 0,
+            "backend": self._store.backend_name,
+            "tracked_sessions": len(self._deadlines),
+            "max_sessions": self.max_sessions,
+            **self._sweep_stats
         }
         
-        if self._sessions:
+        if sessions:
             # 상태별 세션 수
-            for session in self._sessions.values():
+            for session in sessions:
                 status = session.session_status
                 stats["status_breakdown"][status] = stats["status_breakdown"].get(status, 0) + 1
             
             # 평균 턴 수
-            total_turns = sum(session.turn_count for session in self._sessions.values())
-            stats["avg_turn_count"] = total_turns / len(self._sessions)
+            total_turns = sum(session.turn_count for session in sessions)
+            stats["avg_turn_count"] = total_turns / len(sessions)
         
         return stats
 
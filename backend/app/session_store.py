@@ -0,0 +1,329 @@
+"""
+PMark2 AI Assistant - 세션 저장소
+
+이 파일은 SessionManager가 세션 상태를 보관하는 저장소 구현을 제공합니다.
+여러 uvicorn 워커가 같은 세션을 이어서 처리할 수 있도록 SQLite 공유 파일이나 Redis 저장소를 선택할 수 있습니다.
+
+주요 담당자: 백엔드 개발자
+수정 시 주의사항:
+- 저장소 선택은 Config.SESSION_BACKEND (memory/sqlite/redis)
+- memory는 프로세스 내부 dict이므로 워커 간 공유되지 않습니다 (단일 워커 개발 환경용)
+- sqlite/redis는 세션을 model_dump_json(exclude_defaults=True)로 직렬화합니다 (기본값 필드 생략)
+- 저장소에서 꺼낸 세션을 수정한 뒤에는 반드시 save()를 호출해야 다른 워커에 반영됩니다
+- save()는 세션 전체를 덮어쓰는 last-writer-wins입니다 (버전/CAS 확인 없음)
+  같은 세션의 두 요청이 동시에 처리되면 나중에 저장한 쪽의 단서만 남습니다.
+  한 사용자의 대화는 턴 단위로 순차 요청되므로 이 동작을 허용합니다
+- 테스트: tests/test_session_store.py (redis는 tests/fake_redis.py의 가짜 클라이언트 사용)
+- redis 패키지는 선택 사항이며, 설치되지 않았으면 memory 저장소로 대체합니다
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from .config import Config
+from .db_connection import get_connection_manager
+from .models import SessionState
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+
+def serialize_session(session: SessionState) -> str:
+    """세션 상태를 간결한 JSON으로 직렬화 (기본값 필드 생략)"""
+    return session.model_dump_json(exclude_defaults=True)
+
+
+def deserialize_session(payload) -> SessionState:
+    """직렬화된 세션 상태 복원 (bytes/str 모두 허용)"""
+    return SessionState.model_validate_json(payload)
+
+
+class SessionStore:
+    """
+    세션 저장소 인터페이스
+
+    사용처:
+    - session_manager.py: SessionManager의 세션 조회/저장/삭제
+
+    담당자 수정 가이드:
+    - 새 저장소는 get/save/delete/list_sessions를 구현
+    - ttl_seconds는 저장소 자체 만료를 지원하는 경우(Redis)에만 사용하고, 타임아웃 판단은 SessionManager가 담당
+    - shared=True인 저장소는 여러 워커가 같은 세션을 갱신하므로, 만료/초과 삭제는
+      delete_if_unchanged()/evict_oldest()처럼 저장소에 기록된 last_updated를 기준으로 판단
+    """
+
+    backend_name = "base"
+    shared = False
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """세션 조회 (없으면 None)"""
+        raise NotImplementedError
+
+    def save(self, session: SessionState, ttl_seconds: float = None):
+        """세션 저장 (같은 ID가 있으면 덮어씀)"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        """세션 삭제 (삭제했으면 True)"""
+        raise NotImplementedError
+
+    def list_sessions(self) -> List[SessionState]:
+        """전체 세션 목록 (통계용)"""
+        raise NotImplementedError
+
+    def delete_if_unchanged(self, session_id: str, last_updated: datetime) -> bool:
+        """
+        저장된 세션의 last_updated가 주어진 시각 이하일 때만 삭제 (삭제했으면 True)
+
+        이 워커가 본 뒤 다른 워커가 갱신한 세션은 남겨 둡니다.
+        기본 구현은 조회 후 삭제이므로, 원자적 조건 삭제가 가능한 저장소는 재정의합니다.
+        """
+        session = self.get(session_id)
+        if session is None or session.last_updated > last_updated:
+            return False
+        return self.delete(session_id)
+
+    def evict_oldest(self, max_sessions: int) -> List[str]:
+        """
+        세션 수가 max_sessions를 넘으면 가장 오래 갱신되지 않은 세션부터 삭제 (삭제한 세션 ID 반환)
+
+        기본 구현은 전체 목록을 정렬하므로 주기 정리(run_sweeper)에서만 호출합니다.
+        """
+        sessions = self.list_sessions()
+        overflow = len(sessions) - max_sessions
+        if max_sessions <= 0 or overflow <= 0:
+            return []
+        oldest = sorted(sessions, key=lambda session: session.last_updated)[:overflow]
+        return [session.session_id for session in oldest
+                if self.delete_if_unchanged(session.session_id, session.last_updated)]
+
+    def purge_expired(self, cutoff: datetime) -> int:
+        """
+        cutoff 이전에 마지막으로 갱신된 세션 삭제 (삭제 수 반환)
+
+        SessionManager의 만료 힙이 추적하지 않는 세션(다른 워커가 만든 세션)을 정리합니다.
+        memory 저장소는 모든 세션이 힙으로 추적되고, Redis는 키 만료 시간으로 정리되므로 기본은 아무것도 하지 않습니다.
+        """
+        return 0
+
+    def __len__(self) -> int:
+        return len(self.list_sessions())
+
+
+class MemorySessionStore(SessionStore):
+    """
+    프로세스 내부 dict 저장소 (기존 동작, 워커 간 공유 없음)
+
+    세션 객체를 그대로 보관하므로 직렬화 비용이 없습니다.
+    """
+
+    backend_name = "memory"
+
+    def __init__(self):
+        self._sessions: Dict[str, SessionState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def save(self, session: SessionState, ttl_seconds: float = None):
+        with self._lock:
+            self._sessions[session.session_id] = session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def list_sessions(self) -> List[SessionState]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def delete_if_unchanged(self, session_id: str, last_updated: datetime) -> bool:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.last_updated > last_updated:
+                return False
+            del self._sessions[session_id]
+            return True
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite 공유 파일 저장소 (같은 서버의 여러 워커가 하나의 DB 파일 공유)
+
+    연계 파일:
+    - db_connection.py: WAL 모드 단일 쓰기 연결 + 스레드별 읽기 연결
+    - config.py: SESSION_SQLITE_PATH (비우면 SQLITE_DB_PATH와 같은 파일)
+    """
+
+    backend_name = "sqlite"
+    shared = True
+    TABLE_NAME = "sessions"
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.SESSION_SQLITE_PATH or Config.SQLITE_DB_PATH
+        self._connections = get_connection_manager(self.db_path)
+        with self._connections.writer() as conn:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                    session_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    last_updated TEXT NOT NULL
+                )
+            ''')
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE_NAME}_last_updated ON {self.TABLE_NAME}(last_updated)")
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        row = self._connections.reader().execute(
+            f"SELECT payload FROM {self.TABLE_NAME} WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return deserialize_session(row[0]) if row else None
+
+    def save(self, session: SessionState, ttl_seconds: float = None):
+        with self._connections.writer() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.TABLE_NAME} (session_id, payload, last_updated) VALUES (?, ?, ?)",
+                (session.session_id, serialize_session(session), self._timestamp(session.last_updated))
+            )
+
+    def delete(self, session_id: str) -> bool:
+        with self._connections.writer() as conn:
+            cursor = conn.execute(f"DELETE FROM {self.TABLE_NAME} WHERE session_id = ?", (session_id,))
+            return cursor.rowcount > 0
+
+    def list_sessions(self) -> List[SessionState]:
+        cursor = self._connections.reader().execute(f"SELECT payload FROM {self.TABLE_NAME}")
+        return [deserialize_session(row[0]) for row in cursor.fetchall()]
+
+    def delete_if_unchanged(self, session_id: str, last_updated: datetime) -> bool:
+        # 조건부 삭제 한 문장 (조회와 삭제 사이에 다른 워커가 갱신해도 안전)
+        with self._connections.writer() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM {self.TABLE_NAME} WHERE session_id = ? AND last_updated <= ?",
+                (session_id, self._timestamp(last_updated))
+            )
+            return cursor.rowcount > 0
+
+    def evict_oldest(self, max_sessions: int) -> List[str]:
+        if max_sessions <= 0:
+            return []
+        with self._connections.writer() as conn:
+            overflow = conn.execute(f"SELECT COUNT(*) FROM {self.TABLE_NAME}").fetchone()[0] - max_sessions
+            if overflow <= 0:
+                return []
+            # last_updated 인덱스 순서로 가장 오래된 세션 (쓰기 잠금 안이므로 조회-삭제 사이 갱신 없음)
+            session_ids = [row[0] for row in conn.execute(
+                f"SELECT session_id FROM {self.TABLE_NAME} ORDER BY last_updated LIMIT ?", (overflow,)
+            )]
+            conn.executemany(f"DELETE FROM {self.TABLE_NAME} WHERE session_id = ?",
+                             [(session_id,) for session_id in session_ids])
+            return session_ids
+
+    def purge_expired(self, cutoff: datetime) -> int:
+        # last_updated 인덱스 범위 삭제 (고정 자릿수 ISO 문자열이므로 문자열 비교 = 시간 비교)
+        with self._connections.writer() as conn:
+            cursor = conn.execute(f"DELETE FROM {self.TABLE_NAME} WHERE last_updated < ?", (self._timestamp(cutoff),))
+            return cursor.rowcount
+
+    @staticmethod
+    def _timestamp(value: datetime) -> str:
+        """정렬 가능한 고정 자릿수 시각 문자열"""
+        return value.isoformat(timespec="microseconds")
+
+    def __len__(self) -> int:
+        return self._connections.reader().execute(f"SELECT COUNT(*) FROM {self.TABLE_NAME}").fetchone()[0]
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis 저장소 (여러 서버의 워커가 세션 공유)
+
+    연계 파일:
+    - config.py: SESSION_REDIS_URL, SESSION_REDIS_PREFIX, SESSION_REDIS_TIMEOUT_SECONDS
+
+    담당자 수정 가이드:
+    - client에 redis.Redis 호환 객체(get/set/delete/scan_iter/mget)를 주입할 수 있음 (테스트: tests/fake_redis.py)
+    - 세션 키에 타임아웃만큼 만료 시간을 걸어 버려진 세션은 Redis가 정리
+    - 연결/명령 제한 시간을 걸어 Redis가 느리거나 끊겼을 때 호출 스레드가 무기한 대기하지 않음
+    - delete_if_unchanged()는 조회 후 삭제(기본 구현)이므로 그 사이 다른 워커의 갱신과 겹치면
+      갱신이 사라질 수 있음 (창이 짧고, 해당 세션은 다음 턴에 새로 생성됨)
+    """
+
+    backend_name = "redis"
+    shared = True
+
+    def __init__(self, client=None, url: str = None, prefix: str = None):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis 패키지가 설치되지 않았습니다")
+            client = redis.Redis.from_url(
+                url or Config.SESSION_REDIS_URL,
+                socket_timeout=Config.SESSION_REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=Config.SESSION_REDIS_TIMEOUT_SECONDS
+            )
+        self.client = client
+        self.prefix = prefix or Config.SESSION_REDIS_PREFIX
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def _keys(self) -> Iterable:
+        return self.client.scan_iter(match=f"{self.prefix}*")
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        payload = self.client.get(self._key(session_id))
+        return deserialize_session(payload) if payload else None
+
+    def save(self, session: SessionState, ttl_seconds: float = None):
+        expire = max(1, int(ttl_seconds)) if ttl_seconds else None
+        self.client.set(self._key(session.session_id), serialize_session(session), ex=expire)
+
+    def delete(self, session_id: str) -> bool:
+        return bool(self.client.delete(self._key(session_id)))
+
+    def list_sessions(self) -> List[SessionState]:
+        keys = list(self._keys())
+        if not keys:
+            return []
+        # 조회 사이에 만료된 키는 None
+        return [deserialize_session(payload) for payload in self.client.mget(keys) if payload]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._keys())
+
+
+def create_session_store(backend: str = None) -> SessionStore:
+    """
+    설정에 맞는 세션 저장소 생성
+
+    Args:
+        backend: memory/sqlite/redis (기본 Config.SESSION_BACKEND)
+
+    Returns:
+        세션 저장소 (redis/sqlite 생성 실패 시 memory 저장소)
+    """
+    backend = (backend or Config.SESSION_BACKEND).lower()
+    logger = logging.getLogger(__name__)
+    try:
+        if backend == "redis":
+            store = RedisSessionStore()
+            store.client.ping()  # 시작 시 연결 확인 (요청 처리 중 실패 방지)
+            return store
+        if backend == "sqlite":
+            return SQLiteSessionStore()
+    except Exception as e:
+        logger.warning(f"세션 저장소({backend}) 생성 실패, 메모리 저장소 사용: {e}")
+        return MemorySessionStore()
+
+    if backend != "memory":
+        logger.warning(f"알 수 없는 세션 저장소 설정: {backend}, 메모리 저장소 사용")
+    return MemorySessionStore()
@@ -0,0 +1,602 @@
+"""
+PMark2 AI Assistant - 작업요청 이력 임베딩 인덱스
+
+이 파일은 작업요청 이력(작업명/위치/설비유형/현상코드)을 CPU 임베딩 모델로 벡터화하여
+의미 기반 유사 이력을 찾기 위한 로컬 벡터 인덱스를 제공합니다.
+벡터는 VECTOR_DB_PATH 아래에 메모리 매핑 float32 행렬로 저장되어 재시작 후에도 재사용됩니다.
+벡터 수가 VECTOR_IVF_MIN_VECTORS 이상이면 IVF(역파일) 근사 검색으로 전환합니다.
+
+주요 담당자: AI/ML 엔지니어, 백엔드 개발자
+수정 시 주의사항:
+- sentence-transformers가 설치되지 않았으면 인덱스는 비활성화되고 검색 결과는 빈 목록입니다
+- sync()는 DB에 새로 생긴 행만 임베딩하고, DB에서 사라진 행은 인덱스에서 제외 표시합니다
+- 임베딩과 IVF 학습은 lock 밖에서 계산하고 결과 교체만 lock 안에서 하므로 search()가 오래 막히지 않습니다
+- 임베딩 모델(EMBEDDING_MODEL)이나 벡터 차원이 바뀌면 인덱스를 처음부터 다시 만듭니다
+- 이력 테이블을 새로 만들면(database_meta의 history_table_id 변경) rowid가 재사용되므로 인덱스를 다시 만듭니다
+- 벡터는 정규화되어 저장되므로 내적이 코사인 유사도입니다
+- IVF 중심점은 학습 시점 벡터 수의 IVF_RETRAIN_GROWTH배까지 늘어나면 다시 학습합니다
+  (그 사이 추가된 벡터는 가장 가까운 중심점 목록에 바로 추가)
+- 학습은 sync()와 add_rows_later()의 백그라운드 작업에서만 하며, 요청 처리 경로에서는 하지 않습니다
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .config import Config
+from .db_connection import get_connection_manager
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+
+def notification_text(work_title: Optional[str], location: Optional[str],
+                      equip_type: Optional[str], status_code: Optional[str]) -> str:
+    """임베딩할 이력 문장 (빈 필드 제외, ' | '로 연결)"""
+    return " | ".join(str(value).strip() for value in (work_title, location, equip_type, status_code)
+                      if value is not None and str(value).strip())
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+    """벡터별 내적이 가장 큰 중심점 번호 (큰 행렬 곱을 피하기 위해 구간별 계산)"""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(samples: np.ndarray, list_count: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    구면 k-means로 IVF 중심점 학습 (정규화된 중심점 반환)
+
+    빈 목록이 생기면 해당 중심점은 이전 위치를 유지합니다.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = samples[rng.choice(len(samples), list_count, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = nearest_centroids(samples, centroids)
+        counts = np.bincount(assignments, minlength=list_count)
+        nonempty = counts > 0
+        order = np.argsort(assignments, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        centroids[nonempty] = np.add.reduceat(samples[order], starts[nonempty], axis=0)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids /= np.where(norms > 0, norms, 1.0)
+    return centroids
+
+
+class EmbeddingIndex:
+    """
+    작업요청 이력 임베딩 인덱스 (메모리 매핑 float32 행렬 + 행 번호 → 이력 rowid 매핑 + IVF 목록)
+
+    사용처:
+    - main.py: 시작 시 백그라운드에서 sync() (데이터 적재 후 새 행만 임베딩)
+    - database.py: save_work_order()에서 add_rows_later()로 새 이력을 백그라운드 반영
+    - logic/recommender.py: _retrieve_candidates()의 의미 유사 단계에서 search()
+    - scripts/benchmark_vector_search.py: IVF와 전체 탐색의 재현율/지연 시간 비교 (add_vectors, search_vector)
+
+    연계 파일:
+    - config.py: EMBEDDING_ENABLED, EMBEDDING_MODEL, VECTOR_DB_PATH, EMBEDDING_BATCH_SIZE, EMBEDDING_TOP_K,
+      VECTOR_IVF_MIN_VECTORS, VECTOR_IVF_LISTS, VECTOR_IVF_NPROBE
+
+    담당자 수정 가이드:
+    - 테스트나 다른 임베딩 모델 사용 시 encoder(문장 목록 → 정규화된 2차원 배열)를 주입
+    - 저장 파일: meta.json(모델/차원/건수/IVF 정보/이력 테이블 식별자), vectors.f32(벡터), row_ids.i64(이력 rowid, 삭제 행은 -1),
+      lists.i32(벡터별 IVF 목록 번호), centroids.npy(IVF 중심점)
+    - 재현율이 부족하면 VECTOR_IVF_NPROBE를 늘림 (탐색 목록 수에 비례해 지연 시간 증가)
+    """
+
+    META_FILE = "meta.json"
+    VECTORS_FILE = "vectors.f32"
+    ROW_IDS_FILE = "row_ids.i64"
+    LISTS_FILE = "lists.i32"
+    CENTROIDS_FILE = "centroids.npy"
+    # 저장 공간이 부족하면 이 배수로 늘림
+    GROWTH_FACTOR = 2
+    MIN_CAPACITY = 1024
+    # IVF 학습 설정: 목록당 학습 표본 수, k-means 반복 수, 재학습 기준 증가 배수
+    IVF_SAMPLES_PER_LIST = 40
+    IVF_ITERATIONS = 10
+    IVF_RETRAIN_GROWTH = 2
+
+    def __init__(self, index_path: str = None, model_name: str = None, db_path: str = None,
+                 encoder: Callable[[List[str]], np.ndarray] = None, enabled: bool = None):
+        """
+        임베딩 인덱스 초기화 (모델과 저장 파일은 첫 사용 시 로드)
+
+        Args:
+            index_path: 인덱스 저장 디렉토리 (기본 Config.VECTOR_DB_PATH)
+            model_name: sentence-transformers 모델명 (기본 Config.EMBEDDING_MODEL)
+            db_path: 작업요청 이력 DB 경로
+            encoder: 문장 목록을 정규화된 벡터 배열로 바꾸는 함수 (없으면 sentence-transformers 사용)
+            enabled: 인덱스 사용 여부 (기본 Config.EMBEDDING_ENABLED)
+        """
+        self.index_path = index_path or Config.VECTOR_DB_PATH
+        self.model_name = model_name or Config.EMBEDDING_MODEL
+        self.db_path = db_path or Config.SQLITE_DB_PATH
+        self.enabled = enabled if enabled is not None else Config.EMBEDDING_ENABLED
+        self.logger = logging.getLogger(__name__)
+
+        self._encoder = encoder
+        self._model = None
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dim = 0
+        self._count = 0
+        self._capacity = 0
+        self._vectors: Optional[np.memmap] = None
+        self._row_ids: Optional[np.memmap] = None
+        self._list_ids: Optional[np.memmap] = None
+        # IVF: 중심점 (목록 수 x 차원), 목록별 벡터 위치, 학습 시점 벡터 수 (0이면 전체 탐색)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._trained_count = 0
+        # 인덱스를 만든 이력 테이블 식별자 (database_meta, None이면 확인하지 않음)
+        self._table_id: Optional[str] = None
+        # add_rows_later() 작업 스레드 (첫 사용 시 생성)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 종료 요청 (sync()가 배치 사이에 확인)
+        self._stopping = threading.Event()
+
+    @property
+    def available(self) -> bool:
+        """임베딩 사용 가능 여부 (설정 + 인코더/모델 설치 여부)"""
+        return self.enabled and (self._encoder is not None or SENTENCE_TRANSFORMERS_AVAILABLE)
+
+    @property
+    def uses_ivf(self) -> bool:
+        """IVF 근사 검색 사용 여부 (학습된 중심점이 있을 때)"""
+        return self._centroids is not None
+
+    def __len__(self) -> int:
+        """검색 대상(삭제되지 않은) 벡터 수"""
+        with self._lock:
+            if not self._loaded or self._count == 0:
+                return 0
+            return int(np.count_nonzero(self._row_ids[:self._count] >= 0))
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """문장 목록을 정규화된 float32 벡터 배열로 변환"""
+        if self._encoder is not None:
+            vectors = np.asarray(self._encoder(texts), dtype=np.float32)
+        else:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name, device="cpu")
+            vectors = self._model.encode(
+                texts, batch_size=Config.EMBEDDING_BATCH_SIZE,
+                normalize_embeddings=True, convert_to_numpy=True, show_progress_bar=False
+            ).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+    def sync(self) -> Dict[str, int]:
+        """
+        DB와 인덱스 동기화 (새 행만 임베딩, 사라진 행은 제외 표시)
+
+        임베딩과 IVF 학습은 lock 밖에서 수행하고, 결과를 붙일 때만 잠깐 lock을 잡으므로
+        동기화 중에도 search()가 기존 벡터로 계속 응답합니다.
+
+        Returns:
+            {"added": 추가된 벡터 수, "removed": 제외된 벡터 수, "total": 검색 대상 수}
+        """
+        if not self.available:
+            return {"added": 0, "removed": 0, "total": 0}
+
+        with self._lock:
+            self._ensure_loaded(table_id=self._load_table_id())
+            db_row_ids = self._load_row_ids()
+            indexed = self._row_ids[:self._count]
+            indexed_set = set(indexed[indexed >= 0].tolist())
+
+            removed_mask = (indexed >= 0) & ~np.isin(indexed, db_row_ids)
+            removed = int(np.count_nonzero(removed_mask))
+            if removed:
+                self._row_ids[:self._count][removed_mask] = -1
+                self._vectors[:self._count][removed_mask] = 0.0
+            synced_count = self._count
+
+        new_row_ids = [row_id for row_id in db_row_ids.tolist() if row_id not in indexed_set]
+        batch_size = max(1, Config.EMBEDDING_BATCH_SIZE) * 16
+        added = 0
+        for start in range(0, len(new_row_ids), batch_size):
+            if self._stopping.is_set():
+                self.logger.info("종료 요청으로 임베딩 인덱스 동기화 중단 (남은 행은 다음 동기화에서 반영)")
+                break
+            row_ids, texts = self._load_texts(new_row_ids[start:start + batch_size])
+            if not row_ids:
+                continue
+            vectors = self.encode(texts)
+            with self._lock:
+                # 임베딩하는 동안 add_rows()로 먼저 들어간 행은 제외
+                keep = ~np.isin(row_ids, self._row_ids[synced_count:self._count])
+                if keep.any():
+                    self._append(np.asarray(row_ids)[keep], vectors[keep])
+                    added += int(np.count_nonzero(keep))
+
+        if not self._stopping.is_set():
+            self._maybe_train()
+        with self._lock:
+            self._flush()
+            total = len(self)
+        self.logger.info(f"임베딩 인덱스 동기화: 추가 {added}, 제외 {removed}, 전체 {total}"
+                         f" ({'IVF' if self.uses_ivf else '전체 탐색'})")
+        return {"added": added, "removed": removed, "total": total}
+
+    def add_rows_later(self, row_ids: List[int]):
+        """
+        새 이력 행 임베딩을 백그라운드 스레드에 맡기고 바로 반환 (작업요청 저장 직후 호출)
+
+        요청 처리(이벤트 루프)가 문장 임베딩과 IVF 재학습을 기다리지 않도록
+        단일 작업 스레드에서 add_rows() 후 재학습 필요 여부를 확인합니다.
+        """
+        if not self.available or not self._loaded or not row_ids or self._stopping.is_set():
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-index")
+        self._executor.submit(self._add_rows_and_train, list(row_ids))
+
+    def _add_rows_and_train(self, row_ids: List[int]):
+        """백그라운드 작업: 새 행 추가 후 필요하면 IVF 재학습"""
+        self.add_rows(row_ids)
+        try:
+            self._maybe_train()
+        except Exception as e:
+            self.logger.warning(f"IVF 재학습 실패 (다음 동기화에서 재시도): {e}")
+
+    def stop(self):
+        """
+        종료 요청 (main.py 종료 시 호출)
+
+        진행 중인 sync()는 현재 배치를 붙인 뒤 멈추고, 대기 중인 add_rows_later() 작업은 취소합니다.
+        """
+        self._stopping.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def add_rows(self, row_ids: List[int]):
+        """
+        새 이력 행 임베딩 후 추가 (호출한 스레드에서 실행, IVF 재학습은 하지 않음)
+
+        인덱스가 아직 열리지 않았으면(시작 동기화 전) 생략하며, 다음 sync()에서 반영됩니다.
+        이미 인덱스에 있는 행(sync()가 먼저 반영)은 건너뜁니다.
+        실패해도 예외를 올리지 않습니다 (저장 자체는 이미 완료).
+        """
+        if not self.available or not self._loaded or not row_ids:
+            return
+        try:
+            found_ids, texts = self._load_texts(list(row_ids))
+            if not found_ids:
+                return
+            vectors = self.encode(texts)
+            with self._lock:
+                keep = ~np.isin(found_ids, self._row_ids[:self._count])
+                if keep.any():
+                    self.add_vectors(np.asarray(found_ids)[keep], vectors[keep])
+        except Exception as e:
+            self.logger.warning(f"임베딩 인덱스 추가 실패 (다음 동기화에서 반영): {e}")
+
+    def add_vectors(self, row_ids: Sequence[int], vectors: np.ndarray):
+        """
+        임베딩 완료된 벡터 추가 (IVF 학습 상태면 가장 가까운 목록에 바로 배정)
+
+        IVF 학습/재학습은 하지 않습니다. 학습은 sync()와 add_rows_later()의 백그라운드 작업이 담당합니다.
+
+        Args:
+            row_ids: 이력 rowid 목록
+            vectors: 정규화된 벡터 배열 (len(row_ids) x 차원)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            self._ensure_loaded(dim=vectors.shape[1])
+            self._append(row_ids, vectors)
+            self._flush()
+
+    def search(self, query: str, top_k: int = None) -> List[Tuple[int, float]]:
+        """
+        코사인 유사도 상위 K개 이력 검색
+
+        Args:
+            query: 검색 문장 (예: "Pressure Vessel | No.1 PE | 고장")
+            top_k: 반환할 최대 건수 (기본 Config.EMBEDDING_TOP_K)
+
+        Returns:
+            [(이력 rowid, 코사인 유사도), ...] 유사도 내림차순
+        """
+        if not self.available or not query or not query.strip():
+            return []
+        with self._lock:
+            if not self._loaded:
+                self._ensure_loaded(table_id=self._load_table_id())
+            if self._count == 0:
+                return []
+        return self.search_vector(self.encode([query])[0], top_k)
+
+    def search_vector(self, query_vector: np.ndarray, top_k: int = None,
+                      exact: bool = False) -> List[Tuple[int, float]]:
+        """
+        정규화된 질의 벡터로 상위 K개 검색
+
+        Args:
+            query_vector: 정규화된 질의 벡터
+            top_k: 반환할 최대 건수 (기본 Config.EMBEDDING_TOP_K)
+            exact: True면 IVF 학습 여부와 관계없이 전체 탐색 (벤치마크 기준값)
+        """
+        top_k = top_k or Config.EMBEDDING_TOP_K
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        with self._lock:
+            if not self._loaded or self._count == 0 or query_vector.shape[0] != self._dim:
+                return []
+            if self.uses_ivf and not exact:
+                positions = self._probe_positions(query_vector)
+            else:
+                positions = None
+            return self._top_k(query_vector, top_k, positions)
+
+    def _probe_positions(self, query_vector: np.ndarray) -> np.ndarray:
+        """질의와 가까운 VECTOR_IVF_NPROBE개 목록의 벡터 위치 (호출자가 lock 보유)"""
+        nprobe = min(max(1, Config.VECTOR_IVF_NPROBE), len(self._centroids))
+        centroid_scores = self._centroids @ query_vector
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        positions = np.concatenate([self._lists[list_id] for list_id in probed])
+        # 메모리 매핑 파일을 앞에서부터 읽도록 위치 정렬
+        positions.sort()
+        return positions
+
+    def _top_k(self, query_vector: np.ndarray, top_k: int,
+               positions: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """후보 벡터(없으면 전체)와 내적 후 상위 K개 선택 (호출자가 lock 보유)"""
+        if positions is None:
+            row_ids = self._row_ids[:self._count]
+            vectors = self._vectors[:self._count]
+        else:
+            row_ids = self._row_ids[positions]
+            vectors = self._vectors[positions]
+        if len(row_ids) == 0:
+            return []
+        scores = np.where(row_ids >= 0, vectors @ query_vector, -np.inf)
+        k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(row_ids[i]), float(scores[i])) for i in ordered if np.isfinite(scores[i])]
+
+    def _maybe_train(self):
+        """
+        IVF 학습/재학습 필요 시 수행
+
+        - 학습 전: 벡터 수가 VECTOR_IVF_MIN_VECTORS 이상이면 학습
+        - 학습 후: 벡터 수가 학습 시점의 IVF_RETRAIN_GROWTH배 이상이면 재학습 (목록 크기 불균형 방지)
+        """
+        minimum = Config.VECTOR_IVF_MIN_VECTORS
+        with self._lock:
+            if minimum <= 0 or self._count < minimum:
+                return
+            if self.uses_ivf and self._count < self._trained_count * self.IVF_RETRAIN_GROWTH:
+                return
+        self._train()
+
+    def _train(self):
+        """
+        중심점 학습 후 전체 벡터를 목록에 배정
+
+        학습 시점까지의 벡터로 lock 밖에서 중심점과 배정을 계산하고(기존 행은 제외 표시만 바뀜),
+        그 사이 추가된 벡터만 lock 안에서 배정한 뒤 교체합니다.
+        """
+        with self._lock:
+            count = self._count
+            vectors = self._vectors
+            valid = np.flatnonzero(self._row_ids[:count] >= 0)
+        if len(valid) == 0:
+            return
+        # 목록 수 기본값은 sqrt(벡터 수): 목록 크기와 목록 수가 비슷해져 탐색 비용이 균형을 이룸
+        list_count = Config.VECTOR_IVF_LISTS or int(np.sqrt(len(valid)))
+        list_count = max(1, min(list_count, len(valid)))
+
+        rng = np.random.default_rng(0)
+        sample_size = min(len(valid), list_count * self.IVF_SAMPLES_PER_LIST)
+        sample = np.sort(rng.choice(valid, sample_size, replace=False))
+        # 저장 공간 확장 후에도 이전 매핑은 같은 파일 앞부분을 가리키므로 그대로 읽음
+        centroids = train_centroids(np.asarray(vectors[sample]), list_count, self.IVF_ITERATIONS)
+        assignments = nearest_centroids(vectors[:count], centroids)
+
+        with self._lock:
+            self._centroids = centroids
+            self._list_ids[:count] = assignments
+            if self._count > count:
+                self._list_ids[count:self._count] = nearest_centroids(self._vectors[count:self._count], centroids)
+            self._trained_count = self._count
+            self._rebuild_lists()
+            np.save(os.path.join(self.index_path, self.CENTROIDS_FILE), self._centroids)
+            self._flush()
+        self.logger.info(f"IVF 학습 완료: 벡터 {count}, 목록 {list_count}")
+
+    def _rebuild_lists(self):
+        """벡터별 목록 번호로 목록별 위치 배열 생성 (호출자가 lock 보유)"""
+        list_ids = np.asarray(self._list_ids[:self._count])
+        order = np.argsort(list_ids, kind="stable")
+        counts = np.bincount(list_ids, minlength=len(self._centroids))
+        self._lists = np.split(order.astype(np.int64), np.cumsum(counts)[:-1])
+
+    def _ensure_loaded(self, dim: int = None, table_id: str = None):
+        """
+        저장된 인덱스 열기 (호출자가 lock 보유)
+
+        모델/차원이 다르거나 파일이 손상되었으면 초기화합니다.
+        table_id(이력 테이블 식별자)가 주어지고 저장된 값과 다르면 rowid가 다른 행을 가리키므로 초기화합니다.
+        이미 열린 인덱스도 table_id가 다르면 닫고 다시 만듭니다.
+        새로 만들 때 차원은 dim(없으면 인코더로 측정)을 사용합니다.
+        """
+        if self._loaded:
+            if table_id is None or table_id == self._table_id:
+                return
+            self.logger.info("작업요청 이력 테이블이 바뀌어 임베딩 인덱스를 다시 생성합니다")
+            self._loaded = False
+            self._vectors = self._row_ids = self._list_ids = None
+            meta = None
+        else:
+            os.makedirs(self.index_path, exist_ok=True)
+            meta = self._read_meta()
+        if meta and meta.get("model") == self.model_name and meta.get("dim") and dim in (None, meta["dim"]) \
+                and table_id in (None, meta.get("table_id")):
+            try:
+                self._dim = int(meta["dim"])
+                self._count = int(meta["count"])
+                self._capacity = int(meta["capacity"])
+                self._table_id = meta.get("table_id")
+                self._open_files("r+")
+                self._load_ivf(meta)
+                self._loaded = True
+                return
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"임베딩 인덱스 파일 열기 실패, 다시 생성합니다: {e}")
+        elif meta and meta.get("model") == self.model_name and dim in (None, meta.get("dim")):
+            self.logger.info("작업요청 이력 테이블이 바뀌어 임베딩 인덱스를 다시 생성합니다")
+        elif meta:
+            self.logger.info("임베딩 모델이 바뀌어 인덱스를 다시 생성합니다")
+
+        self._table_id = table_id
+        self._dim = int(dim or self.encode(["dimension probe"]).shape[1])
+        self._count = 0
+        self._capacity = self.MIN_CAPACITY
+        self._centroids = None
+        self._lists = []
+        self._trained_count = 0
+        self._open_files("w+")
+        self._loaded = True
+        self._flush()
+
+    def _load_ivf(self, meta: Dict):
+        """저장된 IVF 중심점과 목록 복원 (학습 전 인덱스면 전체 탐색 유지)"""
+        self._centroids = None
+        self._lists = []
+        self._trained_count = int(meta.get("ivf_trained_count", 0))
+        centroids_path = os.path.join(self.index_path, self.CENTROIDS_FILE)
+        if not self._trained_count or not os.path.exists(centroids_path):
+            self._trained_count = 0
+            return
+        self._centroids = np.load(centroids_path)
+        list_ids = self._list_ids[:self._count]
+        # 메타 저장 전에 종료된 경우 등 목록 번호가 없는 벡터는 다시 배정
+        unassigned = np.flatnonzero((list_ids < 0) | (list_ids >= len(self._centroids)))
+        if len(unassigned):
+            list_ids[unassigned] = nearest_centroids(self._vectors[unassigned], self._centroids)
+        self._rebuild_lists()
+
+    def _open_files(self, mode: str):
+        """벡터/rowid/목록 번호 메모리 매핑 파일 열기"""
+        self._vectors = np.memmap(os.path.join(self.index_path, self.VECTORS_FILE), dtype=np.float32,
+                                  mode=mode, shape=(self._capacity, self._dim))
+        self._row_ids = np.memmap(os.path.join(self.index_path, self.ROW_IDS_FILE), dtype=np.int64,
+                                  mode=mode, shape=(self._capacity,))
+        lists_path = os.path.join(self.index_path, self.LISTS_FILE)
+        if mode == "r+" and not os.path.exists(lists_path):
+            # 목록 번호 파일이 없던 인덱스: 미배정(-1) 파일 생성
+            np.full(self._capacity, -1, dtype=np.int32).tofile(lists_path)
+        self._list_ids = np.memmap(lists_path, dtype=np.int32, mode=mode, shape=(self._capacity,))
+        if mode == "w+":
+            self._list_ids[:] = -1
+
+    def _grow(self, required: int):
+        """저장 공간 확장 (파일 크기를 늘린 뒤 다시 매핑)"""
+        capacity = self._capacity
+        while capacity < required:
+            capacity *= self.GROWTH_FACTOR
+        self._flush()
+        self._vectors = None
+        self._row_ids = None
+        self._list_ids = None
+        for name, row_bytes in ((self.VECTORS_FILE, self._dim * 4), (self.ROW_IDS_FILE, 8), (self.LISTS_FILE, 4)):
+            with open(os.path.join(self.index_path, name), "r+b") as f:
+                f.truncate(capacity * row_bytes)
+        previous_capacity = self._capacity
+        self._capacity = capacity
+        self._open_files("r+")
+        self._list_ids[previous_capacity:] = -1
+
+    def _append(self, row_ids: Sequence[int], vectors: np.ndarray):
+        """벡터 추가, IVF 학습 상태면 목록에도 배정 (호출자가 lock 보유)"""
+        start = self._count
+        end = start + len(row_ids)
+        if end > self._capacity:
+            self._grow(end)
+        self._vectors[start:end] = vectors
+        self._row_ids[start:end] = np.asarray(row_ids, dtype=np.int64)
+        self._count = end
+
+        if self.uses_ivf:
+            list_ids = nearest_centroids(vectors, self._centroids)
+            self._list_ids[start:end] = list_ids
+            positions = np.arange(start, end, dtype=np.int64)
+            for list_id in np.unique(list_ids):
+                self._lists[list_id] = np.concatenate((self._lists[list_id], positions[list_ids == list_id]))
+
+    def _flush(self):
+        """메모리 매핑 파일과 메타 정보 저장"""
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._row_ids.flush()
+            self._list_ids.flush()
+        meta = {
+            "model": self.model_name, "dim": self._dim, "count": self._count, "capacity": self._capacity,
+            "ivf_trained_count": self._trained_count if self.uses_ivf else 0,
+            "table_id": self._table_id,
+        }
+        temp_path = os.path.join(self.index_path, self.META_FILE + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, os.path.join(self.index_path, self.META_FILE))
+
+    def _read_meta(self) -> Optional[Dict]:
+        """메타 정보 읽기 (없거나 손상되었으면 None)"""
+        try:
+            with open(os.path.join(self.index_path, self.META_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_table_id(self) -> Optional[str]:
+        """DB의 이력 테이블 식별자 (database.py가 테이블 생성 시 기록, 없으면 None)"""
+        try:
+            row = get_connection_manager(self.db_path).reader().execute(
+                "SELECT value FROM database_meta WHERE key = 'history_table_id'"
+            ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def _load_row_ids(self) -> np.ndarray:
+        """DB의 전체 이력 rowid"""
+        try:
+            cursor = get_connection_manager(self.db_path).reader().execute("SELECT rowid FROM notification_history")
+            return np.fromiter((row[0] for row in cursor), dtype=np.int64)
+        except sqlite3.Error as e:
+            self.logger.warning(f"임베딩 대상 조회 실패: {e}")
+            return np.zeros(0, dtype=np.int64)
+
+    def _load_texts(self, row_ids: List[int]) -> Tuple[List[int], List[str]]:
+        """rowid 목록의 임베딩 문장 조회 (내용이 빈 행 제외)"""
+        placeholders = ", ".join("?" for _ in row_ids)
+        cursor = get_connection_manager(self.db_path).reader().execute(
+            f"SELECT rowid, work_title, location, equipType, statusCode FROM notification_history "
+            f"WHERE rowid IN ({placeholders})", row_ids
+        )
+        found_ids, texts = [], []
+        for row_id, work_title, location, equip_type, status_code in cursor:
+            text = notification_text(work_title, location, equip_type, status_code)
+            if text:
+                found_ids.append(row_id)
+                texts.append(text)
+        return found_ids, texts
+
+
+# 전역 임베딩 인덱스 인스턴스
+embedding_index = EmbeddingIndex()
@@ -1,8 +1,14 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import Config
 from app.api import chat, work_details
 from app.database import db_manager
+from app.vector_db import embedding_index
+from app.session_manager import session_manager
+from app.logic.work_details_cache import work_details_cache
+from app.logic.normalizer import normalizer
+from app.logic.vocabulary import vocabulary_service
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -20,6 +26,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 종료 시 임베딩 인덱스 동기화 완료를 기다리는 최대 시간(초)
+EMBEDDING_SYNC_SHUTDOWN_TIMEOUT = 10
+
 # 라우터 등록
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
 app.include_router(work_details.router, prefix="/api/v1", tags=["work-details"])
@@ -36,11 +45,59 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ 데이터베이스 초기화 오류: {e}")
         print("📝 샘플 데이터로 시작합니다.")
+    
+    # 만료 세션 주기 정리 (백그라운드)
+    app.state.session_sweeper = asyncio.create_task(session_manager.run_sweeper())
+    
+    # 영구 캐시 TTL 정리 (시작 시 1회 + CACHE_PURGE_INTERVAL_SECONDS마다)
+    app.state.cache_maintenance = asyncio.create_task(_run_cache_maintenance())
+    
+    # 임베딩 인덱스 동기화 (새 이력만 임베딩, 요청 처리를 막지 않도록 백그라운드 실행)
+    if embedding_index.available:
+        app.state.embedding_sync = asyncio.create_task(_sync_embedding_index())
+        print("🧭 임베딩 인덱스 백그라운드 동기화 시작")
+
+async def _sync_embedding_index():
+    """임베딩 인덱스 동기화 (작업 스레드에서 실행)"""
+    try:
+        result = await asyncio.to_thread(embedding_index.sync)
+        print(f"✅ 임베딩 인덱스 동기화 완료: {result}")
+    except Exception as e:
+        print(f"⚠️ 임베딩 인덱스 동기화 오류: {e}")
+
+async def _run_cache_maintenance():
+    """TTL이 지난 영구 캐시 항목 주기 정리 (SQLite 쓰기이므로 작업 스레드에서 실행)"""
+    while True:
+        try:
+            purged = await asyncio.to_thread(work_details_cache.purge_expired)
+            if purged:
+                print(f"🧹 작업상세 캐시 만료 항목 정리: {purged}건")
+            # 정규화 캐시는 현재 어휘 버전이 아닌 항목도 함께 삭제 (데이터 재적재 후 쓰이지 않음)
+            purged = await asyncio.to_thread(normalizer.cache.purge_expired,
+                                             vocabulary_service.get_snapshot().version)
+            if purged:
+                print(f"🧹 정규화 캐시 만료/이전 어휘 항목 정리: {purged}건")
+        except Exception as e:
+            print(f"⚠️ 캐시 정리 오류: {e}")
+        await asyncio.sleep(Config.CACHE_PURGE_INTERVAL_SECONDS)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
     print("🛑 PMark2 AI Assistant 종료 중...")
+    app.state.session_sweeper.cancel()
+    app.state.cache_maintenance.cancel()
+    
+    # 임베딩 동기화는 작업 스레드에서 실행되므로 작업 취소만으로는 멈추지 않음:
+    # 중단을 요청하고 현재 배치가 끝날 때까지 기다린 뒤 DB 연결 종료
+    embedding_index.stop()
+    embedding_sync = getattr(app.state, "embedding_sync", None)
+    if embedding_sync is not None and not embedding_sync.done():
+        try:
+            await asyncio.wait_for(embedding_sync, timeout=EMBEDDING_SYNC_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("⚠️ 임베딩 인덱스 동기화가 종료 대기 시간 안에 끝나지 않았습니다")
+    
     db_manager.close()
 
 @app.get("/")
@@ -0,0 +1,26 @@
+"""
+pytest 공통 설정
+
+app 모듈은 import 시 Config(환경 변수)로 전역 인스턴스(DB, 캐시, 임베딩 인덱스)를 만들므로,
+테스트가 실제 data 디렉토리나 OpenAI API를 건드리지 않도록 import 전에 임시 경로와 설정을 지정합니다.
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix="pmark_test_")
+atexit.register(shutil.rmtree, _TEST_DATA_DIR, ignore_errors=True)
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ["SQLITE_DB_PATH"] = os.path.join(_TEST_DATA_DIR, "test.db")
+os.environ["VECTOR_DB_PATH"] = os.path.join(_TEST_DATA_DIR, "vector_db")
+os.environ["EXCEL_CACHE_DIR"] = os.path.join(_TEST_DATA_DIR, "excel_cache")
+os.environ["EMBEDDING_ENABLED"] = "false"
+os.environ["SESSION_BACKEND"] = "memory"
+
+# backend(app 패키지)와 tests(가짜 클라이언트) 경로
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,41 @@
+"""
+PMark2 AI Assistant - 테스트용 가짜 OpenAI 클라이언트
+
+LLMGateway가 사용하는 AsyncOpenAI 인터페이스(client.chat.completions.create)만 흉내 냅니다.
+응답 내용은 주입한 responder(메시지 목록 → 응답 텍스트)가 정하므로, 네트워크나 API 키 없이
+파서 → 정규화 → 추천 흐름을 게이트웨이를 거쳐 검증할 수 있습니다.
+
+주요 담당자: 백엔드 개발자
+수정 시 주의사항:
+- LLMGateway.complete()가 새 응답 필드를 읽으면 FakeCompletion에도 추가
+- 받은 요청은 requests에 순서대로 기록됩니다 (호출 여부/프롬프트 확인용)
+"""
+
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+
+class FakeCompletions:
+    """chat.completions 네임스페이스 (create 호출 기록 후 responder 응답 반환)"""
+
+    def __init__(self, responder: Callable[[List[Dict[str, str]]], str], requests: List[Dict]):
+        self._responder = responder
+        self._requests = requests
+
+    async def create(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        self._requests.append(dict(kwargs, model=model, messages=messages))
+        content = self._responder(messages)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeOpenAIClient:
+    """
+    AsyncOpenAI 호환 최소 가짜 클라이언트
+
+    사용처:
+    - tests/test_llm_pipeline.py: llm_gateway.client를 이 클라이언트로 교체
+    """
+
+    def __init__(self, responder: Callable[[List[Dict[str, str]]], str]):
+        self.requests: List[Dict] = []
+        self.chat = SimpleNamespace(completions=FakeCompletions(responder, self.requests))
@@ -0,0 +1,76 @@
+"""
+PMark2 AI Assistant - 테스트용 가짜 Redis 클라이언트
+
+RedisSessionStore가 사용하는 redis.Redis 명령(get/set(ex)/delete/scan_iter/mget/ping)만
+프로세스 내부 dict로 흉내 냅니다. redis 서버나 redis 패키지 없이 세션 저장소를 검증할 때 사용합니다.
+
+주요 담당자: 백엔드 개발자
+수정 시 주의사항:
+- RedisSessionStore가 새 명령을 쓰면 여기에도 같은 동작으로 추가
+- 값은 실제 클라이언트처럼 bytes로 반환합니다
+- 만료 시간은 clock(기본 time.monotonic)으로 판단하므로 테스트에서 시계를 주입해 만료를 재현
+"""
+
+import fnmatch
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class FakeRedis:
+    """
+    redis.Redis 호환 최소 가짜 클라이언트
+
+    사용처:
+    - tests/test_session_store.py: RedisSessionStore(client=FakeRedis())
+    """
+
+    def __init__(self, clock: Callable[[], float] = None):
+        self._clock = clock or time.monotonic
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+    def _alive(self, key: str) -> Optional[bytes]:
+        """만료되지 않은 값 (만료된 키는 삭제, 호출자가 lock 보유)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._alive(key)
+
+    def set(self, key: str, value, ex: int = None) -> bool:
+        with self._lock:
+            self._data[key] = (self._encode(value), self._clock() + ex if ex else None)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            deleted = 0
+            for key in keys:
+                if self._alive(key) is not None:
+                    del self._data[key]
+                    deleted += 1
+            return deleted
+
+    def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._alive(key) for key in keys]
+
+    def scan_iter(self, match: str = None) -> Iterator[str]:
+        with self._lock:
+            keys = [key for key in list(self._data) if self._alive(key) is not None]
+        return iter([key for key in keys if match is None or fnmatch.fnmatchcase(key, match)])
@@ -0,0 +1,128 @@
+"""
+ITEMNO 인덱스 테스트
+
+제한 편집 거리(bounded_levenshtein)는 제한 없는 편집 거리와, has_similar()는 전체 ITEMNO를 훑던
+기존 유사도 판단(SequenceMatcher + 부분 일치 보너스 > 0.8)과 같은 결과를 내는지 확인합니다.
+search()는 trigram 후보 선정 후에도 전체 스캔과 같은 상위 K개를 반환해야 하고,
+database.search_by_itemno()는 유사 ITEMNO와 부분 일치 ITEMNO를 함께 반환해야 합니다.
+
+실행: backend 디렉토리에서 python -m pytest tests
+"""
+
+import random
+import string
+
+import pytest
+
+from app.database import db_manager
+from app.logic.itemno_index import ItemnoIndex, bounded_levenshtein, itemno_index, itemno_similarity
+
+ITEMNOS = ["CV-1307", "SW-CV1307-02", "PE-V2884", "PE-V2885", "PE-V2884A", "NX-RGV305", "PW-AI376AB",
+           "RFCC-P101", "RFCC-P102", "10025-HX-01", "HX-01", "PE-T100", "PE-T1001", "TK-5501"]
+
+
+def levenshtein(item1: str, item2: str) -> int:
+    """제한 없는 편집 거리 (비교 기준)"""
+    previous = list(range(len(item2) + 1))
+    for i, ch1 in enumerate(item1, 1):
+        current = [i]
+        for j, ch2 in enumerate(item2, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ch1 != ch2)))
+        previous = current
+    return previous[-1]
+
+
+def old_has_similar(itemno: str, itemnos) -> bool:
+    """기존 parser._check_itemno_in_db()의 판단 (정확 일치 또는 전체 ITEMNO 중 유사도 > 0.8)"""
+    return itemno in itemnos or any(itemno_similarity(itemno, item) > 0.8 for item in itemnos)
+
+
+@pytest.fixture
+def index():
+    index = ItemnoIndex()
+    index._build(ITEMNOS)
+    return index
+
+
+def random_variant(rng: random.Random, item: str) -> str:
+    """삽입/삭제/치환 오타를 0~3개 넣은 변형"""
+    chars = list(item)
+    for _ in range(rng.randint(0, 3)):
+        op = rng.choice("isd")
+        pos = rng.randrange(len(chars) + (op == "i")) if chars else 0
+        if op == "i":
+            chars.insert(pos, rng.choice(string.ascii_uppercase + string.digits + "-"))
+        elif chars and op == "s":
+            chars[pos] = rng.choice(string.ascii_uppercase + string.digits)
+        elif chars:
+            del chars[pos]
+    return "".join(chars)
+
+
+def test_bounded_levenshtein_matches_unbounded():
+    rng = random.Random(7)
+    pairs = [("CV1307", "CV-1307"), ("PE-V2884", "PE-V2885"), ("", "ABC"), ("ABC", ""), ("SW-CV1307-02", "CV1307")]
+    pairs += [(rng.choice(ITEMNOS), random_variant(rng, rng.choice(ITEMNOS))) for _ in range(300)]
+    for item1, item2 in pairs:
+        distance = levenshtein(item1, item2)
+        for max_distance in range(0, 6):
+            expected = distance if distance <= max_distance else None
+            assert bounded_levenshtein(item1, item2, max_distance) == expected, (item1, item2, max_distance)
+
+
+@pytest.mark.parametrize("itemno", [
+    "CV-1307", "cv-1307",  # 정확 일치 (대소문자 무시)
+    "CV1307", "V2884", "RGV305", "HX-01",  # 부분 일치
+    "PE-V2883", "PE-V288", "RFCC-P10I", "NX-RGV350",  # 오타
+    "ZZ-9999", "AB-1", "TK",  # 유사 항목 없음
+])
+def test_has_similar_matches_full_scan(index, itemno):
+    assert index.has_similar(itemno) == old_has_similar(itemno, ITEMNOS)
+
+
+def test_has_similar_matches_full_scan_on_random_typos(index):
+    rng = random.Random(11)
+    for _ in range(300):
+        itemno = random_variant(rng, rng.choice(ITEMNOS))
+        if itemno:
+            assert index.has_similar(itemno) == old_has_similar(itemno, ITEMNOS), itemno
+
+
+def test_search_matches_full_scan(index):
+    rng = random.Random(3)
+    queries = ["CV1307", "PE-V2883", "RFCC-P10"] + [random_variant(rng, rng.choice(ITEMNOS)) for _ in range(200)]
+    for query in queries:
+        if not query.strip():
+            continue
+        expected = []
+        for item in ITEMNOS:
+            score = 1.0 - levenshtein(query.lower(), item.lower()) / max(len(query), len(item))
+            if score >= 0.7:
+                expected.append((item, round(score, 3)))
+        expected.sort(key=lambda match: (-match[1], match[0].lower()))
+        assert index.search(query, top_k=5, min_score=0.7) == expected[:5], query
+
+
+def test_search_typo_ranks_closest_first(index):
+    assert index.search("PE-V2883", top_k=3, min_score=0.7)[0][1] == pytest.approx(0.875)
+    assert {item for item, _ in index.search("PE-V2883", top_k=3, min_score=0.7)} == {"PE-V2884", "PE-V2885",
+                                                                                       "PE-V2884A"}
+
+
+def test_search_by_itemno_merges_fuzzy_and_substring_matches():
+    """샘플 이력의 SW-CV1307-02(부분 일치)와 추가한 CV-1307(오타 보정)이 함께 검색됨"""
+    db_manager._create_sample_data()
+    with db_manager.connections.writer() as conn:
+        conn.execute(
+            "INSERT INTO notification_history (itemno, process, location, equipType, statusCode, priority, source) "
+            "VALUES ('CV-1307', 'RFCC', 'No.1 PE', 'Control Valve', '고장', '일반작업', 'test')"
+        )
+    itemno_index.refresh()
+    assert [item for item, _ in itemno_index.search("CV1307")] == ["CV-1307"]
+
+    results = db_manager.search_by_itemno("CV1307", limit=5)
+
+    assert {result["itemno"] for result in results} == {"SW-CV1307-02", "CV-1307"}
+    assert [result["score"] for result in results] == sorted((result["score"] for result in results), reverse=True)
+    assert "rowid" not in results[0] and "created_at" not in results[0]
+    assert len(db_manager.search_by_itemno("CV1307", limit=1)) == 1
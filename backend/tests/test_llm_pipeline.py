@@ -0,0 +1,93 @@
+"""
+LLM 게이트웨이 경유 파서 → 정규화 → 추천 흐름 테스트
+
+llm_gateway.client를 tests/fake_openai.py의 가짜 클라이언트로 교체하고,
+샘플 이력 DB에서 시나리오 1 입력이 추천 목록(작업명/상세 생성 포함)까지 이어지는지 확인합니다.
+
+실행: backend 디렉토리에서 python -m pytest tests
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from app.agents.parser import input_parser
+from app.database import db_manager
+from app.llm_gateway import llm_gateway
+from app.logic.itemno_index import itemno_index
+from app.logic.normalizer import normalizer
+from app.logic.recommender import recommendation_engine
+from app.logic.vocabulary import vocabulary_service
+from fake_openai import FakeOpenAIClient
+
+# 사용자가 구어체로 말한 용어 → 표준 용어 (가짜 LLM의 정규화 응답)
+# 위치/설비유형은 로컬 해석기가 풀지 못하는 표현이라 정규화 LLM 요청을 거침
+STANDARD_TERMS = {
+    "첫번째 폴리에틸렌 공장": "No.1 PE",
+    "압력통": "Pressure Vessel",
+    "고장남": "고장",
+    "일반": "일반작업",
+}
+
+
+def fake_llm(messages) -> str:
+    """프롬프트 종류(작업상세 생성/일괄 정규화/단일 정규화/정보 추출)에 맞는 JSON 응답"""
+    prompt = messages[-1]["content"]
+    if '"work_title"' in prompt:
+        return json.dumps({"work_title": "압력용기 고장 점검", "work_details": "압력용기 고장 부위 확인 및 수리"},
+                          ensure_ascii=False)
+    if '"results"' in prompt:
+        terms = re.findall(r"^(\d+)\. 입력 용어: (.+?) / 카테고리:", prompt, re.MULTILINE)
+        return json.dumps({"results": [
+            {"index": int(index), "normalized_term": STANDARD_TERMS.get(term, "UNKNOWN"), "confidence": 0.9}
+            for index, term in terms
+        ]}, ensure_ascii=False)
+    if '"normalized_term"' in prompt:
+        term = re.search(r"\*\*입력 용어\*\*: (.+)", prompt).group(1).strip()
+        return json.dumps({"normalized_term": STANDARD_TERMS.get(term, "UNKNOWN"), "confidence": 0.9},
+                          ensure_ascii=False)
+    return json.dumps({"location": "첫번째 폴리에틸렌 공장", "equipment_type": "압력통", "status_code": "고장남",
+                       "priority": "일반", "confidence": 0.9}, ensure_ascii=False)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeOpenAIClient(fake_llm)
+    monkeypatch.setattr(llm_gateway, "client", client)
+    return client
+
+
+@pytest.fixture(scope="module", autouse=True)
+def sample_database():
+    """샘플 이력 + 작업명이 비어 있는 이력 1건 (추천 시 작업명/상세 생성 대상)"""
+    db_manager._create_sample_data()
+    with db_manager.connections.writer() as conn:
+        conn.execute(
+            "INSERT INTO notification_history (itemno, process, location, equipType, statusCode, priority, source) "
+            "VALUES ('PV-TEST-001', 'RFCC', 'No.1 PE', 'Pressure Vessel', '고장', '일반작업', 'test')"
+        )
+    vocabulary_service.refresh()
+    itemno_index.refresh()
+    normalizer.cache.clear()
+
+
+def test_parser_normalizer_recommender_through_gateway(fake_client):
+    parsed = asyncio.run(input_parser.parse_input("첫번째 폴리에틸렌 공장 압력통 고장남"))
+
+    assert parsed.scenario == "S1"
+    assert (parsed.location, parsed.equipment_type, parsed.status_code) == ("No.1 PE", "Pressure Vessel", "고장")
+    assert not parsed.needs_additional_input
+
+    recommendations = asyncio.run(recommendation_engine.get_recommendations(parsed, limit=5))
+
+    assert recommendations
+    assert all(rec.work_title and rec.work_details for rec in recommendations)
+    generated = [rec for rec in recommendations if rec.itemno == "PV-TEST-001"]
+    assert generated and generated[0].work_title == "압력용기 고장 점검"
+
+    # 정보 추출 → 위치/설비유형 일괄 정규화 → 작업상세 생성 순으로 게이트웨이 호출
+    prompts = [request["messages"][-1]["content"] for request in fake_client.requests]
+    assert '"results"' in prompts[1]
+    assert any('"work_title"' in prompt for prompt in prompts[2:])
@@ -0,0 +1,46 @@
+"""
+정규화 캐시 테스트
+
+정리 작업(purge_expired)이 쓰기 연결을 기다리는 동안에도 캐시 조회가 막히지 않는지,
+일괄 저장(put_many) 결과가 영구 캐시에서 다시 조회되는지 확인합니다.
+
+실행: backend 디렉토리에서 python -m pytest tests
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.logic.normalization_cache import NormalizationCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return NormalizationCache(db_path=str(tmp_path / "cache.db"), max_size=16, ttl_hours=1)
+
+
+def test_get_is_not_blocked_by_purge_waiting_for_writer(cache):
+    cache.put("압력통", "equipment", "v1", "Pressure Vessel", 0.9)
+    purge = threading.Thread(target=cache.purge_expired, args=("v1",))
+
+    # 다른 쓰기(데이터 적재 등)가 쓰기 연결을 잡고 있는 동안 정리 작업 시작
+    with cache._connections.writer():
+        purge.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        assert cache.get("압력통", "equipment", "v1") == ("Pressure Vessel", 0.9)
+        assert cache.get("모터밸브", "equipment", "v1") is None
+        assert time.perf_counter() - started < 0.05
+    purge.join(timeout=1)
+
+
+def test_put_many_is_read_back_from_sqlite(cache):
+    cache.put_many([("압력통", "equipment", "v1", "Pressure Vessel", 0.9),
+                    ("첫번째 폴리에틸렌 공장", "location", "v1", "No.1 PE", 0.8)])
+    cache.clear()
+
+    assert cache.get(" 압력통 ", "equipment", "v1") == ("Pressure Vessel", 0.9)
+    assert cache.get("첫번째 폴리에틸렌 공장", "location", "v1") == ("No.1 PE", 0.8)
+    assert cache.get("압력통", "equipment", "v2") is None
+    assert cache.get_stats()["db_hits"] == 2
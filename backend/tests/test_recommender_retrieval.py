@@ -0,0 +1,59 @@
+"""
+추천 후보 수집 테스트
+
+단계별 SQL 조회가 이벤트 루프 밖(작업 스레드)에서 실행되고,
+전체 시간 제한(RETRIEVAL_PIPELINE_BUDGET_MS)이 다 되면 이후 단계를 생략하는지 확인합니다.
+
+실행: backend 디렉토리에서 python -m pytest tests
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.config import Config
+from app.database import db_manager
+from app.logic.recommender import recommendation_engine
+from app.models import ParsedInput
+
+PARSED = ParsedInput(scenario="S1", confidence=0.9, location="No.1 PE",
+                     equipment_type="Pressure Vessel", status_code="고장", priority="일반작업")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def sample_database():
+    db_manager._create_sample_data()
+
+
+@pytest.fixture
+def query_threads(monkeypatch):
+    """query_notifications가 실행된 스레드 기록"""
+    threads = []
+    query_notifications = db_manager.query_notifications
+
+    def recording(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return query_notifications(*args, **kwargs)
+
+    monkeypatch.setattr(db_manager, "query_notifications", recording)
+    return threads
+
+
+def test_sql_stages_run_off_the_event_loop(query_threads):
+    async def retrieve():
+        return threading.get_ident(), await recommendation_engine._retrieve_candidates(PARSED, pool_size=50)
+
+    loop_thread, candidates = asyncio.run(retrieve())
+
+    assert candidates
+    assert query_threads and loop_thread not in query_threads
+
+
+def test_pipeline_budget_skips_remaining_stages(query_threads, monkeypatch):
+    monkeypatch.setattr(Config, "RETRIEVAL_PIPELINE_BUDGET_MS", 0)
+
+    candidates = asyncio.run(recommendation_engine._retrieve_candidates(PARSED, pool_size=50))
+
+    assert candidates == []
+    assert query_threads == []
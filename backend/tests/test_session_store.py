@@ -0,0 +1,167 @@
+"""
+세션 저장소 테스트
+
+SessionManager를 memory/sqlite/redis(가짜 클라이언트) 저장소로 각각 구동하여
+두 워커(SessionManager 두 개)가 같은 저장소를 공유할 때의 동작과,
+느린 저장소 호출이 채팅 API의 이벤트 루프를 막지 않는지 확인합니다.
+
+실행: backend 디렉토리에서 python -m pytest tests
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.api import chat  # noqa: E402
+from app.models import ParsedInput  # noqa: E402
+from app.session_manager import SessionManager  # noqa: E402
+from app.session_store import MemorySessionStore, RedisSessionStore, SQLiteSessionStore  # noqa: E402
+from fake_redis import FakeRedis  # noqa: E402
+
+
+class FakeClock:
+    """가짜 Redis 만료 시간 확인용 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore()
+    if request.param == "sqlite":
+        return SQLiteSessionStore(db_path=str(tmp_path / "sessions.db"))
+    return RedisSessionStore(client=FakeRedis(), prefix="test:session:")
+
+
+def backdate(manager: SessionManager, session_id: str, minutes: float):
+    """세션의 마지막 갱신 시각을 과거로 옮겨 해당 워커에서 저장 (그 시각에 갱신한 것으로 재현)"""
+    session = manager._store.get(session_id)
+    session.last_updated = datetime.now() - timedelta(minutes=minutes)
+    manager._save(session)
+
+
+def test_update_is_visible_to_other_worker(store):
+    """한 워커가 갱신한 단서를 다른 워커가 이어받음"""
+    first, second = SessionManager(store), SessionManager(store)
+    session_id = first.create_session()
+
+    first.update_session(session_id, ParsedInput(scenario="S1", confidence=0.9, location="No.1 PE"))
+    second.update_session(session_id, ParsedInput(scenario="S1", confidence=0.9, equipment_type="Pressure Vessel"))
+
+    session = first.get_session(session_id)
+    assert session.turn_count == 2
+    assert session.accumulated_clues.location == "No.1 PE"
+    assert session.accumulated_clues.equipment_type == "Pressure Vessel"
+
+
+def test_expired_entry_keeps_session_refreshed_elsewhere(store):
+    """이 워커의 만료 힙에서 기한이 지났어도 다른 워커가 갱신한 세션은 삭제하지 않음"""
+    first, second = SessionManager(store), SessionManager(store)
+    timeout_minutes = first.SESSION_TIMEOUT.total_seconds() / 60
+    session_id = first.create_session()
+    # first가 타임아웃 전에 마지막으로 본 세션을 second가 그 뒤에 이어서 갱신
+    backdate(first, session_id, minutes=timeout_minutes + 1)
+    backdate(second, session_id, minutes=timeout_minutes / 2)
+
+    assert first.purge_expired() == 0
+    assert store.get(session_id) is not None
+
+
+def test_expired_session_is_purged(store):
+    """아무도 갱신하지 않은 세션은 타임아웃 후 정리"""
+    manager = SessionManager(store)
+    session_id = manager.create_session()
+    backdate(manager, session_id, minutes=manager.SESSION_TIMEOUT.total_seconds() / 60 + 1)
+
+    manager.purge_expired()
+
+    assert store.get(session_id) is None
+    assert manager.get_session(session_id) is None
+
+
+def test_session_cap_applies_to_whole_store(store):
+    """최대 세션 수는 워커별이 아닌 저장소 전체 기준으로 적용 (가장 오래 갱신되지 않은 세션부터)"""
+    first = SessionManager(store)
+    # memory 저장소는 프로세스 내부 전용이므로 워커 하나로 확인
+    second = SessionManager(store) if store.shared else first
+    first.max_sessions = second.max_sessions = 3
+    oldest = first.create_session()
+    backdate(first, oldest, minutes=1)
+    for _ in range(3):
+        second.create_session()
+
+    first.purge_expired()
+    second.purge_expired()
+
+    assert len(store) == 3
+    assert store.get(oldest) is None
+
+
+def test_redis_key_expires_with_session_timeout():
+    """Redis 저장소는 세션 타임아웃만큼 키 만료 시간을 걸어 버려진 세션을 정리"""
+    clock = FakeClock()
+    store = RedisSessionStore(client=FakeRedis(clock=clock), prefix="test:session:")
+    manager = SessionManager(store)
+    session_id = manager.create_session()
+
+    clock.now += manager.SESSION_TIMEOUT.total_seconds() - 1
+    assert store.get(session_id) is not None
+    clock.now += 2
+    assert store.get(session_id) is None
+    assert len(store) == 0
+
+
+class SlowStore(MemorySessionStore):
+    """응답이 느린 원격 저장소 흉내 (모든 호출이 delay초 걸림)"""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def get(self, session_id):
+        time.sleep(self.delay)
+        return super().get(session_id)
+
+    def save(self, session, ttl_seconds=None):
+        time.sleep(self.delay)
+        super().save(session, ttl_seconds)
+
+    def delete(self, session_id):
+        time.sleep(self.delay)
+        return super().delete(session_id)
+
+
+def test_slow_store_does_not_block_event_loop(monkeypatch):
+    """세션 초기화 API가 느린 저장소를 기다리는 동안에도 다른 코루틴이 실행됨"""
+    monkeypatch.setattr(chat, "session_manager", SessionManager(SlowStore(delay=0.2)))
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        response = await chat.session_reset(session_id="old-session")
+        task.cancel()
+        return response, ticks
+
+    response, ticks = asyncio.run(scenario())
+
+    assert response["new_session_id"]
+    assert ticks >= 10
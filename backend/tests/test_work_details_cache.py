@@ -0,0 +1,40 @@
+"""
+작업명/상세 캐시 테스트
+
+추천 엔진(일반 프롬프트)과 작업상세 API(사용자 메시지 맞춤 프롬프트)의 결과가
+서로 또는 다른 사용자 메시지에 캐시 적중으로 섞이지 않는지 확인합니다.
+
+실행: backend 디렉토리에서 python -m pytest tests
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.logic.work_details_cache import WorkDetailsCache
+
+RECOMMENDATION = SimpleNamespace(equipType="Pressure Vessel", statusCode="고장", location="No.1 PE", priority="일반작업")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return WorkDetailsCache(db_path=str(tmp_path / "cache.db"), max_size=16, max_entries=100, ttl_hours=1)
+
+
+def test_api_results_are_keyed_by_user_message(cache):
+    """메시지 맞춤 결과는 같은 메시지에서만 적중"""
+    cache.put(RECOMMENDATION, "누설 점검", "압력용기 누설 부위 확인", user_message="압력용기 누설")
+
+    assert cache.get(RECOMMENDATION, "압력용기  누설")["work_title"] == "누설 점검"
+    assert cache.get(RECOMMENDATION, "압력용기 소음") is None
+
+
+def test_recommendation_and_api_scopes_are_separate(cache):
+    """추천 엔진 결과와 작업상세 API 결과는 서로의 캐시 적중이 되지 않음"""
+    cache.put(RECOMMENDATION, "누설 점검", "압력용기 누설 부위 확인", user_message="압력용기 누설")
+    assert cache.get(RECOMMENDATION) is None
+
+    cache.put(RECOMMENDATION, "압력용기 고장 점검", "압력용기 고장 부위 확인")
+    cache.clear()
+    assert cache.get(RECOMMENDATION)["work_title"] == "압력용기 고장 점검"
+    assert cache.get(RECOMMENDATION, "압력용기 누설")["work_title"] == "누설 점검"
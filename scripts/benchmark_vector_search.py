@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+PMark2 벡터 검색 벤치마크
+IVF 근사 검색과 전체 탐색(brute force)의 재현율/지연 시간 비교
+
+사용 예:
+    python scripts/benchmark_vector_search.py                      # 합성 벡터 300,000건
+    python scripts/benchmark_vector_search.py --count 500000 --nprobe 8 16 32
+    python scripts/benchmark_vector_search.py --index-path backend/data/vector_db   # 실제 인덱스 (복사본 권장)
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# backend 패키지 import 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.config import Config  # noqa: E402
+from app.vector_db import EmbeddingIndex  # noqa: E402
+
+
+def synthetic_vectors(count, dim, clusters, noise, seed=0):
+    """군집 구조가 있는 정규화 벡터 생성 (작업요청 이력처럼 유사 문장이 모여 있는 분포)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, count)
+    vectors = centers[labels] + noise * rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def percentile_ms(timings, q):
+    return float(np.percentile(timings, q) * 1000)
+
+
+def run_queries(index, queries, top_k, exact):
+    """질의별 결과 rowid 집합과 소요 시간"""
+    results, timings = [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = index.search_vector(query, top_k, exact=exact)
+        timings.append(time.perf_counter() - started)
+        results.append({row_id for row_id, _ in hits})
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF 근사 검색 vs 전체 탐색 벤치마크")
+    parser.add_argument("--count", type=int, default=300000, help="합성 벡터 수")
+    parser.add_argument("--dim", type=int, default=384, help="벡터 차원 (기본 MiniLM 384)")
+    parser.add_argument("--clusters", type=int, default=2000, help="합성 벡터 군집 수")
+    parser.add_argument("--noise", type=float, default=1.0, help="군집 내 잡음 크기 (클수록 근사 검색이 어려움)")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--top-k", type=int, default=Config.EMBEDDING_TOP_K, help="검색 건수")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32], help="비교할 탐색 목록 수")
+    parser.add_argument("--index-path", help="기존 인덱스 디렉토리 (지정 시 합성 벡터 대신 사용)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.index_path:
+            index = EmbeddingIndex(index_path=args.index_path, encoder=lambda texts: None, enabled=True)
+            with index._lock:
+                index._ensure_loaded()
+            if index._count == 0:
+                print(f"❌ 인덱스가 비어 있습니다: {args.index_path}")
+                sys.exit(1)
+            sample = rng.choice(index._count, min(args.queries, index._count), replace=False)
+            queries = np.asarray(index._vectors[np.sort(sample)])
+            print(f"📁 인덱스: {args.index_path} ({index._count:,}건, {index._dim}차원)")
+        else:
+            print(f"🧪 합성 벡터 생성: {args.count:,}건, {args.dim}차원, 군집 {args.clusters}")
+            vectors = synthetic_vectors(args.count, args.dim, args.clusters, args.noise)
+            # 질의는 기존 벡터에 잡음을 더한 것 (실제 입력과 이력 문장의 차이를 흉내)
+            queries = vectors[rng.choice(args.count, args.queries, replace=False)]
+            queries = queries + 0.3 * rng.standard_normal(queries.shape).astype(np.float32) / np.sqrt(args.dim)
+            queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+            index = EmbeddingIndex(index_path=os.path.join(temp_dir, "vector_db"),
+                                   encoder=lambda texts: None, enabled=True)
+            index.MIN_CAPACITY = args.count
+            started = time.perf_counter()
+            index.add_vectors(np.arange(1, args.count + 1), vectors)
+            print(f"⏱️ 벡터 저장: {time.perf_counter() - started:.2f}s")
+
+        if not index.uses_ivf:
+            # add_vectors()는 학습하지 않으므로 비교를 위해 학습 (VECTOR_IVF_MIN_VECTORS와 무관)
+            started = time.perf_counter()
+            index._train()
+            print(f"⏱️ IVF 학습: {time.perf_counter() - started:.2f}s (목록 {len(index._centroids)}개)")
+
+        exact_results, exact_timings = run_queries(index, queries, args.top_k, exact=True)
+        print(f"\n{'방식':<16}{'p50(ms)':>10}{'p95(ms)':>10}{'recall@' + str(args.top_k):>12}")
+        print(f"{'전체 탐색':<16}{percentile_ms(exact_timings, 50):>10.2f}{percentile_ms(exact_timings, 95):>10.2f}"
+              f"{1.0:>12.3f}")
+
+        for nprobe in args.nprobe:
+            Config.VECTOR_IVF_NPROBE = nprobe
+            ivf_results, ivf_timings = run_queries(index, queries, args.top_k, exact=False)
+            recall = np.mean([len(found & expected) / max(1, len(expected))
+                              for found, expected in zip(ivf_results, exact_results)])
+            print(f"{'IVF nprobe=' + str(nprobe):<16}{percentile_ms(ivf_timings, 50):>10.2f}"
+                  f"{percentile_ms(ivf_timings, 95):>10.2f}{recall:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()